@@ -9,16 +9,53 @@ __all__ = [
     "FlagBuilder",
     "Browser",
     "Connection",
+    "Session",
     "BrowserName",
     "Serializer",
+    "WebSocketOptions",
+    "BrowserPool",
 ]
 
-from .browser import CMDFlags
-from .browser import FlagBuilder
-from .browser import Browser
-from .connection import Connection
-from .utils import find_instances
-from .data import Serializer
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .browser import CMDFlags
+    from .browser import FlagBuilder
+    from .browser import Browser
+    from .connection import Connection
+    from .session import Session
+    from .utils import find_instances
+    from .data import Serializer
+    from .data import WebSocketOptions
+    from .pool import BrowserPool
+
+# ? Имя -> модуль пакета, в котором оно определено. Модули импортируются при первом
+# ?     обращении к имени(PEP 562), поэтому `import aio_dt_protocol` не загружает
+# ?     браузер, соединение, домены и websockets, пока они не понадобятся.
+_LAZY_NAMES = {
+    "CMDFlags": ".browser",
+    "FlagBuilder": ".browser",
+    "Browser": ".browser",
+    "Connection": ".connection",
+    "Session": ".session",
+    "find_instances": ".utils",
+    "Serializer": ".data",
+    "WebSocketOptions": ".data",
+    "BrowserPool": ".pool",
+}
+
+
+def __getattr__(name: str):
+    if (module := _LAZY_NAMES.get(name)) is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *_LAZY_NAMES})
 
 
 class BrowserName:
@@ -4,9 +4,12 @@
 
 import asyncio
 import random
-from typing import Tuple, Optional, Literal
+from typing import Tuple, Optional, Literal, List
 from .data import WINDOWS_KEY_SET, KeyModifiers, KeyEvents
 from .domains.browser.types import Bounds
+from .domains.input.input import Input
+
+Command = Tuple[str, dict]
 
 
 class Actions:
@@ -90,10 +93,39 @@ class Actions:
         :param delay:           задержка перед отпусканием
         :return:
         """
-        await self._connection.Input.dispatchMouseEvent("mousePressed", x, y, button="left")
         if delay:
+            await self._connection.Input.dispatchMouseEvent("mousePressed", x, y, button="left")
             await asyncio.sleep(delay)
-        await self._connection.Input.dispatchMouseEvent("mouseReleased", x, y, button="left")
+            await self._connection.Input.dispatchMouseEvent("mouseReleased", x, y, button="left")
+            return
+        await self._dispatch(*self._click(x, y))
+
+    async def _dispatch(self, *commands: Command) -> None:
+        """ Отправляет события ввода одним пакетом: команды уходят в сокет строго в
+        порядке аргументов, а ответы ожидаются все вместе. Ошибка любой из команд
+        возбуждается после получения всех ответов.
+        """
+        for result in await self._connection.callMany(*commands):
+            if isinstance(result, Exception):
+                raise result
+
+    @staticmethod
+    def _click(x: int, y: int) -> List[Command]:
+        return [
+            ("Input.dispatchMouseEvent", Input.mouseEventArgs("mousePressed", x, y, button="left")),
+            ("Input.dispatchMouseEvent", Input.mouseEventArgs("mouseReleased", x, y, button="left")),
+        ]
+
+    @staticmethod
+    def _keyPress(event: dict, *modifiers: KeyModifiers) -> List[Command]:
+        args = {}
+        if modifiers:
+            args.update(modifiers=sum(m.value for m in modifiers))
+        args.update(event)
+        return [
+            ("Input.dispatchKeyEvent", Input.keyEventArgs("keyDown", **args)),
+            ("Input.dispatchKeyEvent", Input.keyEventArgs("keyUp", **args)),
+        ]
 
     async def mouseMoveTo(self, x: int, y: int) -> None:
         await self._connection.Input.dispatchMouseEvent("mouseMoved", x, y)
@@ -125,8 +157,7 @@ class Actions:
 
     async def mouseMoveToCoordinatesAndClick(self, x: int, y: int) -> None:
         """ Перемещает курсор на указанные координаты и кликает. """
-        await self.mouseMoveTo(x, y)
-        await self.clickTo(x, y)
+        await self._dispatch(("Input.dispatchMouseEvent", Input.mouseEventArgs("mouseMoved", x, y)), *self._click(x, y))
 
     async def sendChar(self, char: str) -> None:
         """ Эмулирует ввод символа нажатием соответствующей кнопки клавиатуры.
@@ -134,6 +165,10 @@ class Actions:
         :param char:             Символ для ввода.
         :return:
         """
+        await self._connection.Input.dispatchKeyEvent("char", **self._charArgs(char))
+
+    @staticmethod
+    def _charArgs(char: str) -> dict:
         upper_key = char.upper()
         args = {
             "text": char, "key": char, "keyIdentifier": f"U+{WINDOWS_KEY_SET[upper_key]:X}",
@@ -141,7 +176,7 @@ class Actions:
             "nativeVirtualKeyCode": WINDOWS_KEY_SET[upper_key]
         }
         if len(char) > 1: raise ValueError(f"Передаваемая строка: '{char}' — должна быть из одного символа!")
-        await self._connection.Input.dispatchKeyEvent("char", **args)
+        return args
 
     async def sendText(
             self, text: str, interval: Optional[Tuple[float, float]] = None
@@ -154,21 +189,23 @@ class Actions:
                                      Кортеж (10, None) — устанавливает фиксированное ожидание в 10 секунд
         :return:
         """
+        if interval is None:
+            # ? Без задержек все символы уходят одним пакетом
+            await self._dispatch(*(
+                ("Input.dispatchKeyEvent", Input.keyEventArgs("char", **self._charArgs(letter)))
+                for letter in text
+            ))
+            return
+
         for letter in text:
             await self.sendChar(letter)
-            if interval is not None: await asyncio.sleep(random.uniform(interval[0], interval[1]))
+            await asyncio.sleep(random.uniform(interval[0], interval[1]))
 
     async def sendKeyEvent(self, event: dict, *modifiers: KeyModifiers) -> None:
         """ Генерирует событие нажатия и отпускания клавиши
         с учётом клавиш-модификаторов.
         """
-        args = {}
-        if modifiers:
-            args.update(modifiers=sum(m.value for m in modifiers))
-
-        args.update(event)
-        await self._connection.Input.dispatchKeyEvent("keyDown", **args)
-        await self._connection.Input.dispatchKeyEvent("keyUp", **args)
+        await self._dispatch(*self._keyPress(event, *modifiers))
 
     async def controlA(self) -> None:
         """ Выделить весь текст(Ctrl+A). """
@@ -183,8 +220,7 @@ class Actions:
                                 ним пробелы.
         :return:
         """
-        for i in range(count):
-            await self.sendKeyEvent(KeyEvents.backspace, modifier)
+        await self._dispatch(*(self._keyPress(KeyEvents.backspace, modifier) * count))
 
     async def setWindowBounds(self, bounds: Bounds, windowId: Optional[int] = None) -> None:
         """ Устанавливает позицию и/или размер окна.
@@ -1,32 +1,43 @@
 import asyncio
-from urllib.error import URLError
 
 import warnings
-import re, os, sys, signal, subprocess
+import re, os, sys, signal, subprocess, threading, time
 from os.path import expanduser
 from inspect import iscoroutinefunction
-from typing import List, Dict, Union, Optional, Tuple, Literal
+from typing import List, Dict, Union, Optional, Tuple, Literal, IO
 from collections.abc import Sequence
 from enum import Enum
+from urllib.parse import urlparse
 from .connection import Connection
+from .session import Session
 from .data import (
     TargetConnectionInfo,
     TargetConnectionType,
     CommonCallback,
     BrowserInstanceInfo,
     Serializer,
-    BrowserLink
+    BrowserLink,
+    WebSocketOptions,
+    DEVTOOLS_ACTIVE_PORT
 )
-from .exceptions import FlagArgumentContainError, NoTargetWithGivenIdFound
+from .exceptions import FlagArgumentContainError, NoTargetWithGivenIdFound, ConnectionDetached
+from .pipe import PipeTransport
+from .http_client import HttpClient
+from .target_index import TargetIndex
 from .utils import (
-    make_request,
     find_browser_executable_path,
     log,
-    async_util_call,
     find_instances,
     prepare_url
 )
 
+# ? Ключи /json/list, по которым getConnectionBy() ищет в живом индексе target-ов, и их поля в TargetInfo
+TARGET_INDEX_KEYS = {"id": "targetId", "type": "type", "url": "url", "title": "title"}
+# ? Сколько секунд createTab() ждёт события о созданной странице, прежде чем искать её по /json/list
+TARGET_CREATE_TIMEOUT = 5.0
+# ? Строка, которую браузер печатает в stderr, как только его WebSocket готов принимать соединения
+DEVTOOLS_LISTENING = re.compile(rb"DevTools listening on (ws://\S+)")
+
 
 class Browser:
 
@@ -39,10 +50,23 @@ class Browser:
             callback: Optional[CommonCallback] = None,
             **options
     ) -> Tuple["Browser", "Connection"]:
-        """ Запускает браузер с опциональными параметрами.
+        """ Запускает браузер с опциональными параметрами. Если браузер уже
+        запущен на `debug_port`, подключается к нему. С `debug_port=0` порт выбирает
+        браузер, а ранее запущенный браузер ищется по файлу DevToolsActivePort
+        в каталоге профиля.
         """
-        if browser_instances := find_instances(debug_port, browser_name):
-            browser = Browser(instance_info=browser_instances[debug_port])
+        browser_instances = {}
+        # ? Браузер, управляемый через каналы, не подключить со стороны — он всегда запускается
+        if not options.get("pipe"):
+            if int(debug_port):
+                browser_instances = find_instances(debug_port, browser_name)
+            elif profile_path := options.get("profile_path", "testProfile"):
+                if options.get("dev_tool_profiles"):
+                    profile_path = os.path.join(expanduser("~"), "DevTools_Profiles", profile_path)
+                browser_instances = find_instances(browser=browser_name, profile_path=profile_path)
+
+        if browser_instances:
+            browser = Browser(instance_info=next(iter(browser_instances.values())))
         else:
             browser = Browser(
                 url=url,
@@ -70,7 +94,9 @@ class Browser:
             position: Optional[Tuple[int, int]] = None,
             sizes:    Optional[Tuple[int, int]] = None,
             prevent_restore: bool = False,
-            instance_info: Optional[BrowserInstanceInfo] = None
+            instance_info: Optional[BrowserInstanceInfo] = None,
+            ws_options: Optional[WebSocketOptions] = None,
+            pipe: bool = False
     ) -> None:
         """
         Все параметры — не обязательны.
@@ -106,7 +132,12 @@ class Browser:
         :param browser_path:    Путь до исполняемого файла браузера. Имеет приоритет над
                                     аргументом `browser_exe`.
 
-        :param debug_port:      Используется порт по умолчанию 9222.
+        :param debug_port:      Используется порт по умолчанию 9222. 0 — порт выбирает браузер
+                                    (свободный порт от ОС), что позволяет запускать много
+                                    браузеров одновременно без распределения портов. Такой
+                                    порт становится известен после waitForEndpoint(), или
+                                    getFirstTab(): из файла DevToolsActivePort в каталоге
+                                    профиля, а без профиля — из stderr браузера.
 
         :param app:             Запускает браузер в окне без пользовательского интерфейса,
                                     вроде адресной строки, кнопок навигации и прочих атрибутов.
@@ -138,10 +169,23 @@ class Browser:
 
         :param instance_info:   Если передано, считается, что браузер уже был запущен и мы к
                                     нему подключились.
+
+        :param ws_options:      Настройки WebSocket для всех соединений этого браузера:
+                                    наибольший размер сообщения, очередь, буферы, сжатие.
+                                    См. `WebSocketOptions`.
+
+        :param pipe:            Управлять браузером через пару каналов(--remote-debugging-pipe)
+                                    вместо WebSocket: без TCP, без кадров WebSocket и без
+                                    занятого порта. Только для запускаемого браузера и
+                                    только на POSIX. Страницы в этом режиме — сессии
+                                    браузерного соединения: getSession(), getSessionByID(),
+                                    getFirstTab(). HTTP-методы(/json/*) недоступны.
         """
 
         if sys.platform not in ("win32", "linux"):
             raise OSError(f"Platform '{sys.platform}' — not supported")
+        if pipe and sys.platform == "win32":
+            raise OSError("Pipe transport is supported only on POSIX platforms")
 
         self.dev_tool_profiles = dev_tool_profiles if profile_path else False
 
@@ -211,6 +255,28 @@ class Browser:
         self.proxy_port = str(proxy_port)
         self.verbose = verbose
         self.is_connected = False
+        self._browser_connection: Optional[Connection] = None
+        self.ws_options = ws_options if ws_options is not None else WebSocketOptions()
+        # ? Процесс браузера, если он запущен этим экземпляром
+        self.process: Optional[subprocess.Popen] = None
+        # ? Адрес WebSocket браузера, как только он стал известен, и ожидающие его
+        self.ws_endpoint: Optional[str] = None
+        self._endpoint_lock = threading.Lock()
+        self._endpoint_waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+        self._launched_at = 0.0
+        # ? Время запуска, в секундах от старта процесса:
+        # ?     endpoint — до готовности WebSocket браузера;
+        # ?     first_command — до ответа первой страницы на первую команду.
+        self.startup_metrics: Dict[str, float] = {}
+        # ? Режим канала и концы каналов на нашей стороне(чтение, запись), пока
+        # ?     их не забрало браузерное соединение
+        self.pipe = pipe and instance_info is None
+        self._pipe_fds: Optional[Tuple[int, int]] = None
+        # ? Клиент HTTP-эндпоинтов /json/*, создаётся при первом запросе
+        self._http: Optional[HttpClient] = None
+        # ? Живой индекс target-ов, см. getTargetIndex()
+        self._target_index: Optional[TargetIndex] = None
+        self._target_index_lock = asyncio.Lock()
 
         if instance_info:
             self.is_headless_mode = instance_info.headless
@@ -231,8 +297,8 @@ class Browser:
                                     "— не существует, или содержит ошибку")
         self.browser_path = browser_path
 
-        if int(debug_port) <= 0:
-            raise ValueError(f"Значение 'debug_port' — должно быть положительным целым числом!")
+        if int(debug_port) < 0:
+            raise ValueError(f"Значение 'debug_port' — должно быть неотрицательным целым числом!")
         self.debug_port = str(debug_port)
 
         if (data_url_len := len(url) if url else 0) > 30_000:
@@ -263,8 +329,11 @@ class Browser:
         :return:                ProcessID запущенного браузера
         """
         flag_box = FlagBuilder()
+        if self.pipe:
+            flag_box.add(CMDFlags.Test.remote_debugging_pipe)
+        else:
+            flag_box.add(CMDFlags.Common.remote_debugging_port, self.debug_port)
         flag_box.set(
-            (CMDFlags.Common.remote_debugging_port, [self.debug_port]),
             (CMDFlags.Common.no_first_run, []),
             (CMDFlags.Common.no_default_browser_check, []),
             (CMDFlags.Test.log_file, ["null"]),
@@ -296,40 +365,174 @@ class Browser:
         else:
             flag_box.add(CMDFlags.Headless.headless)
 
+        via = "via pipe" if self.pipe else f"on port: {self.debug_port}"
         if self.proxy_port:
             flag_box.add(CMDFlags.Other.proxy_server, self.proxy_address + ":" + self.proxy_port)
             if self.verbose:
-                log(f"Run browser {self.browser_name!r} on port: {self.debug_port} "
+                log(f"Run browser {self.browser_name!r} {via} "
                     f"with proxy on http://127.0.0.1:{self.proxy_port}")
         else:
             if self.verbose:
-                log(f"Run browser {self.browser_name!r} on port: {self.debug_port}")
+                log(f"Run browser {self.browser_name!r} {via}")
 
         if flags is not None:
             flag_box += flags
 
         run_args += flag_box.flags()
 
-        return subprocess.Popen(run_args).pid
+        # ? Файл, оставшийся от прошлого запуска, указал бы на несуществующий адрес
+        if self.profile_path:
+            try:
+                os.remove(os.path.join(self.profile_path, DEVTOOLS_ACTIVE_PORT))
+            except OSError:
+                pass
+
+        stdin = stdout = None
+        if self.pipe:
+            # ? Браузер читает команды из дескриптора 3 и пишет в дескриптор 4. Popen не
+            # ?     назначает дескрипторам произвольные номера, поэтому каналы передаются
+            # ?     как stdin и stdout, а оболочка переставляет их на 3 и 4 перед exec.
+            # ?     Собственный stdout браузера уходит в его stderr.
+            commands_r, commands_w = os.pipe()
+            messages_r, messages_w = os.pipe()
+            run_args = ["/bin/sh", "-c", 'exec "$0" "$@" 3<&0 4>&1 0</dev/null 1>&2', *run_args]
+            stdin, stdout = commands_r, messages_w
+
+        # ? Адрес браузера с профилем берётся из файла DevToolsActivePort, и его stderr
+        # ?     не перехватывается: браузер может пережить этот процесс, см. find_instances().
+        # ?     Без профиля файла нет, и stderr читается до строки "DevTools listening on".
+        watch_stderr = not self.pipe and not self.profile_path
+        self._launched_at = time.perf_counter()
+        try:
+            self.process = subprocess.Popen(
+                run_args, stdin=stdin, stdout=stdout, stderr=subprocess.PIPE if watch_stderr else None)
+        except OSError:
+            if self.pipe:
+                for fd in (commands_r, commands_w, messages_r, messages_w):
+                    os.close(fd)
+            raise
+        if self.pipe:
+            # ? Концы каналов на стороне браузера остаются только у него
+            os.close(commands_r)
+            os.close(messages_w)
+            self._pipe_fds = messages_r, commands_w
+        if watch_stderr:
+            threading.Thread(
+                target=self._watchStderr, args=(self.process.stderr,),
+                name=f"browser-stderr-{self.debug_port}", daemon=True
+            ).start()
+        return self.process.pid
+
+    def _watchStderr(self, stream: IO[bytes]) -> None:
+        """ Читает stderr браузера в отдельном потоке, пока процесс не завершится, и
+        ищет строку "DevTools listening on ws://...". Прочитанное пересылается в stderr
+        текущего процесса, как если бы он не перехватывался. Канал читается до конца:
+        закрытый раньше, он завершил бы браузер с EPIPE при следующей же записи.
+        """
+        for line in iter(stream.readline, b""):
+            try:
+                sys.stderr.write(line.decode(errors="replace"))
+            except (OSError, ValueError):
+                pass
+            if self.ws_endpoint is None and (match := DEVTOOLS_LISTENING.search(line)):
+                self._setEndpoint(match.group(1).decode())
+        stream.close()
+
+    def _setEndpoint(self, ws_url: str) -> None:
+        """ Запоминает адрес WebSocket браузера и будит ожидающих. Может вызываться
+        из потока чтения stderr.
+        """
+        with self._endpoint_lock:
+            if self.ws_endpoint is not None:
+                return
+            self.ws_endpoint = ws_url
+            # ? Для --remote-debugging-port=0 это первое место, где виден настоящий порт
+            self.debug_port = str(urlparse(ws_url).port)
+            self.startup_metrics["endpoint"] = time.perf_counter() - self._launched_at
+            waiters, self._endpoint_waiters = self._endpoint_waiters, []
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(_resolve, future, ws_url)
+
+    async def waitForEndpoint(self, timeout: Optional[float] = None) -> Optional[str]:
+        """ Дожидается готовности WebSocket браузера, запущенного этим экземпляром,
+        и возвращает его адрес. Адрес берётся из файла DevToolsActivePort в каталоге
+        профиля, а у браузера без профиля — из строки "DevTools listening on ..."
+        в его stderr. Для браузера, к которому подключились, а не запустили — None.
+        Порт из адреса записывается в `debug_port`: так становится известен
+        порт браузера, запущенного с debug_port=0.
+        :param timeout:     (optional) Тайм-аут ожидания в секундах.
+        :return:        ws://127.0.0.1:port/devtools/browser/<id>
+        """
+        if self.ws_endpoint is not None or self.process is None:
+            return self.ws_endpoint
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._endpoint_lock:
+            if self.ws_endpoint is not None:
+                return self.ws_endpoint
+            self._endpoint_waiters.append((loop, future))
+
+        poller = loop.create_task(self._pollActivePort(future))
+        try:
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            poller.cancel()
+
+    async def _pollActivePort(self, future: asyncio.Future) -> None:
+        """ Для waitForEndpoint(): проверяет файл DevToolsActivePort, увеличивая паузу
+        между проверками, и завершает ожидание ошибкой, если процесс браузера
+        завершился раньше.
+        """
+        path = os.path.join(self.profile_path, DEVTOOLS_ACTIVE_PORT) if self.profile_path else None
+        delay = .01
+        while not future.done():
+            if (code := self.process.poll()) is not None:
+                future.set_exception(RuntimeError(
+                    f"Browser process exited with code {code} before DevTools became available"))
+                return
+            if path is not None and os.path.exists(path):
+                try:
+                    with open(path) as f:
+                        port, ws_path = f.read().split()[:2]
+                except (OSError, ValueError):
+                    pass
+                else:
+                    self._setEndpoint(f"ws://127.0.0.1:{port}{ws_path}")
+            await asyncio.sleep(delay)
+            # ? Файл — основной источник адреса браузера с профилем: пауза не растёт
+            # ?     дальше, чем на десятки миллисекунд после готовности браузера
+            delay = min(delay * 2, .05)
 
     def kill(self) -> None:
         """  Убивает процесс браузера. """
+        # ? Процесс неизвестен, например, у поддельного браузера из fake_cdp
+        if self.browser_pid <= 0:
+            return
         try:
             os.kill(self.browser_pid, signal.SIGTERM)
         except PermissionError:
             pass
 
+    async def _request(self, path: str, method: str = "GET") -> str:
+        """ Запрос к HTTP-эндпоинту браузера через постоянное подключение.
+        :param path:        Путь, например "/json/list".
+        :param method:      HTTP-метод.
+        """
+        # ? Порт браузера, запущенного с debug_port=0, меняется, когда становится известен
+        if self._http is None or self._http.port != int(self.debug_port):
+            if self._http is not None:
+                self._http.close()
+            self._http = HttpClient("127.0.0.1", int(self.debug_port))
+        return await self._http.request(path, method)
+
     async def activateTarget(self, target: Union[TargetConnectionInfo, str]) -> str:
         """ Выводит страницу на передний план (активирует вкладку).
         :param target:         Объект, описывающий соединение с
             целевой вкладкой, которую требуется активировать, или её ID.
         """
         target_id = target.id if isinstance(target, TargetConnectionInfo) else target
-        result = await async_util_call(
-            make_request,
-            f"http://127.0.0.1:{self.debug_port}/"
-            f"json/activate/{target_id}"
-        )
+        result = await self._request(f"/json/activate/{target_id}")
         return result   # "Target activated" if success
 
     async def getAllTargetsConnectionInfo(self) -> List[TargetConnectionInfo]:
@@ -382,21 +585,123 @@ class Browser:
                     "webSocketDebuggerUrl": "ws://localhost:9222/devtools/page/DAB7FB6187B554E10B0BD18821265734"
                 }, { ... } ]
         """
-        result = await async_util_call(
-            make_request, f"http://127.0.0.1:{self.debug_port}/json/list")
+        result = await self._request("/json/list")
 
         if self.verbose:
             log("getPageList() => " + result)
         return Serializer.decode(result)
 
+    async def getVersion(self) -> dict:
+        """ Запрашивает у браузера сведения о версии и адрес его собственного WebSocket.
+        :return: {
+                    "Browser": "Chrome/120.0.6099.71",
+                    "Protocol-Version": "1.3",
+                    "User-Agent": "...",
+                    "V8-Version": "12.0.267.8",
+                    "WebKit-Version": "537.36 (...)",
+                    "webSocketDebuggerUrl": "ws://127.0.0.1:9222/devtools/browser/b0b8a4fb-..."
+                }
+        """
+        result = await self._request("/json/version")
+        return Serializer.decode(result)
+
+    async def getBrowserConnection(self, callback: Optional[CommonCallback] = None) -> Connection:
+        """ Возвращает соединение с самим браузером(/devtools/browser/...). Оно единственное
+        на браузер и используется как общий транспорт для flatten-сессий: все страницы,
+        полученные через `getSessionByID()`, работают через один его WebSocket.
+        :param callback:    - Корутина, которой будет передаваться контекст абсолютно
+                                всех событий браузерного соединения в виде словаря.
+                                Учитывается только при первом подключении.
+        :return:        <Connection>
+        """
+        if self._browser_connection is not None and self._browser_connection.connected:
+            return self._browser_connection
+
+        if callback is not None and not iscoroutinefunction(callback):
+            raise TypeError("Argument 'callback' must be a coroutine")
+
+        if self.pipe:
+            return await self._getPipeConnection(callback)
+
+        ws_url: str = (await self.getVersion())["webSocketDebuggerUrl"]
+        conn = Connection(
+            ws_url,
+            ws_url.rsplit("/", 1)[-1],
+            "",
+            callback,
+            self.is_headless_mode,
+            self.verbose,
+            self.browser_name,
+            ws_options=self.ws_options
+        )
+        await conn.activate(enable_runtime=False)
+        self._browser_connection = conn
+        return conn
+
+    async def _getPipeConnection(self, callback: Optional[CommonCallback]) -> Connection:
+        """ Соединение с браузером через его каналы. Каналы открываются один раз:
+        когда соединение закрыто, браузер больше недоступен.
+        """
+        if self._pipe_fds is None:
+            raise ConnectionDetached(f"Pipe of the browser {self.browser_pid} is closed")
+        read_fd, write_fd = self._pipe_fds
+        self._pipe_fds = None
+        transport = await PipeTransport.open(
+            read_fd, write_fd, self.ws_options.max_size, self.ws_options.max_queue)
+        conn = Connection(
+            f"pipe://{self.browser_pid}",
+            f"pipe-{self.browser_pid}",
+            "",
+            callback,
+            self.is_headless_mode,
+            self.verbose,
+            self.browser_name,
+            ws_options=self.ws_options
+        )
+        await conn.activate(enable_runtime=False, transport=transport)
+        self._browser_connection = conn
+        return conn
+
+    async def getSessionByID(
+            self, conn_id: str,
+            callback: Optional[CommonCallback] = None) -> Session:
+        """
+        Присоединяется к target по идентификатору через общее браузерное соединение.
+        В отличие от `getConnectionByID()` не открывает новый WebSocket.
+        :param conn_id:     - Идентификатор target. Он же 'targetId'.
+        :param callback:    - Корутина, которой будет передаваться контекст абсолютно
+                                всех событий страницы в виде словаря.
+        :return:        <Session>
+        """
+        root = await self.getBrowserConnection()
+        return await root.attachSession(conn_id, callback)
+
+    async def getSession(
+            self, index: int = 0,
+            conn_type: str = "page",
+            callback: Optional[CommonCallback] = None) -> Optional[Session]:
+        """
+        Присоединяется к target указанного типа по индексу через общее браузерное соединение.
+        :param index:       - Желаемый индекс target-а начиная с нуля.
+        :param conn_type:   - Тип "page" | 'background_page' | 'service_worker' | ???
+        :param callback:    - Корутина, которой будет передаваться контекст абсолютно
+                                всех событий страницы в виде словаря.
+        :return:        <Session>
+        """
+        root = await self.getBrowserConnection()
+        targets = [t for t in await root.Target.getTargets() if t.type == conn_type]
+        if index >= len(targets):
+            return None
+        return await root.attachSession(targets[index].targetId, callback)
+
     async def queryNewTab(self, url: str = "about:blank") -> Connection:
-        result: str = await async_util_call(
-            make_request, f"http://127.0.0.1:{self.debug_port}/json/new?{url}", "PUT")
+        result: str = await self._request(f"/json/new?{url}", "PUT")
 
         if self.verbose:
             log("queryNewTab() => " + result)
         result: dict = Serializer.decode(result)
-        return await self.getConnectionByID(result["id"])
+        return await self._connectTarget(
+            result["id"], None, result["webSocketDebuggerUrl"], result["devtoolsFrontendUrl"])
 
     async def getConnectionBy(
             self, key: Union[str, int],
@@ -421,34 +726,102 @@ class Browser:
                                         включает уведомления домена "Runtime" для общения
                                         со страницей.
 
+        Если индекс target-ов уже создан вызовом getTargetIndex(), поиск по id, type,
+        url и title идёт по нему, без запроса /json/list. Тогда `index` отсчитывается
+        в порядке появления target-ов, а не в порядке /json/list.
+
         :return:        <Connection>
         """
 
         if callback is not None and not iscoroutinefunction(callback):
             raise TypeError("Argument 'callback' must be a coroutine")
 
+        # ? Прочие ключи есть только в ответе /json/list
+        if (targets := self._liveTargetIndex()) is None or (field := TARGET_INDEX_KEYS.get(key)) is None:
+            return await self._getConnectionFromList(key, value, match_mode, index, callback)
+
+        by_id = field == "targetId" and match_mode == "exact"
+        if by_id and (info := targets.get(value)) is not None:
+            found = [info]
+        else:
+            found = targets.find(field, value, match_mode)
+        if index < len(found):
+            return await self._connectTarget(found[index]["targetId"], callback)
+        # ? Target, созданный только что, мог ещё не дойти до индекса событием:
+        # ?     идентификатор, полученный извне, проверяется и по /json/list.
+        # ! В режиме канала HTTP-эндпоинтов нет
+        if by_id and not self.pipe:
+            return await self._getConnectionFromList(key, value, match_mode, index, callback)
+        return None
+
+    async def _getConnectionFromList(
+            self, key: str,
+            value: str,
+            match_mode: Literal["exact", "contains", "startswith"],
+            index: int,
+            callback: Optional[CommonCallback]) -> Optional[Connection]:
+        """ getConnectionBy() по ответу /json/list. """
         counter, v = 0, value.lower()
         for page_data in await self.getConnectionList():
-            data: str = page_data[key].lower()
+            data: str = page_data.get(key, "").lower()
             if ((match_mode == "exact" and data == v)
                 or (match_mode == "contains" and data.find(v) > -1)
                     or (match_mode == "startswith" and data.startswith(v))):
                 if counter == index:
-                    conn = Connection(
-                        page_data["webSocketDebuggerUrl"],
-                        page_data["id"],
-                        page_data["devtoolsFrontendUrl"],
-                        callback,
-                        self.is_headless_mode,
-                        self.verbose,
-                        self.browser_name
-                    )
-
-                    await conn.activate()
-                    return conn
+                    return await self._connectTarget(
+                        page_data["id"], callback, page_data["webSocketDebuggerUrl"], page_data["devtoolsFrontendUrl"])
                 counter += 1
         return None
 
+    async def _connectTarget(
+            self, target_id: str,
+            callback: Optional[CommonCallback],
+            ws_url: Optional[str] = None,
+            frontend_url: Optional[str] = None) -> Connection:
+        """ Открывает соединение с target-ом. Адреса, если не переданы, строятся так
+        же, как их строит браузер в /json/list: на хосте его собственного WebSocket.
+        """
+        if ws_url is None:
+            if self._browser_connection is not None and not self.pipe:
+                host = urlparse(self._browser_connection.ws_url).netloc
+            else:
+                host = f"127.0.0.1:{self.debug_port}"
+            ws_url = f"ws://{host}/devtools/page/{target_id}"
+            frontend_url = f"/devtools/inspector.html?ws={host}/devtools/page/{target_id}"
+        conn = Connection(
+            ws_url,
+            target_id,
+            frontend_url or "",
+            callback,
+            self.is_headless_mode,
+            self.verbose,
+            self.browser_name,
+            ws_options=self.ws_options
+        )
+        await conn.activate()
+        return conn
+
+    def _liveTargetIndex(self) -> Optional[TargetIndex]:
+        """ Индекс target-ов, если он создан getTargetIndex() и получает события. """
+        index = self._target_index
+        return index if index is not None and index.active else None
+
+    async def getTargetIndex(self) -> TargetIndex:
+        """ Возвращает живой индекс target-ов браузера, см. `TargetIndex`. Индекс
+        создаётся при первом вызове на браузерном соединении и обновляется событиями
+        Target. С этого момента getConnectionBy() и производные от него, createTab(),
+        closeAllTabsExcept() и getFramesFor() пользуются им вместо /json/list и опроса.
+        Пока индекс не создан, они работают по /json/list, как и прежде. Если браузерное
+        соединение было потеряно, индекс создаётся заново при следующем вызове.
+        :return:        <TargetIndex>
+        """
+        async with self._target_index_lock:
+            if self._target_index is None or not self._target_index.active:
+                index = TargetIndex(await self.getBrowserConnection())
+                await index.start()
+                self._target_index = index
+        return self._target_index
+
     async def getConnection(
             self, index: int = 0,
             conn_type: str = "page",
@@ -532,14 +905,21 @@ class Browser:
                                             всех событий страницы в виде словаря.
         :return:                    * <Connection>
         """
-        while not (tmp := await self.getConnection(callback=callback)):
-            await asyncio.sleep(.5)
-        page_id = await tmp.Target.createTarget(url, newWindow=newWindow, background=background)
-        if wait_for_create:
-            while not (page := await self.getConnectionByID(page_id)):
-                await asyncio.sleep(.5)
-        else:
-            page = await self.getConnectionByID(page_id)
+        root = await self.getBrowserConnection()
+        page_id = await root.Target.createTarget(url, newWindow=newWindow, background=background)
+        if not wait_for_create:
+            return await self.getConnectionByID(page_id, callback)
+
+        if (targets := self._liveTargetIndex()) is not None:
+            try:
+                await targets.waitFor(page_id, TARGET_CREATE_TIMEOUT)
+            except (asyncio.TimeoutError, ConnectionDetached):
+                # ! Событие пропущено, или индекс отсоединился: страница ищется по /json/list
+                pass
+        delay = .01
+        while not (page := await self.getConnectionByID(page_id, callback)):
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, .5)
         return page
 
     async def newTab(self, url: str = "about:blank") -> Optional[Connection]:
@@ -548,15 +928,10 @@ class Browser:
         :param url:                     - (optional) Адрес будет открыт при создании.
         :return:                    * <Connection>
         """
-        result = await async_util_call(
-            make_request,
-            f"http://127.0.0.1:{self.debug_port}/"
-            f"json/new?{url}",
-            "PUT"
-        )
+        result = await self._request(f"/json/new?{url}", "PUT")
 
         data = Serializer.decode(result)
-        return await self.getConnectionByID(data["id"])
+        return await self._connectTarget(data["id"], None, data["webSocketDebuggerUrl"], data["devtoolsFrontendUrl"])
     
     async def showInspector(
             self, conn: Connection,
@@ -632,20 +1007,38 @@ class Browser:
 
     async def getFirstTab(self, callback: Optional[CommonCallback] = None) -> Connection:
         """
-        Безусловно дожидается соединения со страницей.
+        Безусловно дожидается соединения со страницей. Если браузер запущен этим
+        экземпляром, сначала дожидается готовности его WebSocket, см. waitForEndpoint().
+        В режиме канала возвращает сессию первой страницы.
         """
+        if not self.pipe:
+            await self.waitForEndpoint()
+        get_first = self.getSession if self.pipe else self.getConnection
+        # ? Страница появляется вскоре после готовности браузера: частые проверки
+        # ?     сначала, реже — если браузер не спешит
+        delay = .01
         while True:
             try:
-                while (conn := await self.getConnection(callback=callback)) is None:
-                    await asyncio.sleep(.5)
-                return conn
-            except URLError:
-                await asyncio.sleep(1)
+                if (conn := await get_first(callback=callback)) is not None:
+                    if self.process is not None and "first_command" not in self.startup_metrics:
+                        self.startup_metrics["first_command"] = time.perf_counter() - self._launched_at
+                        if self.verbose:
+                            log(f"Browser started: {self.startup_metrics}")
+                    return conn
+            except OSError:     # URLError, ConnectionRefusedError
+                pass
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, .5)
 
     async def close(self) -> None:
         """ Корректно закрывает браузер если остались ещё его инстансы """
-        if conn := await self.getConnection():
+        if self.pipe:
+            if self._pipe_fds is not None or self._browser_connection is not None and self._browser_connection.connected:
+                await (await self.getBrowserConnection()).Browser.close()
+        elif conn := await self.getConnection():
             await conn.Browser.close()
+        if self._http is not None:
+            self._http.close()
 
     async def closeTarget(self, target: Union[TargetConnectionInfo, str]) -> str:
         """ Закрывает указанное соединение.
@@ -653,36 +1046,37 @@ class Browser:
             целевой вкладкой, которую требуется закрыть, или её ID.
         """
         target_id = target.id if isinstance(target, TargetConnectionInfo) else target
-        result = await async_util_call(
-            make_request,
-            f"http://127.0.0.1:{self.debug_port}/"
-            f"json/close/{target_id}"
-        )
+        result = await self._request(f"/json/close/{target_id}")
         return result # "Target is closing" if success
 
     async def closeAllTabsExcept(self, *except_list: Connection) -> None:
         """ Закрывает все страницы браузера, кроме переданных. """
-        for conn_info in await self.getAllTargetsConnectionInfo():
-            if conn_info.type == "page":
-                condition = False
-                for conn in except_list:
-                    condition |= conn.conn_id == conn_info.id
-                if not condition:
-                    i = 4
-                    try:
-                        while (tab := await self.getConnectionByID(conn_info.id)) is None and i:
-                            await asyncio.sleep(.5)
-                            i -= 1
-                        if tab: await tab.Target.close()
-                    except NoTargetWithGivenIdFound:
-                        pass
+        keep = {conn.conn_id for conn in except_list}
+        if (targets := self._liveTargetIndex()) is None:
+            for conn_info in await self.getConnectionsByType("page"):
+                if conn_info.id not in keep:
+                    await self.closeTarget(conn_info.id)
+            return
+
+        for info in targets.find("type", "page"):
+            if info["targetId"] not in keep:
+                try:
+                    await self._browser_connection.Target.closeTarget(info["targetId"])
+                except NoTargetWithGivenIdFound:
+                    pass
 
     async def getFramesFor(self, conn: Connection) -> List[Connection]:
         """ Возвращает список iFrame для указанного соединения. """
+        if (targets := self._liveTargetIndex()) is None:
+            return [
+                await self._connectTarget(data["id"], None, data["webSocketDebuggerUrl"], data["devtoolsFrontendUrl"])
+                for data in await self.getConnectionList()
+                if data["type"] == "iframe" and data.get("parentId") == conn.conn_id
+            ]
         return [
-            await self.getConnectionByID(data["id"])
-            for data in await self.getConnectionList()
-            if data["type"] == "iframe" and data["parentId"] == conn.conn_id
+            await self._connectTarget(info["targetId"], None)
+            for info in targets.find("type", "iframe")
+            if info.get("parentFrameId") == conn.conn_id
         ]
 
     def __eq__(self, other: "Browser") -> bool:
@@ -692,6 +1086,11 @@ class Browser:
         return hash(self.debug_port)
 
 
+def _resolve(future: asyncio.Future, result: str) -> None:
+    if not future.done():
+        future.set_result(result)
+
+
 class FlagBuilder:
     """ Обеспечивает последовательность неповторяющихся флагов
     для запуска браузера.
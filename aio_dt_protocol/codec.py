@@ -0,0 +1,139 @@
+""" Кодеки JSON для обмена сообщениями по протоколу.
+
+Каждый кодек умеет:
+    encode(obj)         -> str
+    encode_bytes(obj)   -> bytes (UTF-8), без промежуточной строки, если библиотека это позволяет
+    decode(data)        -> объект, из str, или bytes
+    decode_as(data, T)  -> объект типа T (dataclass, или список dataclass-ов)
+
+Доступны: "orjson" и "msgspec" — если установлены, и стандартный "json" — всегда.
+"""
+import json
+from dataclasses import is_dataclass, fields
+from functools import lru_cache
+from typing import Any, Callable, Dict, Type, TypeVar, Union, Optional, get_origin, get_args
+
+T = TypeVar("T")
+
+# ? В порядке предпочтения при автоматическом выборе
+CODEC_PRIORITY = ("orjson", "msgspec", "json")
+
+
+@lru_cache(maxsize=None)
+def _field_names(tp: type) -> frozenset:
+    return frozenset(f.name for f in fields(tp))
+
+
+def convert(obj: Any, tp: Type[T]) -> T:
+    """ Приводит результат декодирования к типу `tp`. Поддерживаются dataclass-ы
+    и списки dataclass-ов; ключи, которых нет среди полей dataclass, отбрасываются.
+    Вложенные структуры остаются словарями.
+    """
+    if type(obj) is dict and is_dataclass(tp):
+        names = _field_names(tp)
+        return tp(**{k: v for k, v in obj.items() if k in names})
+    if type(obj) is list and get_origin(tp) is list:
+        args = get_args(tp)
+        if args:
+            return [convert(item, args[0]) for item in obj]
+    return obj
+
+
+class Codec:
+    """ Кодек на основе стандартного модуля json.
+    Операции хранятся в атрибутах экземпляра, а не являются методами, чтобы
+    `codec.encode is codec.encode` было истинно — по этому признаку Serializer
+    определяет, не был ли кодировщик заменён вручную.
+    """
+    __slots__ = ("name", "encode", "encode_bytes", "decode")
+
+    def __init__(self) -> None:
+        self.name = "json"
+        dumps = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False).encode
+        self.encode: Callable[[Any], str] = dumps
+        self.encode_bytes: Callable[[Any], bytes] = lambda obj: dumps(obj).encode()
+        self.decode: Callable[[Union[str, bytes]], Any] = json.loads
+
+    def decode_as(self, data: Union[str, bytes], tp: Type[T]) -> T:
+        """ Декодирует данные сразу в указанный тип.
+        :param data:    JSON в виде str, или bytes.
+        :param tp:      Dataclass, или List[dataclass].
+        """
+        return convert(self.decode(data), tp)
+
+    def __repr__(self) -> str:
+        return f"<Codec {self.name}>"
+
+
+class OrjsonCodec(Codec):
+    """ Кодек на основе orjson: кодирует сразу в bytes и декодирует без
+    промежуточного преобразования в str.
+    """
+    __slots__ = ()
+
+    def __init__(self) -> None:
+        import orjson
+
+        self.name = "orjson"
+        dumps, loads = orjson.dumps, orjson.loads
+        self.encode = lambda obj: dumps(obj).decode()
+        self.encode_bytes = dumps
+        self.decode = loads
+
+
+class MsgspecCodec(Codec):
+    """ Кодек на основе msgspec. Типизированное декодирование выполняется
+    самой библиотекой, с проверкой типов и вложенных структур.
+    """
+    __slots__ = ("_decoders",)
+
+    def __init__(self) -> None:
+        import msgspec
+
+        self.name = "msgspec"
+        encode_bytes = msgspec.json.Encoder().encode
+        self.encode = lambda obj: encode_bytes(obj).decode()
+        self.encode_bytes = encode_bytes
+        self.decode = msgspec.json.Decoder().decode
+        self._decoders: Dict[Any, Callable[[Union[str, bytes]], Any]] = {}
+
+    def decode_as(self, data: Union[str, bytes], tp: Type[T]) -> T:
+        if (decoder := self._decoders.get(tp)) is None:
+            import msgspec
+            decoder = self._decoders[tp] = msgspec.json.Decoder(tp).decode
+        return decoder(data)
+
+
+CODECS: Dict[str, Type[Codec]] = {
+    "json": Codec,
+    "orjson": OrjsonCodec,
+    "msgspec": MsgspecCodec,
+}
+
+
+def get_codec(name: Optional[str] = None) -> Codec:
+    """ Возвращает кодек по имени, или самый быстрый из установленных.
+    :param name:    (optional) "json" | "orjson" | "msgspec".
+    """
+    if name is not None:
+        if name not in CODECS:
+            raise ValueError(f"Unknown codec: {name!r}. Available: {', '.join(CODECS)}")
+        return CODECS[name]()
+
+    for candidate in CODEC_PRIORITY:
+        try:
+            return CODECS[candidate]()
+        except ImportError:
+            continue
+    return Codec()
+
+
+def available_codecs() -> Dict[str, Codec]:
+    """ Все кодеки, библиотеки которых установлены. """
+    result = {}
+    for name, cls in CODECS.items():
+        try:
+            result[name] = cls()
+        except ImportError:
+            pass
+    return result
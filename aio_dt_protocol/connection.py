@@ -1,36 +1,67 @@
 import asyncio
+from contextvars import ContextVar
 from websockets.client import WebSocketClientProtocol, connect
-from websockets.exceptions import ConnectionClosedError
+from websockets.exceptions import ConnectionClosed, InvalidHandshake
 from inspect import iscoroutinefunction
 from typing import (
     Callable, Optional, Union, Tuple, Dict, Any, Iterable,
-    Awaitable)
-
-from .exceptions import get_cdtp_error
-from .utils import log
-
-from .data import DomainEvent, Sender, Channel, CommonCallback, Serializer
-from .extend_connection import Extend
-
-from .domains.background_service import BackgroundService
-from .domains.browser import Browser
-from .domains.css import CSS
-from .domains.device_orientation import DeviceOrientation
-from .domains.dom import DOM
-from .domains.emulation import Emulation
-from .domains.fetch import Fetch
-from .domains.input import Input
-from .domains.log import Log
-from .domains.network import Network
-from .domains.overlay import Overlay
-from .domains.page import Page
-from .domains.runtime import Runtime
-from .domains.system_info import SystemInfo
-from .domains.target import Target
+    Awaitable, List, Set, TYPE_CHECKING)
+
+from .exceptions import get_cdtp_error, CallTimeoutError, ConnectionDetached, EventTimeoutError
+from .utils import log, prescan_frame, lazy_attributes, lazy_import
+
+from .data import (
+    DomainEvent, CommonCallback, Serializer, WebSocketOptions, PY_CALL_BATCH_BINDING, PY_RPC_BINDING)
+from .dispatcher import EventDispatcher, OverflowPolicy, fan_out, run_batch
+from .event_stream import EventStream
+from .pipe import PipeTransport
+from .metrics import ConnectionMetrics, Exporter
+from .replay import ReplayJournal
+
+if TYPE_CHECKING:
+    from .session import Session
 
 Handler = Callable[..., Awaitable[None]]
+Predicate = Callable[[dict], bool]
+
+# ? Домены, которые включаются автоматически при подписке на их события:
+# ?     имя домена -> (метод включения, метод выключения). Fetch сюда не входит:
+# ?     его включение приостанавливает запросы и требует явных шаблонов. DOM
+# ?     автоматически не выключается: DOM.disable делает недействительными все
+# ?     nodeId, которые уже получены клиентом.
+AUTO_ENABLE_DOMAINS: Dict[str, Tuple[str, Optional[str]]] = {
+    "Page": ("enable", "disable"),
+    "Network": ("enable", "disable"),
+    "DOM": ("enable", None),
+    "CSS": ("CSSEnable", "CSSDisable"),
+    "Log": ("enable", "disable"),
+    "Overlay": ("enable", "disable"),
+    "Runtime": ("enable", "disable"),
+}
+
+# ? События, которые соединение обрабатывает само, независимо от подписок
+INTERNAL_EVENTS = frozenset((
+    "Inspector.detached", "Target.attachedToTarget", "Target.detachedFromTarget"
+))
 
-REQUEST_CHANNEL = Channel[dict]()
+# ? Домены, включение которых enableReconnect() переносит в журнал, в порядке
+# ?     включения: CSS требует включённого DOM. Fetch не переносится — шаблоны
+# ?     перехвата, с которыми он был включён, неизвестны.
+JOURNAL_SEED_DOMAINS = ("DOM", "CSS", "Page", "Network", "Log", "Overlay", "Runtime")
+
+# ? Соединение, которое переподключается в текущем контексте. Контекст наследуется
+# ?     задачами, поэтому команды воспроизведения, отправленные из дочерних задач
+# ?     переподключения, не ждут его завершения.
+_reconnecting: ContextVar[Optional["Connection"]] = ContextVar("reconnecting", default=None)
+
+
+def _retrieve(future: asyncio.Future) -> None:
+    """ Помечает исключение future полученным. Вызов, отправка которого не удалась,
+    не ждёт ответа, а его future могла быть уже завершена ConnectionDetached при
+    отсоединении — иначе asyncio сообщит о неполученном исключении.
+    """
+    if future.done() and not future.cancelled():
+        future.exception()
 
 
 class Connection:
@@ -44,12 +75,38 @@ class Connection:
         "ws_url", "frontend_url", "callback", "_id", "extend", "_bindings",
         "responses", "_ws_session", "_receiver_loop", "_on_detach_listener", "_listeners_for_event",
         "on_close_event", "context_manager", "_connected", "_conn_id", "_verbose",
-        "_browser_name", "_is_headless_mode",
+        "_browser_name", "_is_headless_mode", "_session_id", "_sessions", "_on_session_attached",
+        "dispatcher", "_owns_dispatcher", "_domain_refs", "_auto_enabled", "_domain_lock", "_background_tasks",
+        "_unretained_listeners", "metrics", "default_timeout", "journal", "_reconnect_policy",
+        "_reconnect_task", "_closing", "_replaying", "ws_options", "_streams",
+        "_event_waiters", "_rpc_functions", "_created_attributes",
 
         "BackgroundService", "Browser", "CSS", "DeviceOrientation", "DOM", "Emulation", "Fetch", "Input",
         "Log", "Network", "Overlay", "Page", "Runtime", "SystemInfo", "Target",
     )
 
+    # ? Домены и расширение создаются при первом обращении: большинство соединений
+    # ?     использует лишь несколько из них. Модули доменов тоже импортируются
+    # ?     только тогда.
+    __getattr__ = lazy_attributes({
+        "extend": lazy_import(".extend_connection", "Extend"),
+        "BackgroundService": lazy_import(".domains.background_service", "BackgroundService"),
+        "Browser": lazy_import(".domains.browser", "Browser"),
+        "CSS": lazy_import(".domains.css", "CSS"),
+        "DeviceOrientation": lazy_import(".domains.device_orientation", "DeviceOrientation"),
+        "DOM": lazy_import(".domains.dom", "DOM"),
+        "Emulation": lazy_import(".domains.emulation", "Emulation"),
+        "Fetch": lazy_import(".domains.fetch", "Fetch"),
+        "Input": lazy_import(".domains.input", "Input"),
+        "Log": lazy_import(".domains.log", "Log"),
+        "Network": lazy_import(".domains.network", "Network"),
+        "Overlay": lazy_import(".domains.overlay", "Overlay"),
+        "Page": lazy_import(".domains.page", "Page"),
+        "Runtime": lazy_import(".domains.runtime", "Runtime"),
+        "SystemInfo": lazy_import(".domains.system_info", "SystemInfo"),
+        "Target": lazy_import(".domains.target", "Target"),
+    }, created="_created_attributes")
+
     def __init__(
             self,
             ws_url: str,
@@ -58,7 +115,10 @@ class Connection:
             callback: CommonCallback,
             is_headless_mode: bool,
             verbose: bool,
-            browser_name: str
+            browser_name: str,
+            dispatcher: Optional[EventDispatcher] = None,
+            default_timeout: Optional[float] = None,
+            ws_options: Optional[WebSocketOptions] = None
     ) -> None:
         """
         :param ws_url:              Адрес WebSocket.
@@ -69,6 +129,15 @@ class Connection:
         :param is_headless_mode:    "Headless" включён?
         :param verbose:             Печатать некие подробности процесса?
         :param browser_name:        Имя браузера.
+        :param dispatcher:          (optional) Диспетчер, доставляющий события слушателям.
+                                        По умолчанию создаётся собственный, с
+                                        настройками по умолчанию. Переданный
+                                        диспетчер может быть общим с другими
+                                        соединениями и при отсоединении не закрывается.
+        :param default_timeout:     (optional) Тайм-аут ответа на команду по умолчанию,
+                                        в секундах. None — ждать без ограничений.
+        :param ws_options:          (optional) Настройки WebSocket: наибольший размер
+                                        сообщения, очередь, буферы, сжатие.
         """
 
         self.ws_url = ws_url
@@ -78,12 +147,18 @@ class Connection:
         self._conn_id = conn_id
         self._verbose = verbose
         self._browser_name = browser_name
+        self.default_timeout = default_timeout
+        self.ws_options = ws_options if ws_options is not None else WebSocketOptions()
+        # ? Уже созданные домены и расширение, см. `__getattr__`
+        self._created_attributes: Set[str] = set()
         self._id = 0
         self._connected = False
-        self._ws_session: Optional[WebSocketClientProtocol] = None
+        self._ws_session: Optional[Union[WebSocketClientProtocol, PipeTransport]] = None
         self._receiver_loop: Optional[asyncio.Task] = None
         self._on_detach_listener: Optional[Tuple[Handler], Tuple[Any, ...]] = None
         self._bindings: Dict[str, Tuple[Handler, Tuple[Any, ...]]] = {}
+        # ? Функции, вызываемые со страницы через py_rpc(): имя -> (функция, bind-аргументы, тайм-аут)
+        self._rpc_functions: Dict[str, Tuple[Callable[..., Awaitable[Any]], Tuple[Any, ...], Optional[float]]] = {}
         self._listeners_for_event: Dict[
             str, Dict[
                 Callable[[dict, Tuple[Any, ...]], Awaitable[None]],
@@ -91,25 +166,38 @@ class Connection:
             ]
         ] = {}
         self.on_close_event = asyncio.Event()
-        self.responses: Dict[int, Optional[Sender[dict]]] = {}
-
-        self.extend = Extend(self)
-
-        self.BackgroundService = BackgroundService(self)
-        self.Browser = Browser(self)
-        self.CSS = CSS(self)
-        self.DeviceOrientation = DeviceOrientation(self)
-        self.DOM = DOM(self)
-        self.Emulation = Emulation(self)
-        self.Fetch = Fetch(self)
-        self.Input = Input(self)
-        self.Log = Log(self)
-        self.Network = Network(self)
-        self.Overlay = Overlay(self)
-        self.Page = Page(self)
-        self.Runtime = Runtime(self)
-        self.SystemInfo = SystemInfo(self)
-        self.Target = Target(self)
+        # ? Ожидающие ответа вызовы: id команды -> future, которую разрешит цикл приёма
+        self.responses: Dict[int, asyncio.Future] = {}
+
+        # ? Идентификатор flatten-сессии. Для соединений, владеющих собственным
+        # ?     WebSocket — всегда None.
+        self._session_id: Optional[str] = None
+        # ? Сессии, присоединённые к target-ам через это соединение.
+        self._sessions: Dict[str, "Session"] = {}
+        self._on_session_attached: Optional[Callable[["Session"], Awaitable[None]]] = None
+        # ? Слушатели, колбэк и привязанные функции вызываются через диспетчер:
+        # ?     упорядоченно в пределах типа события и с ограниченной очередью.
+        self.dispatcher = dispatcher if dispatcher is not None else EventDispatcher()
+        self._owns_dispatcher = dispatcher is None
+
+        # ? Счётчики подписок по доменам и домены, которые соединение включило само
+        self._domain_refs: Dict[str, int] = {}
+        self._auto_enabled: Set[str] = set()
+        self._domain_lock = asyncio.Lock()
+        self._background_tasks: Set[asyncio.Task] = set()
+        self._unretained_listeners: Set[Tuple[str, Callable]] = set()
+        # ? Открытые потоки событий, см. events()
+        self._streams: List[EventStream] = []
+        # ? Ожидания событий: имя события -> [(future, предикат)], см. expectEvent()
+        self._event_waiters: Dict[str, List[Tuple[asyncio.Future, Optional[Predicate]]]] = {}
+        # ? Метрики выключены, пока не вызван enableMetrics()
+        self.metrics: Optional[ConnectionMetrics] = None
+        # ? Журнал состояния и параметры переподключения. None, пока не вызван enableReconnect()
+        self.journal: Optional[ReplayJournal] = None
+        self._reconnect_policy: Optional[Tuple[int, float, float, float]] = None
+        self._reconnect_task: Optional[asyncio.Task] = None
+        self._closing = False
+        self._replaying = False
 
     @property
     def connected(self) -> bool:
@@ -135,6 +223,15 @@ class Connection:
     def is_headless_mode(self) -> bool:
         return self._is_headless_mode
 
+    @property
+    def session_id(self) -> Optional[str]:
+        return self._session_id
+
+    @property
+    def sessions(self) -> Dict[str, "Session"]:
+        """ Активные flatten-сессии этого соединения, по их sessionId. """
+        return self._sessions
+
     def __str__(self) -> str:
         return f"<Connection targetId={self.conn_id!r}>"
 
@@ -146,98 +243,363 @@ class Connection:
 
     async def call(
         self, domain_and_method: str,
-        params:  Optional[dict] = None
+        params:  Optional[dict] = None,
+        timeout: Optional[float] = None
     ) -> Optional[dict]:
         """ Низкоуровневый метод, позволяющий вызывать методы протокола.
         :param domain_and_method:   Название домена и метода через точку,
             как это описано в протоколе. Например: "Page.enable"
         :param params:              Параметры
+        :param timeout:             (optional) Сколько секунд ждать ответа, прежде чем
+                                        возбудить CallTimeoutError. По умолчанию —
+                                        `default_timeout` соединения.
         """
-        self._id += 1
-        _id = self._id
+        if (journal := self.journal) is not None:
+            params = journal.translate(domain_and_method, params)
+        msg_id, future, message = self._register(domain_and_method, params)
+        timer = self._armTimeout(future, domain_and_method, timeout)
+        metrics = self.metrics
+        started = metrics.callStarted() if metrics is not None else 0.0
+        response = None
+        try:
+            await self._send(message)
+            response = await future
+        finally:
+            # ? При тайм-ауте, отмене, или разрыве соединения ожидающий слот
+            # ?     освобождается здесь же — ответ, если придёт, будет отброшен.
+            if timer is not None:
+                timer.cancel()
+            if self.responses.pop(msg_id, None) is None:
+                _retrieve(future)
+            if metrics is not None:
+                metrics.callFinished(domain_and_method, started, response is None or "error" in response)
+
+        if "error" in response:
+            raise self._error(domain_and_method, params, response["error"])
+
+        if journal is not None:
+            journal.record(domain_and_method, params, response["result"])
+        return response["result"]
+
+    async def callMany(
+            self, *commands: Union[str, Tuple[str, Optional[dict]]],
+            timeout: Optional[float] = None
+    ) -> List[Union[dict, Exception]]:
+        """ Отправляет несколько команд подряд, не дожидаясь ответов между ними, после
+        чего собирает результаты в порядке отправки. Вместо N последовательных
+        обходов сети тратится примерно один. Ошибка одной команды не прерывает
+        остальные — на её месте в списке результатов будет исключение.
+            results = await conn.callMany(
+                ("Input.dispatchKeyEvent", {"type": "keyDown", "key": "a"}),
+                ("Input.dispatchKeyEvent", {"type": "keyUp", "key": "a"}),
+                "Page.bringToFront"
+            )
+        :param commands:    Названия методов, или пары (название метода, параметры).
+        :param timeout:     (optional) Тайм-аут ответа на каждую из команд, в секундах.
+                                По умолчанию — `default_timeout` соединения.
+        :return:            Список словарей "result", или исключений, по одному на команду.
+        """
+        metrics = self.metrics
+        # ? Воспроизводимые после переподключения команды в журнале уже есть
+        journal = self.journal if not self._replaying else None
+        batch, results = [], []
+        try:
+            for command in commands:
+                domain_and_method, params = (command, None) if type(command) is str else command
+                if journal is not None:
+                    params = journal.translate(domain_and_method, params)
+                msg_id, future, message = self._register(domain_and_method, params)
+                timer = self._armTimeout(future, domain_and_method, timeout)
+                started = metrics.callStarted() if metrics is not None else 0.0
+                batch.append((msg_id, domain_and_method, params, future, timer, started))
+                await self._send(message)
+
+            for msg_id, domain_and_method, params, future, timer, started in batch:
+                try:
+                    response = await future
+                except (CallTimeoutError, ConnectionDetached) as e:
+                    response = None
+                    results.append(e)
+                if metrics is not None:
+                    metrics.callFinished(domain_and_method, started, response is None or "error" in response)
+                if response is None:
+                    continue
+                if "error" in response:
+                    results.append(self._error(domain_and_method, params, response["error"]))
+                else:
+                    results.append(response["result"])
+                    if journal is not None:
+                        journal.record(domain_and_method, params, response["result"])
+            return results
+        finally:
+            for msg_id, domain_and_method, params, future, timer, started in batch[len(results):]:
+                if metrics is not None:
+                    metrics.callFinished(domain_and_method, started, True)
+            for msg_id, domain_and_method, params, future, timer, started in batch:
+                if timer is not None:
+                    timer.cancel()
+                if self.responses.pop(msg_id, None) is not None:
+                    future.cancel()
+                else:
+                    _retrieve(future)
+
+    async def pipeline(
+            self, *awaitables: Awaitable[Any], return_exceptions: bool = False) -> List[Any]:
+        """ Объединяет вызовы методов доменов в один пакет. Каждый метод домена отправляет
+        свою команду ещё до первого ожидания, поэтому переданные корутины уходят в сокет
+        друг за другом в порядке аргументов, а ответы ожидаются уже все вместе.
+            await conn.pipeline(
+                conn.Input.dispatchMouseEvent("mousePressed", x, y, button="left"),
+                conn.Input.dispatchMouseEvent("mouseReleased", x, y, button="left"),
+            )
+        Подходит только для независимых друг от друга команд. Если следующей команде
+        нужен результат предыдущей — их нужно ожидать по очереди. Порядок отправки
+        гарантирован, только если каждая корутина отправляет одну команду до первого
+        ожидания. Последовательности, где порядок важен(события ввода), отправляйте
+        через callMany().
+        :param awaitables:          Корутины методов доменов.
+        :param return_exceptions:   Вернуть исключения на месте результатов, вместо того,
+                                        чтобы возбудить первое из них.
+        :return:            Результаты в порядке аргументов.
+        """
+        return list(await asyncio.gather(*awaitables, return_exceptions=return_exceptions))
+
+    def _register(
+            self, domain_and_method: str,
+            params: Optional[dict]) -> Tuple[int, asyncio.Future, Union[str, bytes]]:
+        """ Выделяет id для команды, регистрирует ожидающую ответа future
+        и возвращает их вместе с сериализованным сообщением.
+        """
+        _id = self._next_id()
         data = {
             "id": _id,
             "params": params if params else {},
             "method": domain_and_method
         }
+        if self._session_id is not None:
+            data["sessionId"] = self._session_id
 
-        sender, receiver = REQUEST_CHANNEL()
-        self.responses[_id] = sender
+        # ? Сериализация — до регистрации: несериализуемые параметры не оставляют
+        # ?     в `responses` future, которую никто не разрешит
+        packed = Serializer.pack(data, self._sendsBytes())
+        future = asyncio.get_running_loop().create_future()
+        self.responses[_id] = future
+        return _id, future, packed
 
-        await self._send(Serializer.encode(data))
+    def _sendsBytes(self) -> bool:
+        """ Отправляет ли транспорт сообщения в виде bytes. Канал принимает готовые
+        байты, а WebSocket legacy-клиента websockets отправляет текстовым фреймом
+        только str — байты от кодека пришлось бы декодировать обратно.
+        """
+        return type(self._ws_session) is PipeTransport
 
-        response = await receiver.recv()
-        if "error" in response:
+    def _armTimeout(
+            self, future: asyncio.Future,
+            domain_and_method: str,
+            timeout: Optional[float]) -> Optional[asyncio.TimerHandle]:
+        """ Планирует завершение `future` исключением CallTimeoutError по истечении
+        тайм-аута. Таймер дешевле, чем asyncio.wait_for(): не создаётся ни задачи,
+        ни дополнительной future.
+        """
+        if timeout is None and (timeout := self.default_timeout) is None:
+            return None
+        return asyncio.get_running_loop().call_later(
+            timeout, self._expire, future, domain_and_method, timeout)
+
+    @staticmethod
+    def _expire(future: asyncio.Future, domain_and_method: str, timeout: float) -> None:
+        if not future.done():
+            future.set_exception(CallTimeoutError(
+                f"'{domain_and_method}' did not respond within {timeout} seconds"))
 
-            if ex := get_cdtp_error((e := response['error'])['message']):
-                raise ex(
-                    f"\n\t\x1b[37mdomain_and_method: '\x1b[91m{domain_and_method}\x1b[37m'"
-                    f"\n\tparams: '\x1b[91m{str(params)}\x1b[37m'\x1b[0m"
-                )
-
-            raise Exception(
-                "\x1b[36mBrowser detect error:\x1b[37m\t\n" +
-                f"Error code: '\x1b[91m{e['code']}\x1b[37m'\t\n" +
-                f"Error message: '\x1b[91m{e['message']}\x1b[37m'\t\n" +
-                f"domain_and_method: '\x1b[91m{domain_and_method}\x1b[37m'\t\n" +
-                f"params: '\x1b[91m{params}\x1b[37m'\x1b[0m"
+    @staticmethod
+    def _error(domain_and_method: str, params: Optional[dict], error: dict) -> Exception:
+        """ Строит исключение по описанию ошибки, пришедшему от браузера. """
+        if ex := get_cdtp_error(error["message"]):
+            return ex(
+                f"\n\t\x1b[37mdomain_and_method: '\x1b[91m{domain_and_method}\x1b[37m'"
+                f"\n\tparams: '\x1b[91m{str(params)}\x1b[37m'\x1b[0m"
             )
 
-        return response["result"]
+        return Exception(
+            "\x1b[36mBrowser detect error:\x1b[37m\t\n" +
+            f"Error code: '\x1b[91m{error['code']}\x1b[37m'\t\n" +
+            f"Error message: '\x1b[91m{error['message']}\x1b[37m'\t\n" +
+            f"domain_and_method: '\x1b[91m{domain_and_method}\x1b[37m'\t\n" +
+            f"params: '\x1b[91m{params}\x1b[37m'\x1b[0m"
+        )
+
+    def _next_id(self) -> int:
+        self._id += 1
+        return self._id
 
-    async def _send(self, data: str) -> None:
-        if self.connected:
-            await self._ws_session.send(data)
+    async def _send(self, data: Union[str, bytes]) -> None:
+        # ? Пока идёт переподключение, команды ждут его завершения. Команды
+        # ?     воспроизведения отправляются без ожидания.
+        if (task := self._reconnect_task) is not None and _reconnecting.get() is not self:
+            await asyncio.wait((task,))
+        if not self.connected:
+            raise ConnectionDetached(f"{self} is not connected")
+        if self.metrics is not None:
+            self.metrics.sent(len(data))
+        await self._ws_session.send(data)
 
     async def _recv(self) -> None:
         while self.connected:
             try:
-                data_msg: dict = Serializer.decode(await self._ws_session.recv())
-            # ! Браузер разорвал соединение
-            except ConnectionClosedError as e:
+                raw = await self._ws_session.recv()
+            # ! Соединение разорвано браузером, или закрыто через disconnect()
+            except ConnectionClosed as e:
                 if self.verbose:
-                    log(f"ConnectionClosedError {e!r}")
+                    log(f"ConnectionClosed {e!r}")
+                if self._reconnect_policy is not None and not self._closing and await self._reconnect():
+                    return
                 await self._detach()
                 return
 
-            # Ожидающие ответов вызовы API получают ответ по id входящих сообщений.
-            if sender := self.responses.pop(data_msg.get("id"), None):
-                await sender.send(data_msg)
+            # ? Прежде чем разбирать сообщение целиком, выясняем, нужно ли оно кому-то.
+            # ?     Если `sessionId` не нашёлся в конце сообщения, а сессии есть —
+            # ?     адресата не угадать, и сообщение разбирается как обычно.
+            head = prescan_frame(raw)
+            if self.metrics is not None:
+                self.metrics.received(len(raw), head and head[1])
 
-            if ((method := data_msg.get("method")) == "Inspector.detached"
-                    and data_msg["params"]["reason"] == "target_closed"):
-                await self._detach()
-                return
+            if head is not None and (head[2] is not None or not self._sessions):
+                msg_id, method, session_id = head
+                receiver = self if session_id is None else self._sessions.get(session_id)
+                if receiver is None or not receiver._wants(msg_id, method):
+                    continue
 
-            # Если коллбэк функция была определена, она будет получать все
-            #   уведомления из инстанса страницы.
-            if self.callback is not None:
-                _ = asyncio.create_task(self.callback(data_msg))
-
-            # ? Был вызов из контекста страницы
-            if method == "Runtime.bindingCalled":
-                name: str = data_msg["params"]["name"]
-                payload: str = data_msg["params"]["payload"]
-
-                # ? Есть вызываемый объект с таким именем
-                if handle := self._bindings.get(name):
-                    function, args = handle
-                    _ = asyncio.create_task(
-                        function(
-                            *Serializer.decode(payload),
-                            *args
-                        )
-                    )
+            data_msg: dict = Serializer.decode(raw)
+
+            # ? Сообщение адресовано одной из flatten-сессий
+            if (session_id := data_msg.get("sessionId")) is not None:
+                if session := self._sessions.get(session_id):
+                    await session._handle_message(data_msg)
+                continue
+
+            await self._handle_message(data_msg)
 
-            if listeners := self._listeners_for_event.get(method):
-                p = data_msg.get("params") or {}
-                for listener, largs in listeners.items():
-                    _ = asyncio.create_task(
-                        listener(       # корутина
-                            p,          # её "params" — всегда передаётся
-                            *largs      # список bind-аргументов
-                        )
+    def _wants(self, msg_id: Optional[int], method: Optional[str]) -> bool:
+        """ Нужно ли соединению сообщение с такими `id` и `method`: его ждёт вызов,
+        на него подписан слушатель, колбэк, или его обрабатывает само соединение.
+        """
+        if self.callback is not None:
+            return True
+        if msg_id is not None:
+            return msg_id in self.responses
+        if method == "Runtime.bindingCalled":
+            return bool(self._bindings) or bool(self._rpc_functions) or bool(self._listeners_for_event.get(method))
+        if self._listeners_for_event.get(method) or method in INTERNAL_EVENTS or method in self._event_waiters:
+            return True
+        return any(stream.matches(method) for stream in self._streams) if method else False
+
+    async def _handle_message(self, data_msg: dict) -> None:
+        """ Разбирает одно входящее сообщение: отдаёт ответ ожидающему вызову
+        и рассылает уведомление его слушателям.
+        """
+        # Ожидающие ответов вызовы API получают ответ по id входящих сообщений.
+        if (future := self.responses.pop(data_msg.get("id"), None)) is not None:
+            if not future.done():
+                future.set_result(data_msg)
+
+        if ((method := data_msg.get("method")) == "Inspector.detached"
+                and data_msg["params"]["reason"] == "target_closed"):
+            await self._detach()
+            return
+
+        dispatcher = self.dispatcher
+        session_id = self._session_id
+
+        if method == "Target.attachedToTarget" and self._on_session_attached is not None:
+            await dispatcher.put((session_id, method), self._autoAttachSession, (data_msg["params"],))
+        elif method == "Target.detachedFromTarget":
+            if session := self._sessions.pop(data_msg["params"]["sessionId"], None):
+                await session._detach()
+
+        # Если коллбэк функция была определена, она будет получать все
+        #   уведомления из инстанса страницы.
+        if self.callback is not None:
+            await dispatcher.put((session_id, "*"), self.callback, (data_msg,))
+
+        # ? Был вызов из контекста страницы
+        if method == "Runtime.bindingCalled":
+            name: str = data_msg["params"]["name"]
+            payload: str = data_msg["params"]["payload"]
+
+            # ? Есть вызываемый объект с таким именем
+            if handle := self._bindings.get(name):
+                function, args = handle
+                await dispatcher.put((session_id, method), function, (*Serializer.decode(payload), *args))
+
+            # ? Пакет вызовов py_call(): [[имя, [аргументы]], ...] — разбирается
+            # ?     одним декодированием и выполняется одним заданием, по порядку
+            elif name == PY_CALL_BATCH_BINDING:
+                bindings = self._bindings
+                try:
+                    jobs = tuple(
+                        (handle[0], (*call_args, *handle[1]))
+                        for call_name, call_args in Serializer.decode(payload)
+                        if (handle := bindings.get(call_name)) is not None
                     )
+                except Exception as e:
+                    # ? Строку в binding может передать любой скрипт страницы, поэтому
+                    # ?     испорченный пакет отбрасывается, а цикл приёма продолжает работу
+                    log(f"{self} malformed py_call batch dropped: {e!r}", "[<- E ->]")
+                    jobs = ()
+                if jobs:
+                    await dispatcher.put((session_id, method), run_batch, (jobs,))
+
+            # ? Вызов py_rpc(): [id, имя, [аргументы]]. Страница ждёт результат, а вызовы
+            # ?     независимы, поэтому каждый выполняется в своей задаче, не задерживая
+            # ?     остальные события.
+            elif name == PY_RPC_BINDING:
+                try:
+                    call_id, call_name, call_args = Serializer.decode(payload)
+                except Exception as e:
+                    log(f"{self} malformed py_rpc call dropped: {e!r}", "[<- E ->]")
+                else:
+                    task = asyncio.get_running_loop().create_task(self._serveRPC(
+                        data_msg["params"]["executionContextId"], call_id, call_name, call_args))
+                    self._background_tasks.add(task)
+                    task.add_done_callback(self._background_tasks.discard)
+
+        if listeners := self._listeners_for_event.get(method):
+            await dispatcher.put(
+                (session_id, method), fan_out,
+                (tuple(listeners.items()), data_msg.get("params") or {})
+            )
+
+        if method in self._event_waiters:
+            self._resolveWaiters(method, data_msg.get("params") or {})
+
+        if self._streams and method is not None:
+            for stream in tuple(self._streams):
+                if stream.matches(method):
+                    await stream.put(method, data_msg.get("params") or {})
+
+    def enableMetrics(
+            self, exporter: Optional[Exporter] = None, interval: float = 10.0) -> ConnectionMetrics:
+        """ Включает сбор метрик соединения: количество и задержки(p50/p95/p99) вызовов
+        по методам, вызовы в полёте, объём трафика и частоту событий по типам.
+        Текущие значения доступны через `conn.metrics.snapshot()`.
+            metrics = conn.enableMetrics(print, interval=5)
+        :param exporter:    (optional) Функция, или корутина, которой раз в `interval`
+                                секунд передаётся снимок метрик.
+        :param interval:    (optional) Период экспорта в секундах.
+        :return:        <ConnectionMetrics>
+        """
+        if self.metrics is None:
+            self.metrics = ConnectionMetrics()
+        if exporter is not None:
+            self.metrics.startExport(exporter, interval)
+        return self.metrics
+
+    def disableMetrics(self) -> None:
+        """ Выключает сбор метрик и их экспорт. """
+        if self.metrics is not None:
+            self.metrics.stopExport()
+            self.metrics = None
 
     async def waitForClose(self) -> None:
         """ Дожидается, пока не будет потеряно соединение со страницей. """
@@ -247,11 +609,85 @@ class Connection:
         if self.verbose:
             log(f"Wait for close connection done {self.conn_id}")
 
-    async def activate(self) -> None:
-        self._ws_session = await connect(self.ws_url, ping_interval=None)
+    async def activate(self, enable_runtime: bool = True, transport: Optional[PipeTransport] = None) -> None:
+        """ Открывает WebSocket и запускает приём сообщений.
+        :param enable_runtime:  Включить домен "Runtime". Соединение с самим
+                                    браузером (/devtools/browser/...) его не
+                                    поддерживает, поэтому для него — False.
+        :param transport:       (optional) Канал браузера, запущенного с флагом
+                                    --remote-debugging-pipe. Если передан,
+                                    используется вместо WebSocket.
+        """
+        if transport is not None:
+            self._ws_session = transport
+        else:
+            self._ws_session = await connect(self.ws_url, ping_interval=None, **self.ws_options.asKwargs())
         self._connected = True
         self._receiver_loop = asyncio.create_task(self._recv())
-        await self.Runtime.enable()
+        if enable_runtime:
+            await self.Runtime.enable()
+
+    async def attachSession(
+            self, target_id: str,
+            callback: Optional[CommonCallback] = None) -> "Session":
+        """ Присоединяется к target в режиме `flatten` и возвращает лёгкую сессию
+        с тем же API, что и у `Connection`. Все сессии используют WebSocket этого
+        соединения, а входящие сообщения распределяются между ними по `sessionId`.
+        https://chromedevtools.github.io/devtools-protocol/tot/Target#method-attachToTarget
+        :param target_id:       Идентификатор target (страницы, воркера, ...).
+        :param callback:        Корутина, которой будет передаваться контекст абсолютно
+                                    всех событий сессии в виде словаря.
+        :return:        <Session>
+        """
+        session_id = await self.Target.attachToTarget(target_id, flatten=True)
+        return await self._addSession(session_id, target_id, callback)
+
+    async def setAutoAttachSessions(
+            self, handler: Optional[Callable[["Session"], Awaitable[None]]],
+            waitForDebuggerOnStart: bool = False) -> None:
+        """ Включает автоматическое присоединение к новым target-ам в режиме `flatten`.
+        Для каждого присоединённого target создаётся сессия, которая передаётся в `handler`.
+        Передайте None, чтобы выключить.
+        https://chromedevtools.github.io/devtools-protocol/tot/Target#method-setAutoAttach
+        :param handler:                 Корутина, получающая новую сессию.
+        :param waitForDebuggerOnStart:  Приостанавливать ли новые target-ы при присоединении.
+                                            Сессия в этом случае сама вызовет
+                                            Runtime.runIfWaitingForDebugger после активации.
+        """
+        if handler is not None and not iscoroutinefunction(handler):
+            raise TypeError("Handler must be a async callable object!")
+        self._on_session_attached = handler
+        await self.Target.setAutoAttach(handler is not None, waitForDebuggerOnStart, flatten=True)
+
+    async def _autoAttachSession(self, params: dict) -> None:
+        session_id: str = params["sessionId"]
+        if session_id in self._sessions or self._on_session_attached is None:
+            return
+        # ? После переподключения повторное автоприсоединение сообщает и о target-ах,
+        # ?     к которым сессии уже присоединены заново — лишние отсоединяются.
+        target_id: str = params["targetInfo"]["targetId"]
+        if any(session.conn_id == target_id for session in self._sessions.values()):
+            await self.Target.detachFromTarget(sessionId=session_id)
+            return
+        session = await self._addSession(session_id, target_id, None)
+        if params.get("waitingForDebugger"):
+            await session.Runtime.runIfWaitingForDebugger()
+        await self._on_session_attached(session)
+
+    async def _addSession(
+            self, session_id: str, target_id: str,
+            callback: Optional[CommonCallback]) -> "Session":
+        from .session import Session
+
+        if callback is not None and not iscoroutinefunction(callback):
+            raise TypeError("Argument 'callback' must be a coroutine")
+
+        session = Session(self, session_id, target_id, callback)
+        if self.journal is not None:
+            session.journal = ReplayJournal()
+        self._sessions[session_id] = session
+        await session.activate()
+        return session
 
     async def disconnect(self) -> None:
         """ Принудительно разрывает соединение. """
@@ -259,6 +695,7 @@ class Connection:
             return
         if self.verbose:
             log(f"[ DISCONNECT ] {self.conn_id}")
+        self._closing = True
         if not self._ws_session.closed:
             await self._ws_session.close()
 
@@ -269,17 +706,186 @@ class Connection:
         if not self.connected:
             return
 
-        self._receiver_loop.cancel()
+        # ? Отсоединение может быть вызвано из самого цикла приёма
+        if self._receiver_loop is not None and self._receiver_loop is not asyncio.current_task():
+            self._receiver_loop.cancel()
         if self.verbose:
             log(f"[ DETACH ] {self.conn_id}")
         self._connected = False
 
+        # ? Ожидающие ответа вызовы больше его не получат
+        self._failPending(f"{self} detached while waiting for a response")
+
+        # ? Сессии не переживают WebSocket, через который работают
+        while self._sessions:
+            await self._sessions.popitem()[1]._detach()
+
+        if self.metrics is not None:
+            self.metrics.stopExport()
+
+        # ? Ожидания событий не дождутся
+        if self._event_waiters:
+            waiters, self._event_waiters = self._event_waiters, {}
+            for pending in waiters.values():
+                for future, _ in pending:
+                    if not future.done():
+                        future.set_exception(ConnectionDetached(f"{self} detached while waiting for an event"))
+
+        # ? Потоки событий завершаются, отдав потребителям то, что успели получить
+        while self._streams:
+            self._streams[-1]._finish()
+
+        # ? Закрывается только собственный диспетчер: переданный извне может быть
+        # ?     общим с другими соединениями, а диспетчер сессии — её владельца
+        if self._owns_dispatcher:
+            self.dispatcher.close()
+
         if self._on_detach_listener:
             function, args = self._on_detach_listener
             await function(*args)
 
         self.on_close_event.set()
 
+    def _failPending(self, reason: str) -> None:
+        """ Завершает все ожидающие ответа вызовы исключением ConnectionDetached. """
+        if self.responses:
+            responses, self.responses = self.responses, {}
+            for future in responses.values():
+                if not future.done():
+                    future.set_exception(ConnectionDetached(reason))
+
+    def enableReconnect(
+            self, attempts: int = 5,
+            delay: float = 0.05,
+            max_delay: float = 2.0,
+            timeout: float = 10.0) -> ReplayJournal:
+        """ Включает автоматическое переподключение. Если WebSocket оборвётся, соединение
+        откроет новый к тому же target и одним пакетом команд восстановит состояние
+        сеанса: включённые домены, привязанные функции, скрипты на загрузку
+        (Page.addScriptOnLoad), шаблоны Fetch.enable, переопределения эмуляции и сети.
+        Присоединённые flatten-сессии присоединяются заново, со своим состоянием.
+        Слушатели событий, колбэк и диспетчер живут на стороне клиента и переподключение
+        переживают сами. Вызовы, ожидавшие ответа в момент обрыва, завершаются
+        исключением ConnectionDetached — повторять ли их, решает вызывающий. Новые
+        вызовы ждут окончания переподключения.
+
+        Состояние записывается в журнал(`conn.journal`) по мере выполнения команд,
+        поэтому включать режим лучше сразу после подключения. Уже включённые домены
+        и привязки переносятся в журнал при включении, но не шаблоны Fetch.enable,
+        скрипты на загрузку и переопределения, заданные до него.
+
+        Не переподключается после disconnect(), закрытия target и закрытия браузера.
+        :param attempts:    (optional) Сколько раз пытаться открыть новый WebSocket.
+        :param delay:       (optional) Пауза после первой неудачной попытки, в секундах.
+                                Каждая следующая вдвое длиннее.
+        :param max_delay:   (optional) Наибольшая пауза между попытками, в секундах.
+        :param timeout:     (optional) Тайм-аут ответа на команды воспроизведения, в секундах.
+        :return:        <ReplayJournal>
+        """
+        if type(self._ws_session) is PipeTransport:
+            raise ValueError("Pipe connection can't be reestablished")
+        self._reconnect_policy = attempts, delay, max_delay, timeout
+        for connection in (self, *self._sessions.values()):
+            if connection.journal is None:
+                connection.journal = connection._seedJournal()
+        return self.journal
+
+    def disableReconnect(self) -> None:
+        """ Выключает автоматическое переподключение и запись журнала. """
+        self._reconnect_policy = None
+        for connection in (self, *self._sessions.values()):
+            connection.journal = None
+
+    def _seedJournal(self) -> ReplayJournal:
+        """ Новый журнал с уже включёнными доменами и привязанными функциями. """
+        journal = ReplayJournal()
+        for domain in JOURNAL_SEED_DOMAINS:
+            # ? Ещё не созданный домен заведомо не включён
+            if domain in self._created_attributes and getattr(self, domain).enabled:
+                journal.record(f"{domain}.enable", None, None)
+        for name in self._bindings:
+            journal.record("Runtime.addBinding", {"name": name}, None)
+        return journal
+
+    async def _reconnect(self) -> bool:
+        """ Открывает новый WebSocket к тому же target и восстанавливает состояние.
+        Выполняется в задаче цикла приёма, получившей обрыв соединения, которая
+        после этого завершается — приём продолжает новая.
+        :return:        True — соединение восстановлено.
+        """
+        attempts, delay, max_delay, timeout = self._reconnect_policy
+        task = self._reconnect_task = asyncio.current_task()
+        try:
+            reason = f"{self} lost connection while waiting for a response"
+            self._failPending(reason)
+            for session in self._sessions.values():
+                session._failPending(reason)
+
+            for attempt in range(attempts):
+                try:
+                    ws_session = await connect(self.ws_url, ping_interval=None, **self.ws_options.asKwargs())
+                    break
+                except (OSError, InvalidHandshake, asyncio.TimeoutError) as e:
+                    if self.verbose:
+                        log(f"[ RECONNECT ] {self.conn_id} attempt {attempt + 1} failed: {e!r}")
+                    if attempt + 1 < attempts:
+                        await asyncio.sleep(min(delay * 2 ** attempt, max_delay))
+            else:
+                return False
+
+            if self.verbose:
+                log(f"[ RECONNECT ] {self.conn_id}")
+            self._ws_session = ws_session
+            self._receiver_loop = asyncio.create_task(self._recv())
+            # ? Только команды воспроизведения идут в обход ожидания. Новый цикл приёма
+            # ?     создан раньше и метку не наследует.
+            token = _reconnecting.set(self)
+            try:
+                await self._replay(timeout)
+            except (ConnectionDetached, ConnectionClosed) as e:
+                # ? Новый WebSocket тоже оборвался — им займётся новый цикл приёма
+                if self.verbose:
+                    log(f"[ RECONNECT ] {self.conn_id} replay interrupted: {e!r}")
+            finally:
+                _reconnecting.reset(token)
+            return True
+        finally:
+            if self._reconnect_task is task:
+                self._reconnect_task = None
+
+    async def _replay(self, timeout: float) -> None:
+        """ Присоединяет сессии заново и воспроизводит журналы соединения и сессий. """
+        if sessions := list(self._sessions.values()):
+            results = await self.callMany(*(
+                ("Target.attachToTarget", {"targetId": session.conn_id, "flatten": True})
+                for session in sessions
+            ), timeout=timeout)
+            self._sessions.clear()
+            for session, result in zip(sessions, results):
+                if isinstance(result, Exception):
+                    log(f"[ RECONNECT ] {session} can't be reattached: {result!r}", "[<- E ->]")
+                    await session._detach()
+                else:
+                    session._session_id = result["sessionId"]
+                    self._sessions[session._session_id] = session
+
+        await self._replayJournal(timeout)
+        await asyncio.gather(*(session._replayJournal(timeout) for session in self._sessions.values()))
+
+    async def _replayJournal(self, timeout: float) -> None:
+        """ Отправляет команды журнала одним пакетом. """
+        if not self.journal:
+            return
+        self._replaying = True
+        try:
+            results = await self.callMany(*self.journal.commands(), timeout=timeout)
+        finally:
+            self._replaying = False
+        self.journal.replayed(results)
+        for (domain_and_method, params), result in zip(self.journal.commands(), results):
+            if isinstance(result, Exception):
+                log(f"[ RECONNECT ] {self} '{domain_and_method}' failed on replay: {result!r}", "[<- E ->]")
+
     def clearOnDetach(self) -> None:
         
         self._on_detach_listener = None
@@ -310,7 +916,8 @@ class Connection:
 
         self._bindings[function.__name__] = function, bind_args
         await self.Runtime.addBinding(function.__name__)
-        await self.extend.pyCallAddOnload()
+        if not self.extend.py_call_enabled:
+            await self.extend.pyCallAddOnload()
 
     async def bindFunctions(
             self, *handlers_n_args: Tuple[Handler, Iterable]) -> None:
@@ -323,7 +930,6 @@ class Connection:
         """
         for function, args in handlers_n_args:
             await self.bindFunction(function, *args)
-        await self.extend.pyCallAddOnload()
 
     async def unbindFunctions(self, *functions: Union[Callable[[any], Awaitable[None]], str]) -> None:
         """ Прекращает генерацию событий `Runtime.bindingCalled` для указанных имён.
@@ -334,22 +940,115 @@ class Connection:
             self._bindings.pop(name)
             await self.Runtime.removeBinding(name)
 
+    async def bindRPC(
+            self, function: Callable[..., Awaitable[Any]], *bind_args: Any,
+            timeout: Optional[float] = 30.0
+    ) -> None:
+        """ Делает корутину вызываемой со страницы с получением результата. В отличие
+        от bindFunction(), вызов возвращает Promise, который разрешится значением,
+        возвращённым корутиной:
+            async def get_total(a: int, b: int) -> int:
+                return a + b
+
+            await conn.bindRPC(get_total)
+            # в браузере: const total = await py_rpc("get_total", 1, 2);
+
+        Результат должен сериализоваться в JSON. Исключение в корутине, или истечение
+        тайм-аута отклоняют Promise с Error, сообщение которого содержит описание
+        ошибки. Конкурентные вызовы выполняются параллельно. Страница тоже перестаёт
+        ждать результат — по наибольшему из тайм-аутов привязанных функций, чтобы
+        Promise не повис, если клиент отключится, не ответив.
+        :param function:    awaitable-объект.
+        :param bind_args:   последовательность аргументов, которые будут переданы
+                                function в последнюю очередь.
+        :param timeout:     (optional) Сколько секунд ждать завершения корутины. None — без
+                                ограничения.
+        """
+        if not iscoroutinefunction(function):
+            raise TypeError("RPC function must be a async callable object!")
+
+        first = not self._rpc_functions
+        self._rpc_functions[function.__name__] = function, bind_args, timeout
+        if first:
+            await self.Runtime.addBinding(PY_RPC_BINDING)
+        await self.extend.pyRPCAddOnload(self._pageRPCTimeout())
+
+    async def unbindRPC(self, *functions: Union[Callable[..., Awaitable[Any]], str]) -> None:
+        """ Отменяет регистрацию функций, добавленных bindRPC(). Их вызовы со страницы
+        будут отклонены.
+        :param functions:  Список функций, или их имён.
+        """
+        for function in functions:
+            self._rpc_functions.pop(function if type(function) is str else function.__name__, None)
+        if not self._rpc_functions:
+            await self.Runtime.removeBinding(PY_RPC_BINDING)
+            await self.extend.pyRPCRemoveOnLoad()
+        else:
+            await self.extend.pyRPCAddOnload(self._pageRPCTimeout())
+
+    def _pageRPCTimeout(self) -> Optional[float]:
+        """ Тайм-аут py_rpc() на стороне страницы: она не знает, какую функцию вызывает,
+        поэтому ждёт столько, сколько самая долгая из них. None — без ограничения.
+        """
+        timeouts = [handle[2] for handle in self._rpc_functions.values()]
+        return None if None in timeouts else max(timeouts)
+
+    async def _serveRPC(self, context_id: int, call_id: int, name: str, args: List[Any]) -> None:
+        """ Выполняет вызов py_rpc() и отправляет результат на страницу. """
+        if (handle := self._rpc_functions.get(name)) is None:
+            ok, value = False, f"No function is bound by bindRPC() under the name {name!r}"
+        else:
+            function, bind_args, timeout = handle
+            try:
+                value, ok = await asyncio.wait_for(function(*args, *bind_args), timeout), True
+            except asyncio.TimeoutError:
+                ok, value = False, f"{name!r} did not finish within {timeout} seconds"
+            except Exception as e:
+                ok, value = False, f"{type(e).__name__}: {e}"
+
+        settle = "function(id,ok,value){window.__py_rpc&&window.__py_rpc.settle(id,ok,value);}"
+        for _ in range(2):
+            try:
+                await self.call("Runtime.callFunctionOn", {
+                    "functionDeclaration": settle,
+                    "executionContextId": context_id,
+                    "arguments": [{"value": call_id}, {"value": ok}, {"value": value}],
+                })
+                return
+            # ? Результат не сериализуется — страница получит ошибку вместо него
+            except TypeError as e:
+                ok, value = False, f"Result of {name!r} is not JSON serializable: {e}"
+            # ? Страница ушла, или соединение разорвано — отдавать результат некому
+            except ConnectionDetached:
+                return
+            except Exception as e:
+                if self.verbose:
+                    log(f"py_rpc {name!r} result was not delivered: {e!r}", "[<- E ->]")
+                return
+
     async def addListenerForEvent(
         self,
             event: Union[str, DomainEvent],
             listener: Callable[[dict, Iterable], Awaitable[None]],
-            *args
+            *args,
+            retain_domain: bool = True
     ) -> None:
         """ Регистрирует слушателя, который будет вызываться при генерации определённых событий
         в браузере. Список таких событий можно посмотреть в разделе "Events" почти
         у каждого домена по адресу: https://chromedevtools.github.io/devtools-protocol/
         Например: 'DOM.attributeModified'
 
+        Первый слушатель события домена включает этот домен, а удаление последнего —
+        выключает его, если домен был включён таким образом. См. retainDomain().
+
         :param event:           Имя события, для которого регистируется слушатель. Например:
                                     'DOM.attributeModified'.
         :param listener:        Колбэк-функция.
         :param args:            (optional) любое кол-во агрументов, которые будут переданы
                                     в функцию последними.
+        :param retain_domain:   (optional) Учитывать слушателя в счётчике подписок домена.
+                                    False — для служебных слушателей, которые сам домен
+                                    регистрирует при включении.
         :return:        None
         """
         if not iscoroutinefunction(listener):
@@ -358,7 +1057,14 @@ class Connection:
         e: str = event if type(event) is str else event.value
         if e not in self._listeners_for_event:
             self._listeners_for_event[e]: dict = {}
+        is_new = listener not in self._listeners_for_event[e]
         self._listeners_for_event[e][listener] = args
+        if not is_new:
+            return
+        if retain_domain:
+            await self.retainDomain(e.split(".", 1)[0])
+        else:
+            self._unretained_listeners.add((e, listener))
 
     def removeListenerForEvent(
             self, event: Union[str, DomainEvent], listener: Callable[[dict, Iterable], Awaitable[None]]) -> None:
@@ -373,6 +1079,10 @@ class Connection:
         if m := self._listeners_for_event.get(e):
             if listener in m:
                 m.pop(listener)
+                if (e, listener) in self._unretained_listeners:
+                    self._unretained_listeners.discard((e, listener))
+                else:
+                    self._releaseDomain(e.split(".", 1)[0])
 
     def removeListenersForEvent(self, event: Union[str, DomainEvent]) -> None:
         """
@@ -382,7 +1092,202 @@ class Connection:
         """
         e = event if type(event) is str else event.value
         if e in self._listeners_for_event:
-            self._listeners_for_event.pop(e)
+            retained = 0
+            for listener in self._listeners_for_event.pop(e):
+                if (e, listener) in self._unretained_listeners:
+                    self._unretained_listeners.discard((e, listener))
+                else:
+                    retained += 1
+            self._releaseDomain(e.split(".", 1)[0], retained)
+
+    def events(
+            self, *events: Union[str, DomainEvent],
+            maxsize: int = 1_000,
+            overflow: OverflowPolicy = "block"
+    ) -> EventStream:
+        """ Открывает поток событий, имена которых совпадают с одним из шаблонов.
+        В отличие от слушателей, события не доставляются в отдельных задачах, а
+        накапливаются в ограниченном буфере, пока потребитель их не заберёт:
+            async with conn.events("Network.*", "Page.loadEventFired") as stream:
+                async for event in stream:
+                    print(event.method, event.params)
+
+        Домены событий включаются так же, как при регистрации слушателя. Вне
+        `async with` дождаться их включения можно через `await stream.ready()`,
+        закрыть поток — через `stream.close()`. При отсоединении итерация
+        завершается, когда буфер опустеет.
+        :param events:          Имена событий, или шаблоны fnmatch. Например: "Network.*".
+        :param maxsize:         (optional) Ёмкость буфера.
+        :param overflow:        (optional) Политика переполнения буфера: block | drop_oldest | coalesce.
+                                    См. EventStream.
+        :return:        EventStream
+        """
+        if not self.connected:
+            raise ConnectionDetached(f"{self} is not connected")
+        stream = EventStream(
+            self, tuple(e if type(e) is str else e.value for e in events), maxsize, overflow)
+        stream._open()
+        return stream
+
+    async def expectEvent(
+            self, event: Union[str, DomainEvent],
+            predicate: Optional[Predicate] = None,
+            timeout: Optional[float] = None
+    ) -> asyncio.Future:
+        """ Начинает ожидание события и возвращает future, которая получит его
+        параметры. Ожидание регистрируется до возврата, поэтому событие, вызванное
+        следующей командой, не будет пропущено:
+            loaded = await conn.expectEvent("Page.frameStoppedLoading",
+                                            lambda p: p["frameId"] == conn.conn_id)
+            await conn.call("Page.reload")
+            await loaded
+
+        Future разрешается прямо в цикле приёма, без задачи и без слушателя. Домен
+        события удерживается включённым, пока future не завершится — результатом,
+        исключением EventTimeoutError, ConnectionDetached при отсоединении, или
+        отменой. В любом случае ожидание снимается само.
+        :param event:           Имя события. Например: "Page.loadEventFired".
+        :param predicate:       (optional) Синхронная функция, получающая параметры события.
+                                    Ожидание завершается первым событием, для которого
+                                    она вернёт True. Исключение в ней завершает ожидание.
+        :param timeout:         (optional) Тайм-аут ожидания в секундах.
+        :return:        asyncio.Future[dict]
+        """
+        if not self.connected:
+            raise ConnectionDetached(f"{self} is not connected")
+        e: str = event if type(event) is str else event.value
+        future = asyncio.get_running_loop().create_future()
+        self._event_waiters.setdefault(e, []).append((future, predicate))
+
+        domain = e.split(".", 1)[0]
+        timer = None if timeout is None else asyncio.get_running_loop().call_later(
+            timeout, self._expireWaiter, future, e, timeout)
+
+        def done(f: asyncio.Future) -> None:
+            if timer is not None:
+                timer.cancel()
+            self._removeWaiter(e, f)
+            if domain in AUTO_ENABLE_DOMAINS:
+                self._releaseDomain(domain)
+
+        future.add_done_callback(done)
+        try:
+            await self.retainDomain(domain)
+        except BaseException:
+            future.cancel()
+            raise
+        return future
+
+    async def waitForEvent(
+            self, event: Union[str, DomainEvent],
+            predicate: Optional[Predicate] = None,
+            timeout: Optional[float] = None
+    ) -> dict:
+        """ Дожидается события и возвращает его параметры. См. expectEvent().
+        :param event:           Имя события. Например: "Page.loadEventFired".
+        :param predicate:       (optional) Синхронная функция, получающая параметры события.
+        :param timeout:         (optional) Тайм-аут ожидания в секундах. По истечении
+                                    возбуждается EventTimeoutError.
+        :return:        dict
+        """
+        return await (await self.expectEvent(event, predicate, timeout))
+
+    def _resolveWaiters(self, event: str, params: dict) -> None:
+        for future, predicate in tuple(self._event_waiters[event]):
+            if future.done():
+                continue
+            try:
+                if predicate is None or predicate(params):
+                    future.set_result(params)
+            except Exception as e:
+                future.set_exception(e)
+
+    def _removeWaiter(self, event: str, future: asyncio.Future) -> None:
+        if (pending := self._event_waiters.get(event)) is None:
+            return
+        for i, (f, _) in enumerate(pending):
+            if f is future:
+                del pending[i]
+                break
+        if not pending:
+            del self._event_waiters[event]
+
+    @staticmethod
+    def _expireWaiter(future: asyncio.Future, event: str, timeout: float) -> None:
+        if not future.done():
+            future.set_exception(EventTimeoutError(f"'{event}' did not occur within {timeout} seconds"))
+
+    async def retainDomain(self, domain: str) -> None:
+        """ Увеличивает счётчик подписок на домен. Первая подписка включает домен,
+        если он ещё не включён. Вызывается автоматически при регистрации слушателя
+        события домена, но может использоваться и напрямую — например, чтобы
+        держать домен включённым без слушателей. Каждому вызову должен
+        соответствовать вызов releaseDomain().
+        Управляются домены: Page, Network, DOM, CSS, Log, Overlay, Runtime.
+        :param domain:          Имя домена. Например: "Network".
+        """
+        if domain not in AUTO_ENABLE_DOMAINS:
+            return
+        self._domain_refs[domain] = self._domain_refs.get(domain, 0) + 1
+        if self._domain_refs[domain] == 1:
+            await self._syncDomain(domain)
+
+    async def releaseDomain(self, domain: str) -> None:
+        """ Уменьшает счётчик подписок на домен. Когда подписок не остаётся, домен
+        выключается, но только если он был включён автоматически — включённые
+        вручную домены остаются включёнными. DOM не выключается никогда.
+        :param domain:          Имя домена. Например: "Network".
+        """
+        if self._decrementDomain(domain):
+            await self._syncDomain(domain)
+
+    def _releaseDomain(self, domain: str, count: int = 1) -> None:
+        """ Синхронный вариант releaseDomain() для синхронных методов удаления
+        слушателей: выключение домена выполняется в фоновой задаче.
+        """
+        if count and self._decrementDomain(domain, count) and self.connected:
+            task = asyncio.get_running_loop().create_task(self._syncDomainInBackground(domain))
+            self._background_tasks.add(task)
+            task.add_done_callback(self._background_tasks.discard)
+
+    async def _syncDomainInBackground(self, domain: str) -> None:
+        """ _syncDomain() для фоновой задачи _releaseDomain(). """
+        try:
+            await self._syncDomain(domain)
+        # ? Если соединение потеряно, пока домен выключался, выключать уже нечего,
+        # ?     а исключение фоновой задачи некому получить. Сокет, закрытый раньше,
+        # ?     чем цикл приёма это заметил, возбуждает ConnectionClosed.
+        except (ConnectionDetached, ConnectionClosed):
+            pass
+
+    def _decrementDomain(self, domain: str, count: int = 1) -> bool:
+        """ Уменьшает счётчик. Возвращает True, если подписок больше не осталось. """
+        if (refs := self._domain_refs.get(domain)) is None:
+            return False
+        if refs > count:
+            self._domain_refs[domain] = refs - count
+            return False
+        del self._domain_refs[domain]
+        return True
+
+    async def _syncDomain(self, domain: str) -> None:
+        """ Приводит состояние домена в соответствие со счётчиком подписок.
+        Переключения сериализуются, поэтому быстрые подписка и отписка
+        не оставляют домен в промежуточном состоянии.
+        """
+        async with self._domain_lock:
+            if not self.connected:
+                return
+            target = getattr(self, domain)
+            enable, disable = AUTO_ENABLE_DOMAINS[domain]
+            if self._domain_refs.get(domain, 0) > 0:
+                if not target.enabled:
+                    await getattr(target, enable)()
+                    self._auto_enabled.add(domain)
+            elif domain in self._auto_enabled and disable is not None:
+                self._auto_enabled.discard(domain)
+                if target.enabled:
+                    await getattr(target, disable)()
 
     def __del__(self) -> None:
         if self.verbose:
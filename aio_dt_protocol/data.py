@@ -1,12 +1,20 @@
-import json
-from typing import Optional, TypeVar, Generic, Tuple, Callable, Coroutine
+from typing import Optional, TypeVar, Generic, Tuple, Callable, Coroutine, Type, Union
 from dataclasses import dataclass
 from enum import Enum
 from asyncio import Queue
 
+from .codec import Codec, get_codec
+
 CommonCallback = Optional[Callable[[dict], Coroutine[None, None, None]]]
 T = TypeVar("T")
 
+# ? Привязка, через которую py_call() в пакетном режиме передаёт накопленные вызовы
+PY_CALL_BATCH_BINDING = "py_call_batch"
+# ? Привязка, через которую py_rpc() передаёт вызовы, ожидающие результата
+PY_RPC_BINDING = "py_rpc_binding"
+# ? Файл в каталоге профиля с портом и путём WebSocket браузера
+DEVTOOLS_ACTIVE_PORT = "DevToolsActivePort"
+
 
 class BrowserLink:
     """ Внутренние адреса браузера.
@@ -82,11 +90,90 @@ class Serializer:
     """ Сериализатор данных. Позволяет настроить используемый
     кодировщик/декодировщик JSON.
 
-    encode — кодирует данные в JSON, должен возвращать тип str
-    decode — декодирует данные из JSON
+    encode       — кодирует данные в JSON, должен возвращать тип str
+    decode       — декодирует данные из JSON
+    encode_bytes — кодирует данные в JSON сразу в bytes(UTF-8)
+    decode_as    — декодирует данные из JSON в указанный тип
+
+    По умолчанию используется самый быстрый из установленных кодеков: orjson,
+    msgspec, или стандартный json. Выбрать кодек явно:
+        Serializer.use("json")
+    Если encode заменён вручную, сообщения протокола кодируются через него.
+    """
+    codec: Codec = get_codec()
+    encode: Callable[[any], str] = codec.encode
+    decode: Callable[[str | bytes], any] = codec.decode
+    encode_bytes: Callable[[any], bytes] = codec.encode_bytes
+    decode_as: Callable[[str | bytes, Type[T]], T] = codec.decode_as
+
+    @classmethod
+    def use(cls, codec: Union[str, Codec, None] = None) -> Codec:
+        """ Устанавливает кодек.
+        :param codec:   Имя кодека("json" | "orjson" | "msgspec"), его экземпляр,
+                            или None — самый быстрый из установленных.
+        :return:        Установленный кодек.
+        """
+        if not isinstance(codec, Codec):
+            codec = get_codec(codec)
+        cls.codec = codec
+        cls.encode = codec.encode
+        cls.decode = codec.decode
+        cls.encode_bytes = codec.encode_bytes
+        cls.decode_as = codec.decode_as
+        return codec
+
+    @classmethod
+    def pack(cls, data: dict, as_bytes: bool = False) -> Union[str, bytes]:
+        """ Кодирует исходящее сообщение протокола.
+        :param data:        Сообщение.
+        :param as_bytes:    (optional) Транспорт принимает bytes: кодировать сразу в
+                                UTF-8, без промежуточной строки. Заменённый вручную
+                                encode всё равно используется и возвращает str.
+        """
+        if as_bytes and cls.encode is cls.codec.encode:
+            return cls.codec.encode_bytes(data)
+        return cls.encode(data)
+
+
+@dataclass
+class WebSocketOptions:
+    """ Настройки WebSocket соединения с браузером. Значения по умолчанию рассчитаны
+    на большие сообщения протокола(полностраничные скриншоты, DOM.getDocument(depth=-1),
+    тела ответов) при работе через локальный сокет.
+
+    Принятые, но ещё не прочитанные сообщения занимают до `max_size * max_queue`
+    байт на соединение: с настройками по умолчанию — до 4 ГБ, если все они
+    предельного размера. Цикл приёма стоит, пока диспетчер с политикой "block"
+    ждёт места в очереди событий, и тогда этот буфер заполняется. Увеличивая
+    `max_size`, уменьшайте `max_queue`, и наоборот.
+    https://websockets.readthedocs.io/en/stable/reference/legacy/client.html
     """
-    encode: Callable[[any], str] = json.dumps
-    decode: Callable[[str | bytes], any] = json.loads
+    # ? Наибольший размер входящего сообщения в байтах. Браузер ограничивает свои
+    # ?     сообщения 256 МБ. None — без ограничения.
+    max_size: Optional[int] = 256 * 2 ** 20
+    # ? Сколько принятых, но ещё не прочитанных сообщений держать в буфере. Цикл приёма
+    # ?     читает сразу, поэтому очередь нужна только на время всплесков событий.
+    # ?     Большие сообщения редки, поэтому очередь небольшая: см. `max_size * max_queue`.
+    max_queue: Optional[int] = 16
+    # ? Размер буферов чтения и записи транспорта, в байтах
+    read_limit: int = 2 ** 20
+    write_limit: int = 2 ** 20
+    # ? "deflate" — сжимать сообщения(permessage-deflate), если браузер согласен. На
+    # ?     локальном сокете сжатие только тратит процессор, на удалённом — экономит трафик.
+    compression: Optional[str] = None
+    # ? Тайм-аут установления соединения, в секундах
+    open_timeout: Optional[float] = 10.0
+
+    def asKwargs(self) -> dict:
+        """ Аргументы для websockets.connect(). """
+        return {
+            "max_size": self.max_size,
+            "max_queue": self.max_queue,
+            "read_limit": self.read_limit,
+            "write_limit": self.write_limit,
+            "compression": self.compression,
+            "open_timeout": self.open_timeout,
+        }
 
 
 @dataclass
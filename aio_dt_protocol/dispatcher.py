@@ -0,0 +1,219 @@
+import asyncio
+from collections import deque
+from typing import (
+    Callable, Awaitable, Deque, Dict, Tuple, Any, Literal, Optional, List, Hashable)
+
+from .utils import log
+
+OverflowPolicy = Literal["block", "drop_oldest", "coalesce"]
+Handler = Callable[..., Awaitable[None]]
+Job = Tuple[Handler, Tuple[Any, ...]]
+
+OVERFLOW_POLICIES = ("block", "drop_oldest", "coalesce")
+
+
+class EventDispatcher:
+    """ Доставляет события слушателям через ограниченное число воркеров, вместо
+    отдельной задачи на каждый вызов слушателя.
+
+    Для каждого типа события(ключа) ведётся своя очередь, которую в каждый момент
+    времени разбирает не более одного воркера, поэтому события одного типа
+    доставляются строго в порядке поступления. Разные типы обрабатываются
+    параллельно, но не более чем `workers` одновременно.
+
+    Когда очередь достигает `high_water`, срабатывает политика переполнения:
+        * block       — цикл приёма ждёт, пока в очереди освободится место.
+                            Даёт обратное давление на сокет. Слушатель, который
+                            сам ожидает ответа на команду, при заполненной
+                            очереди своего же события приведёт к взаимной
+                            блокировке — для таких событий выбирайте другую
+                            политику или больший порог.
+        * drop_oldest — самое старое событие в очереди отбрасывается.
+        * coalesce    — все ожидающие события этого типа заменяются новым,
+                            актуальным остаётся только последнее состояние.
+
+    Политику и порог можно переопределить для отдельного типа события:
+        conn.dispatcher.setPolicy("Network.dataReceived", "drop_oldest", 100)
+    """
+    __slots__ = (
+        "workers", "high_water", "overflow", "dropped", "coalesced",
+        "_queues", "_ready", "_tasks", "_space_waiters", "_policies"
+    )
+
+    def __init__(
+            self,
+            workers: int = 4,
+            high_water: int = 10_000,
+            overflow: OverflowPolicy = "block"
+    ) -> None:
+        """
+        :param workers:         Количество воркеров, вызывающих слушателей.
+        :param high_water:      Максимальная длина очереди одного типа событий.
+        :param overflow:        Политика переполнения: block | drop_oldest | coalesce.
+        """
+        if workers < 1:
+            raise ValueError("'workers' must be a positive integer")
+        if high_water < 1:
+            raise ValueError("'high_water' must be a positive integer")
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow!r}")
+
+        self.workers = workers
+        self.high_water = high_water
+        self.overflow: OverflowPolicy = overflow
+        self.dropped = 0
+        self.coalesced = 0
+
+        self._queues: Dict[Hashable, Deque[Job]] = {}
+        self._ready: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._space_waiters: Dict[Hashable, List[asyncio.Future]] = {}
+        self._policies: Dict[str, Tuple[OverflowPolicy, int]] = {}
+
+    def setPolicy(
+            self, event: str,
+            overflow: OverflowPolicy,
+            high_water: Optional[int] = None) -> None:
+        """ Переопределяет политику переполнения для указанного типа события.
+        :param event:           Имя события. Например: "Network.dataReceived".
+        :param overflow:        Политика переполнения: block | drop_oldest | coalesce.
+        :param high_water:      (optional) Порог длины очереди. По умолчанию — общий.
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow!r}")
+        self._policies[event] = overflow, high_water or self.high_water
+
+    def depth(self, event: Optional[str] = None) -> int:
+        """ Количество ожидающих доставки событий. Всего, или для указанного типа.
+        """
+        if event is None:
+            return sum(len(q) for q in self._queues.values())
+        return sum(len(q) for key, q in self._queues.items() if key[1] == event)
+
+    def stats(self) -> Dict[str, Any]:
+        """ Снимок состояния: глубина очередей по типам событий, счётчики
+        отброшенных и схлопнутых событий.
+        """
+        queues: Dict[str, int] = {}
+        for (_, event), q in self._queues.items():
+            queues[event] = queues.get(event, 0) + len(q)
+        return {
+            "depth": sum(queues.values()),
+            "queues": queues,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "workers": len(self._tasks),
+        }
+
+    async def put(self, key: Tuple[Optional[str], str], handler: Handler, args: Tuple[Any, ...]) -> None:
+        """ Ставит вызов `handler(*args)` в очередь типа события.
+        :param key:         Пара (sessionId, имя события).
+        :param handler:     Корутина-обработчик.
+        :param args:        Аргументы обработчика.
+        """
+        if self._ready is None:
+            self._start()
+
+        queue = self._queues.get(key)
+        if queue is None:
+            queue = self._queues[key] = deque()
+            self._ready.put_nowait(key)
+
+        overflow, high_water = self._policies.get(key[1]) or (self.overflow, self.high_water)
+        if len(queue) >= high_water:
+            if overflow == "drop_oldest":
+                queue.popleft()
+                self.dropped += 1
+            elif overflow == "coalesce":
+                self.coalesced += len(queue)
+                queue.clear()
+            else:
+                while len(queue) >= high_water:
+                    waiter = asyncio.get_running_loop().create_future()
+                    self._space_waiters.setdefault(key, []).append(waiter)
+                    await waiter
+                    # ? Пока ждали, очередь могла быть полностью разобрана
+                    if (queue := self._queues.get(key)) is None:
+                        queue = self._queues[key] = deque()
+                        self._ready.put_nowait(key)
+
+        queue.append((handler, args))
+
+    def close(self) -> None:
+        """ Останавливает воркеров и отбрасывает недоставленные события. """
+        # ? Закрытие может быть инициировано из самого обработчика события
+        current = asyncio.current_task()
+        for task in self._tasks:
+            if task is not current:
+                task.cancel()
+        self._tasks.clear()
+        self._queues.clear()
+        self._ready = None
+        for waiters in self._space_waiters.values():
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.cancel()
+        self._space_waiters.clear()
+
+    def _start(self) -> None:
+        self._ready = asyncio.Queue()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def _worker(self) -> None:
+        ready = self._ready
+        while True:
+            key = await ready.get()
+            queue = self._queues[key]
+            while queue:
+                handler, args = queue.popleft()
+                if waiters := self._space_waiters.pop(key, None):
+                    for waiter in waiters:
+                        if not waiter.done():
+                            waiter.set_result(None)
+                try:
+                    await handler(*args)
+                except Exception as e:
+                    log(f"Event handler {handler!r} raised {e!r}", "[<- E ->]")
+                except asyncio.CancelledError as e:
+                    # ? Отменили сам воркер: close() уже отсоединил его очередь, или
+                    # ?     цикл событий завершается. Иначе отмену выпустил слушатель,
+                    # ?     и воркер продолжает, чтобы не бросить очереди своих событий.
+                    if self._ready is not ready or _cancelling(asyncio.current_task()):
+                        raise
+                    log(f"Event handler {handler!r} raised {e!r}", "[<- E ->]")
+            if self._ready is not ready:
+                return
+            del self._queues[key]
+
+
+def _cancelling(task: Optional[asyncio.Task]) -> bool:
+    """ Запрошена ли отмена задачи. Task.cancelling() есть только с Python 3.11:
+    раньше отмену воркера распознаёт только close().
+    """
+    cancelling = getattr(task, "cancelling", None)
+    return cancelling is not None and cancelling() > 0
+
+
+async def run_batch(jobs: Tuple[Job, ...]) -> None:
+    """ Последовательно выполняет вызовы из одного пакета, в порядке их совершения.
+    Исключение одного вызова не мешает остальным.
+    """
+    for handler, args in jobs:
+        try:
+            await handler(*args)
+        except Exception as e:
+            log(f"Event handler {handler!r} raised {e!r}", "[<- E ->]")
+
+
+async def fan_out(listeners: Tuple[Tuple[Handler, Tuple[Any, ...]], ...], params: dict) -> None:
+    """ Последовательно вызывает всех слушателей одного события. Исключение
+    одного слушателя не мешает остальным.
+    """
+    for listener, largs in listeners:
+        try:
+            await listener(        # корутина
+                params,            # её "params" — всегда передаётся
+                *largs             # список bind-аргументов
+            )
+        except Exception as e:
+            log(f"Listener {listener!r} raised {e!r}", "[<- E ->]")
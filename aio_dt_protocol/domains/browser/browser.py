@@ -1,5 +1,6 @@
 from typing import Optional, List, TYPE_CHECKING
 from ...data import DomainEvent
+from ...exceptions import ConnectionDetached
 from .types import Version, Bounds, WindowInfo
 if TYPE_CHECKING:
     from ...connection import Connection
@@ -211,7 +212,11 @@ class Browser:
         :return:        Закрылся/был закрыт
         """
         if self._connection.connected:
-            await self._connection.call("Browser.close")
+            try:
+                await self._connection.call("Browser.close")
+            except ConnectionDetached:
+                # ? Браузер может закрыть соединение раньше, чем ответит
+                pass
             return True
         return False
 
@@ -39,7 +39,8 @@ class CSS:
         :return:
         """
         if not self.enabled:
-            await self._connection.addListenerForEvent("CSS.styleSheetAdded", self._CSS_sheet_catcher)
+            await self._connection.addListenerForEvent(
+                "CSS.styleSheetAdded", self._CSS_sheet_catcher, retain_domain=False)
             await self._connection.call("CSS.enable")
             self.enabled = True
 
@@ -7,10 +7,15 @@ from ...exceptions import (
     CouldNotFindNodeWithGivenID, RootIDNoLongerExists, NodeNotResolved, NodeNotDescribed,
     StateError
 )
+from ...utils import log
 if TYPE_CHECKING:
     from ...connection import Connection
 
 
+# ? Сколько секунд getChildNodes() по умолчанию ждёт 'DOM.setChildNodes'
+CHILD_NODES_TIMEOUT = 30.0
+
+
 def to_dict_attrs(a: list) -> Union[dict, None]:
     if not a: return None
     return {a[i]: a[i+1] for i in range(0, len(a), 2)}
@@ -164,12 +169,15 @@ class Node:
             raise
         return nodes
 
-    async def getChildNodes(self, depth: int = -1, pierce: bool = False) -> asyncio.Event:
-        """ Запрашивает событие 'DOM.setChildNodes' для собственного узла и устанавливает
-        слушателя и возвращает ожидаемый объект события, который получит уведомление о том,
+    async def getChildNodes(
+            self, depth: int = -1,
+            pierce: bool = False,
+            timeout: Optional[float] = CHILD_NODES_TIMEOUT) -> asyncio.Event:
+        """ Запрашивает событие 'DOM.setChildNodes' для собственного узла, начинает его
+        ожидание и возвращает ожидаемый объект события, который получит уведомление о том,
         что ожидаемое событие произошло и все данные уже обработаны.
-        Как только 'DOM.setChildNodes' случится для текущего идентификатора узла, слушатель
-        будет отменён. Список полученных потомков узла, включая текстовые будет доступен
+        Как только 'DOM.setChildNodes' случится для текущего идентификатора узла, ожидание
+        будет снято. Список полученных потомков узла, включая текстовые будет доступен
         через его свойство 'children'.
 
         !ВНИМАНИЕ! Запрос потомков у <input /> не генерирует событие 'DOM.setChildNodes',
@@ -178,20 +186,42 @@ class Node:
                                     По умолчанию -1 == все. Чтобы задать конкретное значение,
                                     укажите любое целое число больше нуля.
         :param pierce:          Получать содержимое теневых узлов(shadowRoots, shadowDOM)?
+        :param timeout:         (optional) Через сколько секунд перестать ожидать событие,
+                                    если оно так и не случилось. Объект события в этом
+                                    случае уведомлён не будет. None — ждать, пока
+                                    соединение не будет закрыто.
         :return:        asyncio.Event
         """
         event = asyncio.Event()
-        async def catch(data: dict) -> None:
-            if data["parentId"] == self.nodeId:
-                self._connection.removeListenerForEvent("DOM.setChildNodes", catch)
-                self.children = self._addChildren(data["nodes"])
-                event.set()
+        node_id = self.nodeId
 
         self.children = None
-        await self._connection.addListenerForEvent("DOM.setChildNodes", catch)
-        await self.requestChildNodes(depth, pierce)
+        waiter = await self._connection.expectEvent(
+            "DOM.setChildNodes", lambda params: params["parentId"] == node_id, timeout)
+        try:
+            await self.requestChildNodes(depth, pierce)
+        except BaseException:
+            waiter.cancel()
+            raise
+        waiter.add_done_callback(lambda w: self._receiveChildren(w, event))
         return event
 
+    def _receiveChildren(self, waiter: asyncio.Future, event: asyncio.Event) -> None:
+        """ Получает 'DOM.setChildNodes' для getChildNodes() и заполняет 'children'.
+        Вызывается по завершении ожидания, поэтому отдельная задача не нужна.
+        """
+        if waiter.cancelled():
+            return
+        if waiter.exception() is not None:
+            # ? EventTimeoutError или ConnectionDetached: событие так и не пришло
+            return
+        try:
+            self.children = self._addChildren(waiter.result()["nodes"])
+        except Exception as e:
+            log(f"Children of node {self.nodeId} were not added: {e!r}", "[<- E ->]")
+            return
+        event.set()
+
 
     async def ScrollIntoView(self, rect: dict = None) -> None:
         """
@@ -1,4 +1,5 @@
-from typing import Optional, List, Callable, Awaitable, TYPE_CHECKING
+from base64 import b64decode
+from typing import Optional, List, Callable, Awaitable, AsyncIterator, TYPE_CHECKING
 from ...data import DomainEvent
 from .types import EventRequestPaused, EventAuthRequired, HeaderEntry, RequestPattern
 if TYPE_CHECKING:
@@ -228,6 +229,31 @@ class Fetch:
         """
         return await self._connection.call("Fetch.takeResponseBodyAsStream", {"requestId": requestId})
 
+    async def streamResponseBody(self, requestId: str, chunk_size: int = 2 ** 20) -> AsyncIterator[bytes]:
+        """
+        Читает тело ответа частями, через поток IO, вместо одного сообщения с телом целиком,
+            как у getResponseBody. Ни одно сообщение протокола не превышает `chunk_size`,
+            поэтому большие тела не упираются в ограничение размера сообщения WebSocket
+            и не занимают память целиком. Запрос должен быть приостановлен на этапе
+            HeadersReceived, после чтения его нужно отменить, или выполнить(fulfillRequest).
+            async for chunk in conn.Fetch.streamResponseBody(event.requestId):
+                file.write(chunk)
+        https://chromedevtools.github.io/devtools-protocol/tot/IO#method-read
+        :param requestId:               Идентификатор перехваченного запроса для получения его тела.
+        :param chunk_size:              (optional) Наибольший размер части, в байтах.
+        :return:                        Асинхронный итератор частей тела.
+        """
+        handle = (await self.takeResponseBodyAsStream(requestId))["stream"]
+        try:
+            while True:
+                chunk = await self._connection.call("IO.read", {"handle": handle, "size": chunk_size})
+                if chunk["data"]:
+                    yield b64decode(chunk["data"]) if chunk.get("base64Encoded") else chunk["data"].encode()
+                if chunk["eof"]:
+                    break
+        finally:
+            await self._connection.call("IO.close", {"handle": handle})
+
 
 class FetchEvent(DomainEvent):
     authRequired = "Fetch.authRequired"
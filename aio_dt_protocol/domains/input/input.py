@@ -69,6 +69,31 @@ class Input:
                                             но не равны им.(по умолчанию: []).
         :return:        None
         """
+        await self._connection.call("Input.dispatchKeyEvent", self.keyEventArgs(
+            type_, modifiers, timestamp, text, unmodifiedText, keyIdentifier, code, key, windowsVirtualKeyCode,
+            nativeVirtualKeyCode, autoRepeat, isKeypad, isSystemKey, location, commands))
+
+    @staticmethod
+    def keyEventArgs(
+        type_: str,
+        modifiers:             int = 0,
+        timestamp:             Optional[int] = None,
+        text:                  str = "",
+        unmodifiedText:        str = "",
+        keyIdentifier:         str = "",
+        code:                  str = "",
+        key:                   str = "",
+        windowsVirtualKeyCode: int = 0,
+        nativeVirtualKeyCode:  int = 0,
+        autoRepeat:           bool = False,
+        isKeypad:             bool = True,
+        isSystemKey:          bool = False,
+        location:              int = 0,
+        commands:             Optional[list] = None
+    ) -> dict:
+        """ Параметры команды 'Input.dispatchKeyEvent', см. dispatchKeyEvent(). Нужны,
+        чтобы отправить несколько событий одним пакетом через `Connection.callMany()`.
+        """
         args = {
             "type": type_, "modifiers": modifiers, "text": text, "unmodifiedText": unmodifiedText,
             "keyIdentifier": keyIdentifier, "code": code, "key": key,
@@ -80,7 +105,7 @@ class Input:
             args.update({"timestamp": timestamp})
         else:
             args.update({"timestamp": int(time.time() * 1000)})
-        await self._connection.call("Input.dispatchKeyEvent", args)
+        return args
 
     async def dispatchMouseEvent(
         self, type_: str, x: float, y: float,
@@ -140,6 +165,30 @@ class Input:
                                             mouse, pen
         :return:
         """
+        await self._connection.call("Input.dispatchMouseEvent", self.mouseEventArgs(
+            type_, x, y, modifiers, timestamp, button, buttons, clickCount, force, tangentialPressure,
+            tiltX, tiltY, twist, deltaX, deltaY, pointerType))
+
+    @staticmethod
+    def mouseEventArgs(
+        type_: str, x: float, y: float,
+        modifiers:            int = 0,
+        timestamp:            Optional[int] = None,
+        button:               str = "none",
+        buttons:              int = 0,
+        clickCount:           int = 1,
+        force:              float = 0,
+        tangentialPressure: float = 0,
+        tiltX:                int = 0,
+        tiltY:                int = 0,
+        twist:                int = 0,
+        deltaX:             float = 0,
+        deltaY:             float = 0,
+        pointerType:          str = "mouse"
+    ) -> dict:
+        """ Параметры команды 'Input.dispatchMouseEvent', см. dispatchMouseEvent(). Нужны,
+        чтобы отправить несколько событий одним пакетом через `Connection.callMany()`.
+        """
         args = {
             "type": type_, "x": x, "y": y, "modifiers": modifiers, "button": button, "buttons": buttons,
             "clickCount": clickCount, "force": force, "tangentialPressure": tangentialPressure, "tiltX": tiltX,
@@ -149,7 +198,7 @@ class Input:
             args.update({"timestamp": timestamp})
         else:
             args.update({"timestamp": int(time.time() * 1000)})
-        await self._connection.call("Input.dispatchMouseEvent", args)
+        return args
 
     async def dispatchTouchEvent(
         self, type_: str,
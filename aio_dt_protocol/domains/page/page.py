@@ -1,5 +1,5 @@
 import asyncio
-from typing import Optional, Union, Callable, Awaitable, TYPE_CHECKING
+from typing import Optional, Union, Callable, Awaitable, List, TYPE_CHECKING
 from ...data import DomainEvent
 from ...utils import prepare_url
 from .types import FrameTree, LifecycleEventData
@@ -7,6 +7,9 @@ if TYPE_CHECKING:
     from ...connection import Connection
 
 
+# ? Сколько секунд navigate() и reload() по умолчанию ждут окончания загрузки
+LOAD_TIMEOUT = 60.0
+
 class Page:
     """
     #   https://chromedevtools.github.io/devtools-protocol/tot/Page
@@ -50,19 +53,19 @@ class Page:
         """ Уведомляет событие loading_state, что основной фрейм страницы завершил загрузку.
         :param state:           Вкл/выкл
         """
-        async def load_watcher_wrapper(params: dict, *_) -> None:
-            if params["frameId"] == self._connection.conn_id:
-                self.loading_state.set()
-
         if state != self.loading_state_watcher_enabled:
             if state:
                 await self._connection.addListenerForEvent(
-                    PageEvent.frameStoppedLoading, load_watcher_wrapper)
+                    PageEvent.frameStoppedLoading, self._loadWatcher)
             else:
                 self._connection.removeListenerForEvent(
-                    PageEvent.frameStoppedLoading, load_watcher_wrapper)
+                    PageEvent.frameStoppedLoading, self._loadWatcher)
             self.loading_state_watcher_enabled = state
 
+    async def _loadWatcher(self, params: dict, *_) -> None:
+        if params["frameId"] == self._connection.conn_id:
+            self.loading_state.set()
+
     async def createIsolatedWorld(
             self, frameId: str, worldName: Optional[str] = None, grantUniversalAccess: Optional[bool] = None) -> int:
         """
@@ -107,7 +110,8 @@ class Page:
             self,
             url:  Union[str,     bytes] = "about:blank",
             wait_for_load:         bool = True,
-            wait_for_network_idle: bool = False
+            wait_for_network_idle: bool = False,
+            timeout:    Optional[float] = LOAD_TIMEOUT
     ) -> None:
         """
         Переходит на адрес указанного 'url'.
@@ -116,13 +120,13 @@ class Page:
         :param wait_for_load:           (optional) Если 'True' - ожидает состояния остановки
                                             загрузки ресурсов, если активны уведомления домена Page.
         :param wait_for_network_idle:   (optional) Если 'True' - ожидает прекращения активности сети
+        :param timeout:                 (optional) Сколько секунд ждать загрузки. По истечении
+                                            возбуждается EventTimeoutError. None — без ограничения.
         :return:
         """
         url = prepare_url(url, self._connection.browser_name)
-
-        await self._connection.call("Page.navigate", {"url": url})
-        if wait_for_load or wait_for_network_idle:
-            await self.waitForLoad(wait_for_load, wait_for_network_idle)
+        await self._callAndWaitForLoad(
+            "Page.navigate", {"url": url}, wait_for_load, wait_for_network_idle, timeout)
 
     async def waitForLoad(self, by_load_state: bool = False, by_network_idle: bool = True) -> None:
         """ Дожидается указанного состояния.
@@ -349,7 +353,8 @@ class Page:
             ignoreCache: bool = False,
             scriptToEvaluateOnLoad: str = "",
             wait_for_load: bool = False,
-            wait_for_network_idle: bool = True
+            wait_for_network_idle: bool = True,
+            timeout:    Optional[float] = LOAD_TIMEOUT
     ) -> None:
         """
         Перезагружает страницу инстанса, при необходимости игнорируя кеш.
@@ -361,18 +366,66 @@ class Page:
         :param wait_for_load:           (optional) По умолчанию — дожидается полного завершения
                                             загрузки страницы(document.readyState === "complete").
                                             Установите False, если это поведение не требуется.
+        :param timeout:                 (optional) Сколько секунд ждать загрузки. По истечении
+                                            возбуждается EventTimeoutError. None — без ограничения.
         :return:
         """
+        args = {}
+        if ignoreCache:            args.update({"ignoreCache": ignoreCache})
+        if scriptToEvaluateOnLoad: args.update({"scriptToEvaluateOnLoad": scriptToEvaluateOnLoad})
+        await self._callAndWaitForLoad("Page.reload", args, wait_for_load, wait_for_network_idle, timeout)
+
+    async def _callAndWaitForLoad(
+            self, domain_and_method: str, params: dict,
+            by_load_state: bool, by_network_idle: bool, timeout: Optional[float] = LOAD_TIMEOUT) -> None:
+        """ Выполняет команду перехода и дожидается загрузки основного фрейма. Ожидания
+        регистрируются до отправки команды, поэтому события не теряются, даже если
+        придут раньше ответа, а состояние прошлой загрузки не принимается за новое.
+        Если загрузка не завершилась за `timeout` секунд — возбуждает EventTimeoutError.
+        """
         if self.enabled:
             self.loading_state.clear()
         if self.lifecycle_events_enabled:
             self.network_idle_state.clear()
-        args = {}
-        if ignoreCache:            args.update({"ignoreCache": ignoreCache})
-        if scriptToEvaluateOnLoad: args.update({"scriptToEvaluateOnLoad": scriptToEvaluateOnLoad})
-        await self._connection.call("Page.reload", args)
-        if wait_for_load or wait_for_network_idle:
-            await self.waitForLoad(wait_for_load, wait_for_network_idle)
+
+        waiters: List[asyncio.Future] = []
+        try:
+            await self._expectLoad(by_load_state, by_network_idle, waiters, timeout)
+            await self._connection.call(domain_and_method, params)
+            if waiters:
+                await asyncio.gather(*waiters)
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+
+    async def _expectLoad(
+            self, by_load_state: bool, by_network_idle: bool,
+            waiters: List[asyncio.Future], timeout: Optional[float] = None) -> None:
+        """ Начинает ожидание окончания загрузки и/или простоя сети основного фрейма,
+        добавляя ожидания в `waiters`.
+        """
+        if not by_load_state and not by_network_idle:
+            return
+        # ? Домен включается явно, а не через счётчик подписок: иначе каждый переход
+        # ?     включал бы и выключал его заново
+        if not self.enabled:
+            await self.enable()
+
+        frame_id = self._connection.conn_id
+        # ? Наблюдатели, как и прежде, поддерживают loading_state и network_idle_state
+        # ?     для кода, который проверяет их после перехода
+        if by_load_state:
+            if not self.loading_state_watcher_enabled:
+                await self.enableLoadWatcher(True)
+            waiters.append(await self._connection.expectEvent(
+                PageEvent.frameStoppedLoading, lambda params: params["frameId"] == frame_id, timeout))
+        if by_network_idle:
+            if not self.network_idle_state_watcher_enabled:
+                await self.enableNetworkIdleWatcher(True)
+            waiters.append(await self._connection.expectEvent(
+                PageEvent.lifecycleEvent,
+                lambda params: params["frameId"] == frame_id and params["name"] == "networkIdle",
+                timeout))
 
     async def getNavigationHistory(self) -> dict:
         """
@@ -442,7 +495,7 @@ class Page:
             if enabled and handler is not None:
                 await self._connection.addListenerForEvent(
                     PageEvent.lifecycleEvent, life_cycle_event_wrapper)
-            else:
+            elif not enabled:
                 self._connection.removeListenersForEvent(PageEvent.lifecycleEvent)
 
             await self._connection.call("Page.setLifecycleEventsEnabled", {"enabled": enabled})
@@ -454,22 +507,22 @@ class Page:
 
         Этот метод активируется автоматически при совершении переходов по URL-адресам
         """
-        async def idle_watcher_wrapper(params: dict, *_) -> None:
-            if params["frameId"] == self._connection.conn_id:
-                if params["name"] == "networkIdle":
-                    self.network_idle_state.set()
-
         if state:
             if not self.lifecycle_events_enabled:
                 await self.setLifecycleEventsEnabled(True)
             if not self.network_idle_state_watcher_enabled:
                 await self._connection.addListenerForEvent(
-                    PageEvent.lifecycleEvent, idle_watcher_wrapper)
+                    PageEvent.lifecycleEvent, self._idleWatcher)
         elif not state and self.network_idle_state_watcher_enabled:
             self._connection.removeListenerForEvent(
-                PageEvent.lifecycleEvent, idle_watcher_wrapper)
+                PageEvent.lifecycleEvent, self._idleWatcher)
         self.network_idle_state_watcher_enabled = state
 
+    async def _idleWatcher(self, params: dict, *_) -> None:
+        if params["frameId"] == self._connection.conn_id:
+            if params["name"] == "networkIdle":
+                self.network_idle_state.set()
+
     async def bringToFront(self) -> None:
         """
         Выводит страницу на передний план (активирует вкладку).
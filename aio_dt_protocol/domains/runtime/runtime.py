@@ -8,6 +8,7 @@ from .types import (
     RemoteObject,
 )
 from ...data import DomainEvent, Serializer
+from ...utils import lazy_attributes
 from ...exceptions import (
     PromiseEvaluateError,
     highlight_promise_error,
@@ -24,10 +25,12 @@ class Runtime:
     """
     __slots__ = ("_connection", "enabled", "context_manager")
 
+    # ? Создаётся при первом обращении
+    __getattr__ = lazy_attributes({"context_manager": lambda runtime: ContextManager()})
+
     def __init__(self, conn) -> None:
         self._connection: Connection = conn
         self.enabled = False
-        self.context_manager = ContextManager()
 
     async def getProperties(
             self, objectId: str,
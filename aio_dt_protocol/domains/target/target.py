@@ -1,5 +1,6 @@
 from typing import Optional, List, Awaitable, Callable, TYPE_CHECKING
 from ...data import DomainEvent
+from ...exceptions import ConnectionDetached
 from .types import TargetInfo
 if TYPE_CHECKING:
     from ...connection import Connection
@@ -183,7 +184,12 @@ class Target:
         :return:                None
         """
         if targetId is None: targetId = self._connection.conn_id
-        await self._connection.call("Target.closeTarget", {"targetId": targetId})
+        try:
+            await self._connection.call("Target.closeTarget", {"targetId": targetId})
+        except ConnectionDetached:
+            # ? Закрывая собственную вкладку, соединение может оборваться раньше ответа
+            if targetId != self._connection.conn_id:
+                raise
 
     async def close(self) -> None:
         """
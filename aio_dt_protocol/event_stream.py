@@ -0,0 +1,208 @@
+import asyncio
+import re
+from collections import deque
+from fnmatch import translate
+from typing import Deque, Dict, List, NamedTuple, Optional, Tuple, TYPE_CHECKING
+
+from .dispatcher import OverflowPolicy, OVERFLOW_POLICIES
+
+if TYPE_CHECKING:
+    from .connection import Connection
+
+
+class StreamEvent(NamedTuple):
+    """ Событие, полученное из потока `Connection.events()`. """
+    method: str
+    params: dict
+
+
+class EventStream:
+    """ Асинхронный итератор по событиям соединения, имена которых совпадают
+    с одним из шаблонов(синтаксис fnmatch: "Network.*", "Page.frame*", "*").
+
+    События складываются в ограниченный буфер, из которого их забирает потребитель:
+        async with conn.events("Network.*", "Page.loadEventFired") as stream:
+            async for event in stream:
+                print(event.method, event.params)
+
+    Когда буфер заполнен, срабатывает политика переполнения:
+        * block       — цикл приёма соединения ждёт, пока потребитель заберёт
+                            событие. Даёт обратное давление на сокет: пока
+                            поток стоит, не доставляются и ответы на команды,
+                            поэтому потребитель не должен ждать ответа на
+                            команду при заполненном буфере — для такого
+                            использования выбирайте другую политику.
+        * drop_oldest — самое старое событие в буфере отбрасывается.
+        * coalesce    — ожидающие события с тем же именем заменяются новым.
+
+    Домены, названные в шаблонах без подстановочных символов("Network.*" —
+    Network), удерживаются включёнными, пока поток открыт, как при регистрации
+    слушателя. Поток закрывается вызовом close(), выходом из `async with`,
+    или отсоединением соединения — в последнем случае потребитель сначала
+    получает события, оставшиеся в буфере.
+    """
+    __slots__ = (
+        "_connection", "patterns", "maxsize", "overflow", "dropped", "_regex", "_matches",
+        "_buffer", "_getter", "_putters", "_domains", "_retained", "_retaining", "_closed"
+    )
+
+    def __init__(
+            self, connection: "Connection",
+            patterns: Tuple[str, ...],
+            maxsize: int,
+            overflow: OverflowPolicy
+    ) -> None:
+        if not patterns:
+            raise ValueError("At least one event name or pattern is required")
+        if maxsize < 1:
+            raise ValueError("'maxsize' must be a positive integer")
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow!r}")
+
+        self._connection = connection
+        self.patterns = patterns
+        self.maxsize = maxsize
+        self.overflow: OverflowPolicy = overflow
+        self.dropped = 0
+
+        self._regex = re.compile("|".join(translate(p) for p in patterns))
+        # ? Имя события -> совпадает ли оно с шаблонами. Имён событий в протоколе
+        # ?     конечное число, поэтому кэш не ограничивается.
+        self._matches: Dict[str, bool] = {}
+        self._buffer: Deque[StreamEvent] = deque()
+        self._getter: Optional[asyncio.Future] = None
+        self._putters: List[asyncio.Future] = []
+        self._domains = tuple({
+            p.split(".", 1)[0] for p in patterns if "." in p and not re.search(r"[*?\[]", p.split(".", 1)[0])
+        })
+        # ? Домены, счётчик подписок которых уже увеличен этим потоком
+        self._retained: List[str] = []
+        self._retaining: Optional[asyncio.Task] = None
+        self._closed = False
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def matches(self, method: str) -> bool:
+        """ Совпадает ли имя события с одним из шаблонов потока. """
+        if (matched := self._matches.get(method)) is None:
+            matched = self._matches[method] = self._regex.match(method) is not None
+        return matched
+
+    def qsize(self) -> int:
+        """ Количество событий в буфере. """
+        return len(self._buffer)
+
+    def _open(self) -> None:
+        """ Подписывает поток на события соединения. """
+        self._connection._streams.append(self)
+        if self._domains:
+            self._retaining = asyncio.get_running_loop().create_task(self._retain())
+
+    async def _retain(self) -> None:
+        for domain in self._domains:
+            self._retained.append(domain)
+            await self._connection.retainDomain(domain)
+
+    async def ready(self) -> None:
+        """ Дожидается включения доменов, на события которых подписан поток. """
+        if (task := self._retaining) is not None:
+            try:
+                await task
+            finally:
+                if self._retaining is task:
+                    self._retaining = None
+
+    def close(self) -> None:
+        """ Отписывает поток от событий и отбрасывает непрочитанные. Итерация
+        по закрытому потоку завершается.
+        """
+        if self._closed:
+            return
+        self._buffer.clear()
+        self._finish()
+        if self._retaining is not None and not self._retaining.done():
+            self._retaining.cancel()
+        while self._retained:
+            self._connection._releaseDomain(self._retained.pop())
+
+    def _finish(self) -> None:
+        """ Закрывает поток, оставляя буфер потребителю. Вызывается и при
+        отсоединении соединения.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._connection._streams.remove(self)
+        except ValueError:
+            pass
+        if self._getter is not None and not self._getter.done():
+            self._getter.set_result(None)
+        for putter in self._putters:
+            if not putter.done():
+                putter.set_result(None)
+        self._putters.clear()
+
+    async def put(self, method: str, params: dict) -> None:
+        """ Добавляет событие в буфер, применяя политику переполнения.
+        Вызывается циклом приёма соединения.
+        """
+        buffer = self._buffer
+        if len(buffer) >= self.maxsize:
+            if self.overflow == "drop_oldest":
+                buffer.popleft()
+                self.dropped += 1
+            elif self.overflow == "coalesce":
+                kept = [e for e in buffer if e.method != method]
+                self.dropped += len(buffer) - len(kept)
+                # ? Событий с этим именем в буфере нет — отбрасывается самое старое
+                if len(kept) == len(buffer):
+                    kept.pop(0)
+                    self.dropped += 1
+                buffer.clear()
+                buffer.extend(kept)
+            else:
+                while len(buffer) >= self.maxsize and not self._closed:
+                    putter = asyncio.get_running_loop().create_future()
+                    self._putters.append(putter)
+                    await putter
+        if self._closed:
+            return
+
+        buffer.append(StreamEvent(method, params))
+        if self._getter is not None and not self._getter.done():
+            self._getter.set_result(None)
+
+    def __aiter__(self) -> "EventStream":
+        return self
+
+    async def __anext__(self) -> StreamEvent:
+        if self._retaining is not None:
+            await self.ready()
+        while not self._buffer:
+            if self._closed:
+                raise StopAsyncIteration
+            self._getter = asyncio.get_running_loop().create_future()
+            try:
+                await self._getter
+            finally:
+                self._getter = None
+
+        event = self._buffer.popleft()
+        while self._putters:
+            if not (putter := self._putters.pop(0)).done():
+                putter.set_result(None)
+                break
+        return event
+
+    async def __aenter__(self) -> "EventStream":
+        await self.ready()
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"<EventStream {', '.join(self.patterns)} buffered={len(self._buffer)} closed={self._closed}>"
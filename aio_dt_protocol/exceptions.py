@@ -68,6 +68,12 @@ class NoSessionForGivenTargetId(MyBaseException): pass        # !
 
 class InvalidURLError(MyBaseException): pass        # !
 
+class CallTimeoutError(MyBaseException, TimeoutError): pass             # ! браузер не ответил за отведённое время
+
+class ConnectionDetached(MyBaseException, ConnectionError): pass        # ! соединение разорвано до получения ответа
+
+class EventTimeoutError(MyBaseException, TimeoutError): pass            # ! ожидаемое событие не произошло за отведённое время
+
 
 PROTOCOL_EXCEPTION_STORE = {
     "Target crashed": TargetCrashed,
@@ -1,9 +1,10 @@
 from .actions import Actions
-from .data import ViewportRect, WindowRect, GeoInfo, Serializer
+from .data import ViewportRect, WindowRect, GeoInfo, Serializer, PY_CALL_BATCH_BINDING, PY_RPC_BINDING
+from .utils import lazy_attributes
 
 import base64
 import re
-from typing import Optional, Any, TYPE_CHECKING
+from typing import Optional, Any, Literal, TYPE_CHECKING
 
 from .exceptions import (
     PromiseEvaluateError,
@@ -19,13 +20,19 @@ if TYPE_CHECKING:
 class Extend:
     """ Расширение для 'Connection' некоторыми полезными методами.
     """
-    __slots__ = ("_connection", "action", "_py_call_script_id")
+    __slots__ = ("_connection", "action", "_py_call_script_id", "_py_call_batch", "_py_rpc_script_id",
+                 "_py_rpc_timeout")
+
+    # ? action — совершает действия на странице. Клики; движения мыши; события клавиш.
+    # ?     Создаётся при первом обращении.
+    __getattr__ = lazy_attributes({"action": lambda extend: Actions(extend._connection)})
 
     def __init__(self, conn) -> None:
         self._connection: Connection = conn
         self._py_call_script_id: str = ""
-        self.action = Actions(conn)             # Совершает действия на странице. Клики;
-                                                # движения мыши; события клавиш
+        self._py_call_batch: Optional[str] = None
+        self._py_rpc_script_id: str = ""
+        self._py_rpc_timeout: Optional[float] = None
 
     @property
     def py_call_enabled(self) -> bool:
@@ -33,7 +40,11 @@ class Extend:
         """
         return bool(self._py_call_script_id)
 
-    async def pyCallAddOnload(self) -> None:
+    async def pyCallAddOnload(
+            self,
+            batch: Optional[Literal["microtask", "frame"]] = None,
+            batch_size: int = 64
+    ) -> None:
         """ Включает автоматически добавляющийся JavaScript, вызывающий слушателей
         клиента, добавленных на страницу с помощью await <Connection>.bindFunction(...)
         и await <Connection>.bindFunctions(...).
@@ -51,13 +62,43 @@ class Extend:
 
         Может быть вызвана со страницы браузера, так:
         py_call("test_func", 1, "testtt");
+
+        По умолчанию каждый вызов py_call() — отдельное событие `Runtime.bindingCalled`.
+        В пакетном режиме вызовы накапливаются на странице и отправляются одним
+        событием, а клиент выполняет их одним заданием, в порядке совершения.
+        Полезно для страниц, часто сообщающих о прокрутке, мутациях DOM и т.п.
+        :param batch:           (optional) Когда отправлять накопленные вызовы:
+                                    * None      — без накопления, каждый вызов сразу;
+                                    * microtask — по завершении текущей задачи JavaScript;
+                                    * frame     — перед отрисовкой следующего кадра. В фоновых
+                                                    вкладках кадры не отрисовываются, и вызовы
+                                                    отправляются при скрытии страницы.
+        :param batch_size:      (optional) При таком количестве накопленных вызовов они
+                                    отправляются немедленно.
         """
         if self.py_call_enabled:
-            return
+            if self._py_call_batch == batch:
+                return
+            await self.pyCallRemoveOnLoad()
 
-        py_call_js = """\
+        if batch is None:
+            py_call_js = """\
         function py_call(funcName,...args){window[funcName](JSON.stringify(args));}"""
+        elif batch in ("microtask", "frame"):
+            await self._connection.Runtime.addBinding(PY_CALL_BATCH_BINDING)
+            schedule = "queueMicrotask(flush)" if batch == "microtask" else "requestAnimationFrame(flush)"
+            py_call_js = f"""\
+        (()=>{{const queue=[];let scheduled=false;
+        const flush=()=>{{scheduled=false;if(queue.length){{window.{PY_CALL_BATCH_BINDING}(JSON.stringify(queue.splice(0)));}}}};
+        addEventListener("pagehide",flush);
+        document.addEventListener("visibilitychange",()=>{{if(document.hidden)flush();}});
+        window.py_call=function(funcName,...args){{queue.push([funcName,args]);
+        if(queue.length>={int(batch_size)}){{flush();}}else if(!scheduled){{scheduled=true;{schedule};}}}};}})();"""
+        else:
+            raise ValueError(f"Unknown batch mode: {batch!r}")
+
         self._py_call_script_id = await self._connection.Page.addScriptOnLoad(py_call_js)
+        self._py_call_batch = batch
         await self.injectJS(py_call_js)
 
     async def pyCallRemoveOnLoad(self) -> None:
@@ -67,6 +108,57 @@ class Extend:
         if self.py_call_enabled:
             await self._connection.Page.removeScriptOnLoad(self._py_call_script_id)
             self._py_call_script_id = ""
+            if self._py_call_batch is not None:
+                await self._connection.Runtime.removeBinding(PY_CALL_BATCH_BINDING)
+                self._py_call_batch = None
+
+    @property
+    def py_rpc_enabled(self) -> bool:
+        """ Был ли обработчик `py_rpc()` зарегистрирован на страницу.
+        """
+        return bool(self._py_rpc_script_id)
+
+    async def pyRPCAddOnload(self, timeout: Optional[float] = None) -> None:
+        """ Включает автоматически добавляющийся JavaScript, вызывающий функции клиента,
+        добавленные с помощью await <Connection>.bindRPC(...), и возвращающий Promise
+        их результата:
+            const total = await py_rpc("get_total", 1, 2);
+
+        Результат доставляется на страницу одним Runtime.callFunctionOn, когда корутина
+        завершится. Исключение в корутине, или тайм-аут отклоняют Promise с Error.
+        Повторный вызов с другим тайм-аутом заменяет его и на уже открытой странице.
+        :param timeout:         (optional) Через сколько секунд страница перестаёт ждать
+                                    результат и отклоняет Promise. По умолчанию — не
+                                    ограничено: тайм-аут соблюдает клиент, см. bindRPC().
+        """
+        if self.py_rpc_enabled:
+            if timeout == self._py_rpc_timeout:
+                return
+            await self._connection.Page.removeScriptOnLoad(self._py_rpc_script_id)
+
+        ms = "null" if timeout is None else int(timeout * 1000)
+        # ? Тайм-аут хранится в window.__py_rpc и читается при каждом вызове, поэтому
+        # ?     его можно поменять, не пересоздавая обработчик на открытой странице
+        py_rpc_js = f"""\
+        (()=>{{if(window.__py_rpc){{window.__py_rpc.timeout={ms};return;}}const pending=new Map();let last=0;
+        window.__py_rpc={{timeout:{ms},settle(id,ok,value){{const p=pending.get(id);if(!p)return;pending.delete(id);
+        clearTimeout(p.timer);ok?p.resolve(value):p.reject(new Error(value));}}}};
+        window.py_rpc=function(name,...args){{return new Promise((resolve,reject)=>{{const id=++last;
+        const p={{resolve,reject,timer:null}};pending.set(id,p);const t=window.__py_rpc.timeout;
+        if(t!==null)p.timer=setTimeout(()=>{{pending.delete(id);reject(new Error(`py_rpc '${{name}}' timed out`));}},t);
+        window.{PY_RPC_BINDING}(JSON.stringify([id,name,args]));}});}};}})();"""
+        self._py_rpc_script_id = await self._connection.Page.addScriptOnLoad(py_rpc_js)
+        self._py_rpc_timeout = timeout
+        await self.injectJS(py_rpc_js)
+
+    async def pyRPCRemoveOnLoad(self) -> None:
+        """ Удаляет автоматическое добавление JavaScript, установленного
+        pyRPCAddOnload().
+        """
+        if self.py_rpc_enabled:
+            await self._connection.Page.removeScriptOnLoad(self._py_rpc_script_id)
+            self._py_rpc_script_id = ""
+            self._py_rpc_timeout = None
 
     async def getViewportRect(self) -> ViewportRect:
         """ Возвращает список с длиной и шириной вьюпорта браузера.
@@ -0,0 +1,630 @@
+""" Поддельный сервер протокола DevTools для тестов и замеров без браузера.
+
+Отвечает на HTTP-запросы, которые делает `Browser`(/json/version, /json/list,
+/json/new, /json/close, /json/activate), и принимает WebSocket-подключения
+к страницам и к самому браузеру, в том числе flatten-сессии. С самим браузером
+можно соединиться и через пару каналов, см. servePipe(). На команды
+отвечает заданными, или записанными ответами, умеет генерировать потоки
+событий с заданной частотой и добавлять задержку к ответам.
+
+    async with FakeCDPServer() as server:
+        server.respond("Runtime.evaluate", {"result": {"type": "number", "value": 2}})
+        browser = server.browser()
+        conn = await browser.getConnection()
+        await server.storm("Network.dataReceived", {"requestId": "1"}, 10_000,
+                           rate=50_000, target_id=conn.conn_id)
+
+Состояние target-ов упрощено: страница — это её идентификатор, адрес и
+заголовок. Неизвестные команды по умолчанию получают пустой результат.
+"""
+import asyncio
+import time
+import uuid
+from itertools import count
+from pathlib import Path
+from typing import Dict, List, Optional, Callable, Union, Any, Tuple, Set, Iterable, TYPE_CHECKING
+from urllib.parse import urlparse, unquote
+
+from websockets.exceptions import ConnectionClosed
+from websockets.server import serve, WebSocketServerProtocol
+
+from .codec import get_codec
+from .pipe import PipeTransport
+
+if TYPE_CHECKING:
+    from .browser import Browser
+
+# ? Обработчик команды: получает параметры и target, возвращает результат.
+# ?     Может быть корутиной. Ошибку протокола сообщает исключением FakeCDPError.
+Responder = Callable[[dict, "FakeTarget"], Any]
+Params = Union[dict, Callable[[int], dict]]
+
+
+class FakeCDPError(Exception):
+    """ Исключение обработчика команды, которое сервер отправит клиенту как ошибку протокола. """
+    def __init__(self, message: str, code: int = -32000) -> None:
+        super().__init__(message)
+        self.message = message
+        self.code = code
+
+
+class FakeTarget:
+    """ Target поддельного браузера. """
+    __slots__ = ("id", "type", "url", "title", "opener_id", "parent_id")
+
+    def __init__(
+            self, target_id: str,
+            target_type: str = "page",
+            url: str = "about:blank",
+            title: str = "",
+            opener_id: Optional[str] = None,
+            parent_id: Optional[str] = None
+    ) -> None:
+        self.id = target_id
+        self.type = target_type
+        self.url = url
+        self.title = title or url
+        self.opener_id = opener_id
+        self.parent_id = parent_id
+
+    def listEntry(self, host: str) -> dict:
+        """ Описание target в формате ответа /json/list. """
+        entry = {
+            "description": "",
+            "devtoolsFrontendUrl": f"/devtools/inspector.html?ws={host}/devtools/page/{self.id}",
+            "id": self.id,
+            "title": self.title,
+            "type": self.type,
+            "url": self.url,
+            "webSocketDebuggerUrl": f"ws://{host}/devtools/page/{self.id}",
+        }
+        if self.parent_id is not None:
+            entry["parentId"] = self.parent_id
+        return entry
+
+    def targetInfo(self, attached: bool = False) -> dict:
+        """ Описание target в формате Target.TargetInfo. """
+        info = {
+            "targetId": self.id, "type": self.type, "title": self.title,
+            "url": self.url, "attached": attached, "canAccessOpener": False,
+            "browserContextId": "FAKE-CONTEXT",
+        }
+        if self.opener_id is not None:
+            info["openerId"] = self.opener_id
+        # ? Фрейм-родитель iframe — главный фрейм страницы, его id совпадает с id страницы
+        if self.parent_id is not None:
+            info["parentFrameId"] = self.parent_id
+        return info
+
+    def __repr__(self) -> str:
+        return f"<FakeTarget {self.type} {self.id!r} {self.url!r}>"
+
+
+class FakeCDPServer:
+    """ Поддельный браузер: HTTP-эндпоинты на `port` и WebSocket на `ws_port`.
+    Адреса WebSocket в ответах /json/list и /json/version указывают на `ws_port`,
+    поэтому `Browser` и `Connection` работают с сервером как с настоящим браузером.
+    """
+    __slots__ = (
+        "host", "port", "ws_port", "latency", "strict", "navigation_time", "compression", "targets", "received", "browser_id",
+        "_codec", "_responders", "_latencies", "_http_server", "_ws_server", "_sockets",
+        "_sessions", "_discovering", "_ids", "_tasks", "_http_clients",
+    )
+
+    def __init__(
+            self, host: str = "127.0.0.1",
+            port: int = 0,
+            ws_port: int = 0,
+            latency: float = 0.0,
+            strict: bool = False,
+            navigation_time: float = 0.01,
+            compression: Optional[str] = None
+    ) -> None:
+        """
+        :param host:        Адрес, на котором принимаются подключения.
+        :param port:        (optional) Порт HTTP-эндпоинтов. 0 — выбрать свободный.
+        :param ws_port:     (optional) Порт WebSocket. 0 — выбрать свободный.
+        :param latency:     (optional) Задержка каждого ответа на команду, в секундах.
+        :param strict:      (optional) Отвечать ошибкой "wasn't found" на команды, для
+                                которых нет ни встроенного, ни заданного ответа.
+        :param navigation_time: (optional) Через сколько секунд после Page.navigate
+                                    приходят события загрузки страницы.
+        :param compression:     (optional) "deflate" — соглашаться на сжатие сообщений.
+        """
+        self.host = host
+        self.port = port
+        self.ws_port = ws_port
+        self.latency = latency
+        self.strict = strict
+        self.navigation_time = navigation_time
+        self.compression = compression
+        self.browser_id = str(uuid.uuid4())
+        # ? Target-ы по идентификатору. Изначально есть одна пустая страница.
+        self.targets: Dict[str, FakeTarget] = {}
+        # ? Количество полученных команд по методам
+        self.received: Dict[str, int] = {}
+
+        self._codec = get_codec()
+        self._responders: Dict[str, Responder] = {}
+        self._latencies: Dict[str, float] = {}
+        self._http_server: Optional[asyncio.AbstractServer] = None
+        self._ws_server = None
+        # ? Открытые WebSocket -> идентификатор target, или None для соединения с браузером
+        self._sockets: Dict[WebSocketServerProtocol, Optional[str]] = {}
+        # ? Flatten-сессии: sessionId -> (WebSocket, через который она открыта, targetId)
+        self._sessions: Dict[str, Tuple[WebSocketServerProtocol, str]] = {}
+        # ? WebSocket-ы, включившие Target.setDiscoverTargets
+        self._discovering: Set[WebSocketServerProtocol] = set()
+        self._ids = count(1)
+        self._tasks: Set[asyncio.Task] = set()
+        # ? Открытые HTTP-подключения: клиент держит их между запросами(keep-alive)
+        self._http_clients: Set[asyncio.StreamWriter] = set()
+
+        self.addTarget()
+
+    async def __aenter__(self) -> "FakeCDPServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        await self.stop()
+
+    @property
+    def page(self) -> FakeTarget:
+        """ Первая из существующих страниц. """
+        return next(t for t in self.targets.values() if t.type == "page")
+
+    @property
+    def ws_url(self) -> str:
+        """ Адрес WebSocket самого браузера. """
+        return f"ws://{self.host}:{self.ws_port}/devtools/browser/{self.browser_id}"
+
+    async def start(self) -> None:
+        """ Начинает принимать подключения. """
+        self._ws_server = await serve(
+            self._serveSocket, self.host, self.ws_port,
+            compression=self.compression, max_size=None, ping_interval=None
+        )
+        self.ws_port = self._ws_server.sockets[0].getsockname()[1]
+        self._http_server = await asyncio.start_server(self._serveHttp, self.host, self.port)
+        self.port = self._http_server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        """ Закрывает все подключения и останавливает сервер. """
+        for task in tuple(self._tasks):
+            task.cancel()
+        if self._http_server is not None:
+            self._http_server.close()
+            for writer in tuple(self._http_clients):
+                writer.close()
+            await self._http_server.wait_closed()
+            self._http_server = None
+        if self._ws_server is not None:
+            self._ws_server.close()
+            await self._ws_server.wait_closed()
+            self._ws_server = None
+        for pipe in [ws for ws in self._sockets if type(ws) is PipeTransport]:
+            await pipe.close()
+
+    def browser(self, verbose: bool = False) -> "Browser":
+        """ Экземпляр `Browser`, подключённый к этому серверу. """
+        from .browser import Browser
+        from .data import BrowserInstanceInfo
+
+        return Browser(
+            instance_info=BrowserInstanceInfo("chrome", 0, self.port, True), verbose=verbose)
+
+    def respond(self, method: str, *results: Union[dict, Responder], latency: Optional[float] = None) -> None:
+        """ Задаёт ответы на команду. Несколько ответов выдаются по очереди, последний
+        повторяется. Ответ — словарь "result", или функция(params, target), которая его
+        возвращает, или возбуждает FakeCDPError.
+            server.respond("DOM.getDocument", {"root": {...}})
+            server.respond("Page.reload", lambda params, target: {}, latency=0.2)
+        :param method:      Название домена и метода.
+        :param results:     Ответы.
+        :param latency:     (optional) Задержка ответа на эту команду, вместо общей.
+        """
+        if results:
+            queue = list(results)
+
+            def responder(params: dict, target: FakeTarget) -> Any:
+                result = queue.pop(0) if len(queue) > 1 else queue[0]
+                return result(params, target) if callable(result) else result
+
+            self._responders[method] = responder
+        if latency is not None:
+            self._latencies[method] = latency
+
+    def loadRecording(self, path: Union[str, Path]) -> List[dict]:
+        """ Загружает записанный обмен сообщениями: каждая строка файла — одно
+        сообщение в формате JSON. Сообщения с "method" и "result" становятся
+        ответами на этот метод в порядке записи. Сообщения-события("method"
+        и "params", без "id") возвращаются списком — их можно воспроизвести
+        через `emit()`, или `storm()`.
+        :param path:        Путь к файлу *.jsonl.
+        :return:        Записанные события.
+        """
+        responses: Dict[str, List[dict]] = {}
+        events: List[dict] = []
+        for line in Path(path).read_text(encoding="utf-8").splitlines():
+            if not line.strip():
+                continue
+            message = self._codec.decode(line)
+            if "result" in message and "method" in message:
+                responses.setdefault(message["method"], []).append(message["result"])
+            elif "method" in message and "id" not in message:
+                events.append(message)
+        for method, results in responses.items():
+            self.respond(method, *results)
+        return events
+
+    def addTarget(
+            self, url: str = "about:blank",
+            target_type: str = "page",
+            title: str = "",
+            opener_id: Optional[str] = None,
+            parent_id: Optional[str] = None) -> FakeTarget:
+        """ Создаёт target и сообщает о нём соединениям, включившим обнаружение. """
+        target = FakeTarget(uuid.uuid4().hex.upper(), target_type, url, title, opener_id, parent_id)
+        self.targets[target.id] = target
+        self._notifyDiscovering("Target.targetCreated", {"targetInfo": target.targetInfo()})
+        return target
+
+    async def closeTarget(self, target_id: str) -> bool:
+        """ Закрывает target: его сессии отсоединяются, WebSocket-ы закрываются. """
+        if (target := self.targets.pop(target_id, None)) is None:
+            return False
+        for session_id, (ws, session_target) in tuple(self._sessions.items()):
+            if session_target == target_id:
+                del self._sessions[session_id]
+                await self._send(ws, {
+                    "method": "Target.detachedFromTarget",
+                    "params": {"sessionId": session_id, "targetId": target_id}
+                })
+        for ws, socket_target in tuple(self._sockets.items()):
+            if socket_target == target_id:
+                await self._send(ws, {"method": "Inspector.detached", "params": {"reason": "target_closed"}})
+                await ws.close()
+        self._notifyDiscovering("Target.targetDestroyed", {"targetId": target.id})
+        return True
+
+    async def emit(self, method: str, params: Optional[dict] = None, target_id: Optional[str] = None) -> int:
+        """ Отправляет событие. Событие target-а получают все WebSocket-ы этой страницы
+        и все её сессии; событие без target — все WebSocket-ы самого браузера.
+        :return:        Количество получателей.
+        """
+        subscribers = self._subscribers(target_id)
+        for ws, session_id in subscribers:
+            await self._send(ws, self._event(method, params or {}, session_id))
+        return len(subscribers)
+
+    async def storm(
+            self, method: str,
+            params: Params,
+            total: int,
+            rate: Optional[float] = None,
+            target_id: Optional[str] = None) -> float:
+        """ Генерирует поток из `total` одинаковых событий.
+        :param method:      Имя события.
+        :param params:      Параметры события, или функция(номер события) -> параметры.
+        :param total:       Количество событий.
+        :param rate:        (optional) Событий в секунду. None — так быстро, как получится.
+        :param target_id:   (optional) Target, которому принадлежат события.
+        :return:        Затраченное время, в секундах.
+        """
+        subscribers = self._subscribers(target_id)
+        encode = self._codec.encode
+        # ? Неизменные события сериализуются один раз
+        frames = None if callable(params) else [
+            (ws, encode(self._event(method, params, session_id))) for ws, session_id in subscribers
+        ]
+        started = time.perf_counter()
+        for i in range(total):
+            if rate is not None and (delay := started + i / rate - time.perf_counter()) > 0:
+                await asyncio.sleep(delay)
+            if frames is None:
+                event_params = params(i)
+                for ws, session_id in subscribers:
+                    await self._sendRaw(ws, encode(self._event(method, event_params, session_id)))
+            else:
+                for ws, frame in frames:
+                    await self._sendRaw(ws, frame)
+        return time.perf_counter() - started
+
+    def _subscribers(self, target_id: Optional[str]) -> List[Tuple[WebSocketServerProtocol, Optional[str]]]:
+        subscribers = [(ws, None) for ws, t in self._sockets.items() if t == target_id]
+        if target_id is not None:
+            subscribers += [(ws, sid) for sid, (ws, t) in self._sessions.items() if t == target_id]
+        return subscribers
+
+    @staticmethod
+    def _event(method: str, params: dict, session_id: Optional[str]) -> dict:
+        event = {"method": method, "params": params}
+        if session_id is not None:
+            event["sessionId"] = session_id
+        return event
+
+    async def _emitLater(self, delay: float, target_id: str, events: Iterable[Tuple[str, dict]]) -> None:
+        await asyncio.sleep(delay)
+        for method, params in events:
+            await self.emit(method, params, target_id)
+
+    def _notifyDiscovering(self, method: str, params: dict) -> None:
+        for ws in tuple(self._discovering):
+            self._spawn(self._send(ws, {"method": method, "params": params}))
+
+    def _spawn(self, coro) -> None:
+        task = asyncio.get_running_loop().create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, ws: WebSocketServerProtocol, message: dict) -> None:
+        await self._sendRaw(ws, self._codec.encode(message))
+
+    @staticmethod
+    async def _sendRaw(ws: WebSocketServerProtocol, frame: str) -> None:
+        try:
+            await ws.send(frame)
+        except ConnectionClosed:
+            pass
+
+    # ! ------------------------------------ WebSocket ------------------------------------
+
+    async def _serveSocket(self, ws: WebSocketServerProtocol) -> None:
+        target_id: Optional[str] = ws.path.rsplit("/", 1)[-1]
+        if ws.path.startswith("/devtools/browser/"):
+            target_id = None
+        elif not ws.path.startswith("/devtools/page/") or target_id not in self.targets:
+            await ws.close(1011, "No such target")
+            return
+
+        self._sockets[ws] = target_id
+        try:
+            async for raw in ws:
+                await self._receive(ws, raw)
+        except ConnectionClosed:
+            pass
+        finally:
+            self._forget(ws)
+
+    async def servePipe(self, read_fd: int, write_fd: int) -> None:
+        """ Обслуживает соединение с самим браузером через пару каналов, как браузер,
+        запущенный с флагом --remote-debugging-pipe. Завершается, когда клиент
+        закроет свой конец канала, или сервер будет остановлен.
+        :param read_fd:     Канал, из которого читаются команды.
+        :param write_fd:    Канал, в который пишутся ответы и события.
+        """
+        pipe = await PipeTransport.open(read_fd, write_fd)
+        self._sockets[pipe] = None
+        try:
+            while True:
+                await self._receive(pipe, await pipe.recv())
+        except ConnectionClosed:
+            pass
+        finally:
+            self._forget(pipe)
+
+    async def _receive(self, ws: WebSocketServerProtocol, raw: Union[str, bytes]) -> None:
+        message = self._codec.decode(raw)
+        method: str = message.get("method", "")
+        self.received[method] = self.received.get(method, 0) + 1
+        latency = self._latencies.get(method, self.latency)
+        if latency:
+            self._spawn(self._replyLater(ws, message, latency))
+        else:
+            await self._reply(ws, message)
+
+    def _forget(self, ws: WebSocketServerProtocol) -> None:
+        self._sockets.pop(ws, None)
+        self._discovering.discard(ws)
+        for session_id, (session_ws, _) in tuple(self._sessions.items()):
+            if session_ws is ws:
+                del self._sessions[session_id]
+
+    async def _replyLater(self, ws: WebSocketServerProtocol, message: dict, latency: float) -> None:
+        await asyncio.sleep(latency)
+        await self._reply(ws, message)
+
+    async def _reply(self, ws: WebSocketServerProtocol, message: dict) -> None:
+        method: str = message.get("method", "")
+        params: dict = message.get("params") or {}
+        session_id: Optional[str] = message.get("sessionId")
+        response: Dict[str, Any] = {"id": message.get("id")}
+
+        if session_id is not None and session_id not in self._sessions:
+            target = None
+        else:
+            target_id = self._sessions[session_id][1] if session_id is not None else self._sockets.get(ws)
+            target = self.targets.get(target_id) if target_id is not None else None
+
+        after: Iterable[Tuple[str, dict]] = ()
+        try:
+            if session_id is not None and target is None:
+                raise FakeCDPError("Session with given id not found.", -32001)
+            if (responder := self._responders.get(method)) is not None:
+                result = responder(params, target)
+                if asyncio.iscoroutine(result):
+                    result = await result
+            elif (builtin := _BUILTINS.get(method)) is not None:
+                result, after = builtin(self, ws, params, target)
+            elif self.strict:
+                raise FakeCDPError(f"'{method}' wasn't found", -32601)
+            else:
+                result = {}
+            response["result"] = result or {}
+        except FakeCDPError as e:
+            response["error"] = {"code": e.code, "message": e.message}
+        # ? Как и браузер, sessionId — последним ключом: на это рассчитывает prescan_frame()
+        if session_id is not None:
+            response["sessionId"] = session_id
+
+        await self._send(ws, response)
+        for event, event_params in after:
+            await self._send(ws, self._event(event, event_params, session_id))
+
+    # ! --------------------------------------- HTTP ---------------------------------------
+
+    async def _serveHttp(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._http_clients.add(writer)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                http_method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                keep_alive = True
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    if name.strip().lower() == "connection" and value.strip().lower() == "close":
+                        keep_alive = False
+
+                status, body = await self._route(http_method, target)
+                payload = body.encode()
+                writer.write(
+                    f"HTTP/1.1 {status}\r\n"
+                    f"Content-Type: application/json; charset=UTF-8\r\n"
+                    f"Content-Length: {len(payload)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + payload
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            self._http_clients.discard(writer)
+            writer.close()
+
+    async def _route(self, http_method: str, path: str) -> Tuple[str, str]:
+        parsed = urlparse(path)
+        route = parsed.path.rstrip("/")
+        host = f"{self.host}:{self.ws_port}"
+
+        if route == "/json/version":
+            return "200 OK", self._codec.encode({
+                "Browser": "FakeChrome/1.0", "Protocol-Version": "1.3",
+                "User-Agent": "FakeCDPServer", "V8-Version": "0", "WebKit-Version": "0",
+                "webSocketDebuggerUrl": self.ws_url,
+            })
+        if route in ("/json", "/json/list"):
+            return "200 OK", self._codec.encode([t.listEntry(host) for t in self.targets.values()])
+        if route == "/json/new":
+            if http_method != "PUT":
+                return "405 Method Not Allowed", "Using unsafe HTTP verb GET to invoke /json/new."
+            target = self.addTarget(unquote(parsed.query) or "about:blank")
+            return "200 OK", self._codec.encode(target.listEntry(host))
+        if route.startswith("/json/close/"):
+            if await self.closeTarget(route.rsplit("/", 1)[-1]):
+                return "200 OK", "Target is closing"
+            return "404 Not Found", "No such target id: " + route.rsplit("/", 1)[-1]
+        if route.startswith("/json/activate/"):
+            if route.rsplit("/", 1)[-1] in self.targets:
+                return "200 OK", "Target activated"
+            return "404 Not Found", "No such target id: " + route.rsplit("/", 1)[-1]
+        return "404 Not Found", "Unknown command"
+
+
+# ! ---------------------------------- Встроенные ответы ----------------------------------
+# ? Каждый возвращает результат и события, которые нужно отправить вслед за ответом.
+
+Builtin = Callable[[FakeCDPServer, WebSocketServerProtocol, dict, Optional[FakeTarget]],
+                   Tuple[dict, Iterable[Tuple[str, dict]]]]
+
+
+def _create_target(server: FakeCDPServer, ws, params: dict, target: Optional[FakeTarget]):
+    created = server.addTarget(params.get("url") or "about:blank", opener_id=target and target.id)
+    return {"targetId": created.id}, ()
+
+
+def _close_target(server: FakeCDPServer, ws, params: dict, target: Optional[FakeTarget]):
+    if params.get("targetId") not in server.targets:
+        raise FakeCDPError("No target with given id found")
+    server._spawn(server.closeTarget(params["targetId"]))
+    return {"success": True}, ()
+
+
+def _get_targets(server: FakeCDPServer, ws, params: dict, target: Optional[FakeTarget]):
+    attached = {t for _, t in server._sessions.values()} | set(server._sockets.values())
+    return {"targetInfos": [t.targetInfo(t.id in attached) for t in server.targets.values()]}, ()
+
+
+def _attach_to_target(server: FakeCDPServer, ws, params: dict, target: Optional[FakeTarget]):
+    if (attach_to := server.targets.get(params.get("targetId"))) is None:
+        raise FakeCDPError("No target with given id found")
+    session_id = uuid.uuid4().hex.upper()
+    server._sessions[session_id] = ws, attach_to.id
+    return {"sessionId": session_id}, (
+        ("Target.attachedToTarget", {
+            "sessionId": session_id, "targetInfo": attach_to.targetInfo(True), "waitingForDebugger": False
+        }),
+    )
+
+
+def _detach_from_target(server: FakeCDPServer, ws, params: dict, target: Optional[FakeTarget]):
+    if (session := server._sessions.pop(params.get("sessionId"), None)) is None:
+        raise FakeCDPError("No session with given id")
+    return {}, (("Target.detachedFromTarget", {"sessionId": params["sessionId"], "targetId": session[1]}),)
+
+
+def _set_discover_targets(server: FakeCDPServer, ws, params: dict, target: Optional[FakeTarget]):
+    if params.get("discover"):
+        server._discovering.add(ws)
+        return {}, [("Target.targetCreated", {"targetInfo": t.targetInfo()}) for t in server.targets.values()]
+    server._discovering.discard(ws)
+    return {}, ()
+
+
+def _navigate(server: FakeCDPServer, ws, params: dict, target: Optional[FakeTarget]):
+    if target is None:
+        raise FakeCDPError("'Page.navigate' wasn't found", -32601)
+    target.url = target.title = params.get("url", "about:blank")
+    loader_id = uuid.uuid4().hex.upper()
+    frame = {"frameId": target.id}
+    server._notifyDiscovering("Target.targetInfoChanged", {"targetInfo": target.targetInfo()})
+    server._spawn(server._emitLater(server.navigation_time, target.id, (
+        ("Page.frameStartedLoading", frame),
+        ("Page.frameNavigated", {"frame": {"id": target.id, "loaderId": loader_id, "url": target.url}}),
+        ("Page.domContentEventFired", {"timestamp": time.monotonic()}),
+        ("Page.loadEventFired", {"timestamp": time.monotonic()}),
+        ("Page.lifecycleEvent", {**frame, "loaderId": loader_id, "name": "networkIdle",
+                                 "timestamp": time.monotonic()}),
+        ("Page.frameStoppedLoading", frame),
+    )))
+    return {"frameId": target.id, "loaderId": loader_id}, ()
+
+
+def _add_script(server: FakeCDPServer, ws, params: dict, target: Optional[FakeTarget]):
+    return {"identifier": str(next(server._ids))}, ()
+
+
+def _evaluate(server: FakeCDPServer, ws, params: dict, target: Optional[FakeTarget]):
+    return {"result": {"type": "undefined"}}, ()
+
+
+def _browser_close(server: FakeCDPServer, ws, params: dict, target: Optional[FakeTarget]):
+    async def close_all() -> None:
+        await asyncio.sleep(0)
+        for socket in tuple(server._sockets):
+            await socket.close()
+    server._spawn(close_all())
+    return {}, ()
+
+
+def _get_version(server: FakeCDPServer, ws, params: dict, target: Optional[FakeTarget]):
+    return {"protocolVersion": "1.3", "product": "FakeChrome/1.0", "revision": "0",
+            "userAgent": "FakeCDPServer", "jsVersion": "0"}, ()
+
+
+_BUILTINS: Dict[str, Builtin] = {
+    "Target.createTarget": _create_target,
+    "Target.closeTarget": _close_target,
+    "Target.getTargets": _get_targets,
+    "Target.attachToTarget": _attach_to_target,
+    "Target.detachFromTarget": _detach_from_target,
+    "Target.setDiscoverTargets": _set_discover_targets,
+    "Page.navigate": _navigate,
+    "Page.addScriptToEvaluateOnNewDocument": _add_script,
+    "Runtime.evaluate": _evaluate,
+    "Browser.close": _browser_close,
+    "Browser.getVersion": _get_version,
+}
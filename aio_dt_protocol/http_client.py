@@ -0,0 +1,118 @@
+import asyncio
+import string
+from typing import Dict, List, Tuple
+from urllib.parse import quote
+
+Stream = Tuple[asyncio.StreamReader, asyncio.StreamWriter]
+
+
+class HttpClient:
+    """ Небольшой асинхронный HTTP/1.1-клиент для эндпоинтов браузера /json/*.
+
+    В отличие от make_request(), не занимает поток из пула и не открывает новое
+    TCP-подключение на каждый запрос: до `max_connections` подключений остаются
+    открытыми(keep-alive) и используются повторно. Понимает ровно то, что отвечает
+    браузер: тело с Content-Length, chunked, или до закрытия подключения.
+
+        client = HttpClient(port=9222)
+        targets = Serializer.decode(await client.request("/json/list"))
+        client.close()
+    """
+    __slots__ = ("host", "port", "_idle", "_limit")
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 9222, max_connections: int = 4) -> None:
+        """
+        :param host:            Адрес браузера.
+        :param port:            Порт отладки браузера.
+        :param max_connections: (optional) Сколько подключений может быть открыто
+                                    одновременно. Остальные запросы ждут свободного.
+        """
+        self.host = host
+        self.port = port
+        # ? Открытые подключения, свободные для следующего запроса
+        self._idle: List[Stream] = []
+        self._limit = asyncio.Semaphore(max_connections)
+
+    async def request(self, path: str, method: str = "GET") -> str:
+        """ Выполняет запрос и возвращает тело ответа. Ответ с ошибкой возвращается,
+        как и в make_request(), строкой "<код>: <причина>".
+        :param path:        Путь с параметрами, например "/json/new?about:blank".
+        :param method:      HTTP-метод.
+        """
+        async with self._limit:
+            while True:
+                reused = bool(self._idle)
+                reader, writer = self._idle.pop() if reused else await asyncio.open_connection(self.host, self.port)
+                try:
+                    status, reason, body, keep_alive = await self._exchange(reader, writer, path, method)
+                except (asyncio.IncompleteReadError, ConnectionError) as e:
+                    writer.close()
+                    # ! Браузер закрыл простаивавшее подключение. Остальные простаивали
+                    # !     не меньше, поэтому запрос повторяется на новом.
+                    if reused:
+                        self.close()
+                        continue
+                    raise ConnectionResetError(f"Connection to {self.host}:{self.port} was closed") from e
+                except BaseException:
+                    writer.close()
+                    raise
+                break
+
+            if keep_alive:
+                self._idle.append((reader, writer))
+            else:
+                writer.close()
+
+        text = body.decode()
+        return text if status < 400 else f"{status}: {reason}"
+
+    async def _exchange(
+            self, reader: asyncio.StreamReader,
+            writer: asyncio.StreamWriter,
+            path: str, method: str) -> Tuple[int, str, bytes, bool]:
+        """ Отправляет запрос и читает ответ.
+        :return:        (код, причина, тело, можно ли использовать подключение снова)
+        """
+        # ? Адрес в /json/new?<url> передаётся как есть: всё, кроме ASCII, экранируется
+        head = f"{method} {quote(path, safe=string.punctuation)} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n"
+        if method in ("PUT", "POST"):
+            head += "Content-Length: 0\r\n"
+        writer.write((head + "\r\n").encode("latin-1"))
+        await writer.drain()
+
+        status_line, *lines = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+        version, status, reason = (status_line.split(" ", 2) + [""])[:3]
+        headers: Dict[str, str] = {}
+        for line in filter(None, lines):
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+        if (length := headers.get("content-length")) is not None:
+            body = await reader.readexactly(int(length))
+        elif headers.get("transfer-encoding", "").lower() == "chunked":
+            body = await self._readChunked(reader)
+        else:
+            body, keep_alive = await reader.read(), False
+        return int(status), reason, body, keep_alive
+
+    @staticmethod
+    async def _readChunked(reader: asyncio.StreamReader) -> bytes:
+        chunks = []
+        while size := int((await reader.readuntil(b"\r\n")).split(b";", 1)[0], 16):
+            chunks.append(await reader.readexactly(size))
+            await reader.readexactly(2)
+        # ? Завершающие заголовки не используются
+        while await reader.readuntil(b"\r\n") != b"\r\n":
+            pass
+        return b"".join(chunks)
+
+    def close(self) -> None:
+        """ Закрывает простаивающие подключения. Клиентом можно пользоваться и после:
+        для следующего запроса откроется новое.
+        """
+        while self._idle:
+            self._idle.pop()[1].close()
+
+    def __repr__(self) -> str:
+        return f"<HttpClient {self.host}:{self.port} idle={len(self._idle)}>"
@@ -0,0 +1,177 @@
+import asyncio
+import time
+from bisect import bisect_left
+from inspect import iscoroutinefunction
+from typing import Dict, List, Optional, Callable, Any, Union, Awaitable
+
+from .utils import log
+
+# ? Границы корзин гистограммы задержек: от 10 мкс до ~2 минут, каждая следующая
+# ?     на 10% больше предыдущей, поэтому погрешность перцентиля не превышает 10%.
+_BOUNDS: List[float] = []
+_bound = 1e-5
+while _bound < 120.0:
+    _BOUNDS.append(_bound)
+    _bound *= 1.1
+del _bound
+
+Exporter = Callable[[Dict[str, Any]], Union[None, Awaitable[None]]]
+
+
+class LatencyHistogram:
+    """ Гистограмма задержек с логарифмическими корзинами. Запись — O(log n)
+    без выделения памяти, перцентили считаются только при снятии снимка.
+    """
+    __slots__ = ("buckets", "count", "total", "max")
+
+    def __init__(self) -> None:
+        self.buckets = [0] * (len(_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        self.buckets[bisect_left(_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, q: float) -> float:
+        """ Значение перцентиля в секундах (верхняя граница корзины).
+        :param q:       Перцентиль от 0 до 100.
+        """
+        if not self.count:
+            return 0.0
+        rank = self.count * q / 100
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank and n:
+                return min(_BOUNDS[i] if i < len(_BOUNDS) else self.max, self.max)
+        return self.max
+
+
+class MethodStats:
+    """ Статистика вызовов одного метода протокола. """
+    __slots__ = ("count", "errors", "latency")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.errors = 0
+        self.latency = LatencyHistogram()
+
+    def asDict(self) -> Dict[str, Any]:
+        latency = self.latency
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "mean": latency.total / latency.count if latency.count else 0.0,
+            "p50": latency.percentile(50),
+            "p95": latency.percentile(95),
+            "p99": latency.percentile(99),
+            "max": latency.max,
+        }
+
+
+class ConnectionMetrics:
+    """ Метрики соединения: количество и задержки вызовов по методам, число
+    вызовов в полёте, объём трафика и частота событий по типам.
+
+    Включается через `conn.enableMetrics()`. Пока метрики выключены, `conn.metrics`
+    равен None, и горячий путь платит только за одну проверку атрибута.
+    Задержки — в секундах. Объём трафика считается по длине сообщений: для
+    байтов — в байтах, для строк — в символах.
+    """
+    __slots__ = (
+        "calls", "events", "in_flight", "in_flight_peak", "bytes_sent", "bytes_received",
+        "frames_sent", "frames_received", "started", "_last_snapshot", "_last_events", "_exporter"
+    )
+
+    def __init__(self) -> None:
+        self.calls: Dict[str, MethodStats] = {}
+        self.events: Dict[str, int] = {}
+        self.in_flight = 0
+        self.in_flight_peak = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.frames_sent = 0
+        self.frames_received = 0
+        self.started = time.monotonic()
+        self._last_snapshot = self.started
+        self._last_events: Dict[str, int] = {}
+        self._exporter: Optional[asyncio.Task] = None
+
+    def callStarted(self) -> float:
+        self.in_flight += 1
+        if self.in_flight > self.in_flight_peak:
+            self.in_flight_peak = self.in_flight
+        return time.perf_counter()
+
+    def callFinished(self, domain_and_method: str, started: float, failed: bool) -> None:
+        self.in_flight -= 1
+        if (stats := self.calls.get(domain_and_method)) is None:
+            stats = self.calls[domain_and_method] = MethodStats()
+        stats.count += 1
+        if failed:
+            stats.errors += 1
+        stats.latency.record(time.perf_counter() - started)
+
+    def sent(self, size: int) -> None:
+        self.frames_sent += 1
+        self.bytes_sent += size
+
+    def received(self, size: int, method: Optional[str]) -> None:
+        self.frames_received += 1
+        self.bytes_received += size
+        if method is not None:
+            self.events[method] = self.events.get(method, 0) + 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """ Снимок текущих метрик. Частота событий (`rate`, событий в секунду)
+        считается за время, прошедшее с предыдущего снимка.
+        """
+        now = time.monotonic()
+        elapsed = max(now - self._last_snapshot, 1e-9)
+        events = {
+            event: {"count": count, "rate": (count - self._last_events.get(event, 0)) / elapsed}
+            for event, count in self.events.items()
+        }
+        self._last_snapshot = now
+        self._last_events = dict(self.events)
+        return {
+            "uptime": now - self.started,
+            "in_flight": self.in_flight,
+            "in_flight_peak": self.in_flight_peak,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "frames_sent": self.frames_sent,
+            "frames_received": self.frames_received,
+            "calls": {method: stats.asDict() for method, stats in self.calls.items()},
+            "events": events,
+        }
+
+    def startExport(self, exporter: Exporter, interval: float) -> None:
+        """ Запускает периодическую передачу снимков в `exporter`.
+        :param exporter:    Функция, или корутина, принимающая снимок.
+        :param interval:    Период в секундах.
+        """
+        self.stopExport()
+        self._exporter = asyncio.create_task(self._export(exporter, interval))
+
+    def stopExport(self) -> None:
+        if self._exporter is not None:
+            self._exporter.cancel()
+            self._exporter = None
+
+    async def _export(self, exporter: Exporter, interval: float) -> None:
+        is_async = iscoroutinefunction(exporter)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                if is_async:
+                    await exporter(self.snapshot())
+                else:
+                    exporter(self.snapshot())
+            except Exception as e:
+                log(f"Metrics exporter {exporter!r} raised {e!r}", "[<- E ->]")
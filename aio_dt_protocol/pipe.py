@@ -0,0 +1,208 @@
+import asyncio
+import os
+import sys
+from collections import deque
+from typing import Deque, Optional, Union
+
+from websockets.exceptions import ConnectionClosed
+
+# ? Разделитель сообщений в канале: браузер завершает каждый JSON нулевым байтом
+DELIMITER = b"\0"
+
+
+class PipeTransport:
+    """ Транспорт протокола поверх пары каналов вместо WebSocket. Браузер, запущенный
+    с флагом --remote-debugging-pipe, читает команды из дескриптора 3 и пишет ответы
+    и события в дескриптор 4; каждое сообщение — JSON, завершённый нулевым байтом.
+
+    Повторяет ту часть интерфейса WebSocket, которой пользуется `Connection`:
+    recv(), send(), close() и closed. Обрыв канала сообщается так же, как
+    закрытие WebSocket — исключением ConnectionClosed. Только POSIX.
+    """
+    __slots__ = ("_reader", "_read_transport", "_writer", "_write_transport", "_closed")
+
+    def __init__(
+            self, reader: "_MessageReader",
+            read_transport: asyncio.ReadTransport,
+            writer: "_MessageWriter",
+            write_transport: asyncio.WriteTransport
+    ) -> None:
+        self._reader = reader
+        self._read_transport = read_transport
+        self._writer = writer
+        self._write_transport = write_transport
+        self._closed = False
+
+    @classmethod
+    async def open(
+            cls, read_fd: int, write_fd: int,
+            max_size: Optional[int] = None,
+            max_queue: Optional[int] = 16
+    ) -> "PipeTransport":
+        """ Создаёт транспорт из дескрипторов каналов. Дескрипторы переходят во
+        владение транспорта и закрываются вместе с ним.
+        :param read_fd:     Конец канала, в который пишет браузер(его дескриптор 4).
+        :param write_fd:    Конец канала, из которого читает браузер(его дескриптор 3).
+        :param max_size:    (optional) Наибольший размер входящего сообщения в байтах.
+                                None — без ограничения.
+        :param max_queue:   (optional) Сколько прочитанных, но не полученных через recv()
+                                сообщений допускается. Дальше чтение канала приостанавливается,
+                                и браузер ждёт, пока клиент не разберёт очередь. None — без
+                                ограничения.
+        """
+        if sys.platform == "win32":
+            raise OSError("Pipe transport is supported only on POSIX platforms")
+
+        loop = asyncio.get_running_loop()
+        read_transport, reader = await loop.connect_read_pipe(
+            lambda: _MessageReader(loop, max_size, max_queue), os.fdopen(read_fd, "rb", 0))
+        write_transport, writer = await loop.connect_write_pipe(
+            lambda: _MessageWriter(loop), os.fdopen(write_fd, "wb", 0))
+        return cls(reader, read_transport, writer, write_transport)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    async def recv(self) -> bytes:
+        """ Дожидается следующего сообщения и возвращает его без разделителя. """
+        if (message := await self._reader.next()) is not None:
+            return message
+        # ! Браузер закрыл свой конец канала, или сообщение превысило `max_size`
+        await self.close()
+        raise ConnectionClosed(None, None)
+
+    async def send(self, data: Union[str, bytes]) -> None:
+        """ Отправляет одно сообщение. """
+        if self._closed or self._write_transport.is_closing():
+            raise ConnectionClosed(None, None)
+        if type(data) is str:
+            data = data.encode()
+        self._write_transport.writelines((data, DELIMITER))
+        try:
+            await self._writer.drain()
+        except ConnectionError:
+            await self.close()
+            raise ConnectionClosed(None, None) from None
+
+    async def close(self) -> None:
+        """ Закрывает оба канала. Ожидающий recv() завершится ConnectionClosed. """
+        if self._closed:
+            return
+        self._closed = True
+        self._write_transport.close()
+        self._read_transport.close()
+
+
+class _MessageReader(asyncio.Protocol):
+    """ Делит поток из канала на сообщения по нулевому байту. Когда в очереди
+    набирается `max_queue` сообщений, чтение канала приостанавливается до тех пор,
+    пока next() не разберёт очередь наполовину.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, max_size: Optional[int], max_queue: Optional[int]) -> None:
+        self._loop = loop
+        self._max_size = max_size
+        self._max_queue = max_queue
+        self._transport: Optional[asyncio.ReadTransport] = None
+        self._paused = False
+        self._buffer = bytearray()
+        self._messages: Deque[bytes] = deque()
+        self._waiter: Optional[asyncio.Future] = None
+        self._eof = False
+
+    def connection_made(self, transport: asyncio.ReadTransport) -> None:
+        self._transport = transport
+
+    def data_received(self, data: bytes) -> None:
+        buffer = self._buffer
+        start = len(buffer)
+        buffer += data
+        # ? Разделитель ищется только в новых данных
+        while (end := buffer.find(DELIMITER, start)) != -1:
+            self._messages.append(bytes(buffer[:end]))
+            del buffer[:end + 1]
+            start = 0
+        # ! Сообщение больше `max_size`: ждать его конца бессмысленно
+        if self._max_size is not None and len(buffer) > self._max_size:
+            self._eof = True
+        elif (self._max_queue is not None and not self._paused
+                and len(self._messages) >= self._max_queue):
+            self._paused = True
+            self._transport.pause_reading()
+        self._wake()
+
+    def eof_received(self) -> Optional[bool]:
+        self._eof = True
+        self._wake()
+        return None
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        self._eof = True
+        self._wake()
+
+    async def next(self) -> Optional[bytes]:
+        """ Следующее сообщение, или None, если канал закрыт. """
+        while not self._messages:
+            if self._eof:
+                return None
+            self._waiter = self._loop.create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+        message = self._messages.popleft()
+        if self._paused and len(self._messages) <= self._max_queue // 2:
+            self._paused = False
+            if not self._transport.is_closing():
+                self._transport.resume_reading()
+        return message
+
+    def _wake(self) -> None:
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+
+class _MessageWriter(asyncio.Protocol):
+    """ Управление потоком записи: drain() ждёт, пока канал не освободится.
+    Ждать могут сразу несколько send(), освобождаются они все вместе.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+        self._paused = False
+        self._drain_waiters: Deque[asyncio.Future] = deque()
+        self._lost = False
+
+    def pause_writing(self) -> None:
+        self._paused = True
+
+    def resume_writing(self) -> None:
+        self._paused = False
+        self._release()
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        self._lost = True
+        self._release()
+
+    async def drain(self) -> None:
+        if self._lost:
+            raise ConnectionResetError("Pipe is closed")
+        if not self._paused:
+            return
+        waiter = self._loop.create_future()
+        self._drain_waiters.append(waiter)
+        try:
+            await waiter
+        finally:
+            # ? Освобождённые ожидания _release() уже убрал из очереди, а отменённое — нет
+            if waiter.cancelled() and waiter in self._drain_waiters:
+                self._drain_waiters.remove(waiter)
+        if self._lost:
+            raise ConnectionResetError("Pipe is closed")
+
+    def _release(self) -> None:
+        waiters, self._drain_waiters = self._drain_waiters, deque()
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
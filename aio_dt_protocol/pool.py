@@ -0,0 +1,418 @@
+import asyncio
+import os
+import signal
+from typing import Optional, Dict, List, Set, Callable, Awaitable, Any, AsyncIterator
+from contextlib import asynccontextmanager
+
+from .browser import Browser, FlagBuilder, CMDFlags
+from .connection import Connection
+from .utils import log, process_tree_rss
+
+Launcher = Callable[[int, str], Awaitable[Browser]]
+
+
+class PoolMember:
+    """ Браузер пула и его нагрузка. """
+    __slots__ = (
+        "index", "port", "profile", "browser", "pages", "opening", "served", "retiring", "restarting", "restarts",
+        "failed"
+    )
+
+    def __init__(self, index: int, port: int, profile: str) -> None:
+        self.index = index
+        self.port = port
+        self.profile = profile
+        self.browser: Optional[Browser] = None
+        # ? Выданные и ещё не закрытые страницы
+        self.pages: Dict[Connection, asyncio.Task] = {}
+        # ? Страницы, которые открываются прямо сейчас
+        self.opening = 0
+        # ? Сколько страниц выдано с последнего (пере)запуска
+        self.served = 0
+        # ? Новые страницы не выдаются: браузер будет перезапущен, когда закроются текущие
+        self.retiring = False
+        self.restarting = False
+        self.restarts = 0
+        # ? Браузер не удалось запустить ни с одной попытки. Проверка состояния
+        # ?     повторяет запуск каждые `health_interval` секунд
+        self.failed = False
+
+    @property
+    def load(self) -> int:
+        return len(self.pages) + self.opening
+
+    @property
+    def available(self) -> bool:
+        return self.browser is not None and not self.retiring and not self.restarting
+
+    def alive(self) -> bool:
+        """ Жив ли процесс браузера. Браузер, запущенный не этим экземпляром,
+        считается живым — его проверяет только запрос к HTTP-интерфейсу.
+        """
+        process = self.browser is not None and self.browser.process
+        return not process or process.poll() is None
+
+    def __repr__(self) -> str:
+        return (f"<PoolMember #{self.index} port={self.port} load={self.load} served={self.served}"
+                f"{' retiring' if self.retiring else ''}{' failed' if self.failed else ''}>")
+
+
+class BrowserPool:
+    """ Пул процессов браузера для использования всех ядер: каждый браузер получает
+    свой порт отладки и свой профиль, а страницы выдаются браузеру с наименьшей
+    нагрузкой.
+
+        async with BrowserPool(size=4, headless=True) as pool:
+            async with pool.page("https://example.com") as conn:
+                await conn.Page.navigate(...)
+
+    Пул следит за браузерами:
+        * после `max_pages` выданных страниц, или при превышении `max_rss` байт
+            памяти(всем деревом процессов, только Linux) браузер перестаёт получать
+            новые страницы и перезапускается, как только закроются текущие;
+        * браузер, процесс которого завершился, или который не ответил на проверку
+            за `health_timeout` секунд, перезапускается. Его страницы при этом
+            отсоединяются;
+        * неудачный перезапуск повторяется `restart_attempts` раз с нарастающей
+            паузой, начиная с `restart_delay` секунд. После этого браузер считается
+            неисправным, а проверка состояния пробует запустить его снова. Когда
+            неисправны все браузеры, acquire() возбуждает RuntimeError.
+    """
+    __slots__ = (
+        "size", "base_port", "profile_root", "max_pages", "max_rss", "health_interval",
+        "health_timeout", "restart_attempts", "restart_delay", "verbose", "_launcher", "_browser_options", "_members", "_owners",
+        "_changed", "_health_task", "_tasks", "_closed"
+    )
+
+    def __init__(
+            self,
+            size: Optional[int] = None,
+            base_port: int = 9300,
+            profile_root: str = "pool_profiles",
+            headless: bool = True,
+            max_pages: Optional[int] = 500,
+            max_rss: Optional[int] = None,
+            health_interval: float = 5.0,
+            health_timeout: float = 5.0,
+            restart_attempts: int = 3,
+            restart_delay: float = 0.5,
+            launcher: Optional[Launcher] = None,
+            verbose: bool = False,
+            **browser_options: Any
+    ) -> None:
+        """
+        :param size:            (optional) Количество браузеров. По умолчанию — по числу ядер.
+        :param base_port:       (optional) Порт отладки первого браузера, остальные — следующие по порядку.
+                                    0 — каждый браузер получает свободный порт от ОС.
+        :param profile_root:    (optional) Каталог, в котором каждый браузер получит свой профиль.
+        :param headless:        (optional) Запускать браузеры без окон.
+        :param max_pages:       (optional) После скольких выданных страниц браузер перезапускается.
+                                    None — без ограничения.
+        :param max_rss:         (optional) При каком объёме памяти, в байтах, браузер перезапускается.
+                                    None — без ограничения.
+        :param health_interval: (optional) Период проверки браузеров, в секундах.
+        :param health_timeout:  (optional) Сколько секунд ждать ответа браузера при проверке и запуске.
+        :param restart_attempts: (optional) Сколько раз пытаться перезапустить браузер подряд.
+        :param restart_delay:   (optional) Пауза перед второй попыткой, в секундах. Каждая
+                                    следующая вдвое длиннее, но не больше `health_interval`.
+        :param launcher:        (optional) Корутина(port, profile_path) -> Browser, запускающая
+                                    браузер. По умолчанию — Browser(...) с `browser_options`.
+        :param verbose:         (optional) Печатать запуски и перезапуски браузеров.
+        :param browser_options: Прочие аргументы `Browser()`: browser_exe, flags, ws_options и т.д.
+        """
+        size = size if size is not None else os.cpu_count() or 1
+        if size < 1:
+            raise ValueError("'size' must be a positive integer")
+        self.size = size
+        self.base_port = base_port
+        self.profile_root = os.path.abspath(profile_root)
+        self.max_pages = max_pages
+        self.max_rss = max_rss
+        self.health_interval = health_interval
+        self.health_timeout = health_timeout
+        self.restart_attempts = max(restart_attempts, 1)
+        self.restart_delay = restart_delay
+        self.verbose = verbose
+
+        if headless:
+            flags = FlagBuilder()
+            flags.add(CMDFlags.Headless.headless)
+            if (extra := browser_options.pop("flags", None)) is not None:
+                flags += extra
+            browser_options["flags"] = flags
+        self._browser_options = browser_options
+        self._launcher: Launcher = launcher or self._launch
+
+        self._members = [
+            PoolMember(i, base_port + i if base_port else 0, os.path.join(self.profile_root, f"browser-{i}"))
+            for i in range(size)
+        ]
+        self._owners: Dict[Connection, PoolMember] = {}
+        self._changed: Optional[asyncio.Condition] = None
+        self._health_task: Optional[asyncio.Task] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self._closed = False
+
+    @property
+    def members(self) -> List[PoolMember]:
+        return list(self._members)
+
+    async def start(self) -> "BrowserPool":
+        """ Запускает все браузеры пула и проверку их состояния. """
+        self._changed = asyncio.Condition()
+        results = await asyncio.gather(*(self._start(member) for member in self._members), return_exceptions=True)
+        # ! Браузеры, которые успели запуститься, иначе остались бы работать без пула
+        if errors := [r for r in results if isinstance(r, BaseException)]:
+            await asyncio.gather(*(self._stop(m) for m in self._members), return_exceptions=True)
+            raise errors[0]
+        self._health_task = asyncio.get_running_loop().create_task(self._healthLoop())
+        return self
+
+    async def acquire(self, url: str = "about:blank", timeout: Optional[float] = None) -> Connection:
+        """ Открывает страницу в браузере с наименьшей нагрузкой. Страницу нужно
+        вернуть через release(), или использовать page().
+        :param url:         (optional) Адрес, который будет открыт.
+        :param timeout:     (optional) Сколько секунд ждать свободного браузера, если все
+                                заняты перезапуском. По истечении возбуждается
+                                asyncio.TimeoutError. None — ждать без ограничения.
+        :return:        <Connection>
+        """
+        if self._closed or self._changed is None:
+            raise RuntimeError("BrowserPool is not started")
+
+        async with self._changed:
+            await asyncio.wait_for(self._changed.wait_for(
+                lambda: self._closed or all(m.failed for m in self._members)
+                or any(m.available for m in self._members)), timeout)
+            if self._closed:
+                raise RuntimeError("BrowserPool is closed")
+            if not any(m.available for m in self._members):
+                raise RuntimeError("No browser of the pool could be started")
+            member = min((m for m in self._members if m.available), key=lambda m: (m.load, m.served))
+            member.served += 1
+            if self.max_pages is not None and member.served >= self.max_pages:
+                member.retiring = True
+            # ? Страница учитывается до открытия, чтобы конкурентные вызовы
+            # ?     распределялись, не дожидаясь друг друга
+            member.opening += 1
+
+        try:
+            conn = await member.browser.newTab(url)
+            if conn is None:
+                raise RuntimeError(f"Browser on port {member.port} did not open a page")
+        except BaseException:
+            member.opening -= 1
+            self._settle(member)
+            raise
+        member.opening -= 1
+
+        self._owners[conn] = member
+        member.pages[conn] = asyncio.get_running_loop().create_task(self._watchPage(conn, member))
+        return conn
+
+    async def release(self, conn: Connection) -> None:
+        """ Закрывает страницу, полученную через acquire(). """
+        if (member := self._owners.get(conn)) is None:
+            return
+        if conn.connected and member.browser is not None:
+            try:
+                await member.browser.closeTarget(conn.conn_id)
+            except OSError:
+                pass
+            await conn.disconnect()
+        self._forget(conn, member)
+
+    @asynccontextmanager
+    async def page(self, url: str = "about:blank", timeout: Optional[float] = None) -> AsyncIterator[Connection]:
+        """ Страница на время блока `async with`. Аргументы — как у acquire(). """
+        conn = await self.acquire(url, timeout)
+        try:
+            yield conn
+        finally:
+            await self.release(conn)
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """ Снимок состояния браузеров пула. """
+        return [{
+            "port": m.port,
+            "pid": m.browser.browser_pid if m.browser is not None else None,
+            "load": m.load,
+            "served": m.served,
+            "retiring": m.retiring,
+            "restarts": m.restarts,
+            "failed": m.failed,
+            "rss": process_tree_rss(m.browser.browser_pid)
+            if m.browser is not None and m.browser.browser_pid > 0 else None,
+        } for m in self._members]
+
+    async def close(self) -> None:
+        """ Закрывает все страницы и браузеры пула. """
+        if self._closed:
+            return
+        self._closed = True
+        if self._health_task is not None:
+            self._health_task.cancel()
+        for task in tuple(self._tasks):
+            task.cancel()
+        if self._changed is not None:
+            async with self._changed:
+                self._changed.notify_all()
+        for conn in tuple(self._owners):
+            if conn.connected:
+                await conn.disconnect()
+        await asyncio.gather(*(self._stop(m) for m in self._members), return_exceptions=True)
+
+    async def __aenter__(self) -> "BrowserPool":
+        return await self.start()
+
+    async def __aexit__(self, *_) -> None:
+        await self.close()
+
+    async def _launch(self, port: int, profile: str) -> Browser:
+        """ Запускает браузер с собственным портом и профилем. """
+        return Browser(profile_path=profile, debug_port=port, verbose=self.verbose, **self._browser_options)
+
+    async def _start(self, member: PoolMember) -> None:
+        browser = await self._launcher(member.port if self.base_port else 0, member.profile)
+        try:
+            await asyncio.wait_for(self._waitReady(browser), self.health_timeout)
+        except BaseException:
+            browser.kill()
+            raise
+        member.browser = browser
+        # ? Порт, выбранный браузером при запуске с портом 0, известен после waitForEndpoint()
+        member.port = int(browser.debug_port)
+        member.served = 0
+        member.retiring = False
+        if self.verbose:
+            log(f"[ POOL ] browser #{member.index} started on port {member.port}")
+
+    @staticmethod
+    async def _waitReady(browser: Browser) -> None:
+        """ Дожидается, пока браузер начнёт отвечать на /json/version. Соединений со
+        страницами при этом не открывается.
+        """
+        await browser.waitForEndpoint()
+        delay = .01
+        while True:
+            try:
+                await browser.getVersion()
+                return
+            except (OSError, ValueError):
+                pass
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, .5)
+
+    async def _stop(self, member: PoolMember) -> None:
+        if (browser := member.browser) is None:
+            return
+        member.browser = None
+        try:
+            await asyncio.wait_for(browser.close(), self.health_timeout)
+        except (OSError, asyncio.TimeoutError, ConnectionError):
+            pass
+        if browser.process is not None:
+            try:
+                await asyncio.wait_for(
+                    asyncio.get_running_loop().run_in_executor(None, browser.process.wait), self.health_timeout)
+            except asyncio.TimeoutError:
+                browser.process.send_signal(signal.SIGKILL if hasattr(signal, "SIGKILL") else signal.SIGTERM)
+
+    async def _restart(self, member: PoolMember, reason: str) -> None:
+        if member.restarting:
+            return
+        if self.verbose:
+            log(f"[ POOL ] restarting browser #{member.index} on port {member.port}: {reason}")
+        member.restarting = True
+        try:
+            for conn in tuple(member.pages):
+                if conn.connected:
+                    await conn.disconnect()
+            await self._stop(member)
+            member.restarts += 1
+            delay = self.restart_delay
+            for attempt in range(self.restart_attempts):
+                if self._closed:
+                    return
+                if attempt:
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 2, self.health_interval)
+                try:
+                    await self._start(member)
+                    member.failed = False
+                    break
+                except Exception as e:
+                    log(f"[ POOL ] browser #{member.index} failed to start, attempt {attempt + 1}: {e!r}",
+                        "[<- E ->]")
+            else:
+                member.failed = True
+        except Exception as e:
+            log(f"[ POOL ] browser #{member.index} failed to restart: {e!r}", "[<- E ->]")
+        finally:
+            member.restarting = False
+        async with self._changed:
+            self._changed.notify_all()
+
+    async def _watchPage(self, conn: Connection, member: PoolMember) -> None:
+        """ Освобождает место страницы, когда она закрывается любым способом. """
+        await conn.waitForClose()
+        self._forget(conn, member)
+
+    def _forget(self, conn: Connection, member: PoolMember) -> None:
+        self._owners.pop(conn, None)
+        if (watcher := member.pages.pop(conn, None)) is not None and watcher is not asyncio.current_task():
+            watcher.cancel()
+        self._settle(member)
+
+    def _settle(self, member: PoolMember) -> None:
+        """ Перезапускает выбывающий браузер, когда на нём не осталось страниц, и будит
+        ожидающих свободного браузера. Перезапуск идёт в фоне и не задерживает release().
+        """
+        if self._closed:
+            return
+        if member.retiring and not member.load and member.browser is not None and not member.restarting:
+            self._spawn(self._restart(member, "recycled"))
+        else:
+            self._spawn(self._notify())
+
+    async def _notify(self) -> None:
+        async with self._changed:
+            self._changed.notify_all()
+
+    def _spawn(self, coroutine: Awaitable[None]) -> None:
+        task = asyncio.get_running_loop().create_task(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _healthLoop(self) -> None:
+        while True:
+            await asyncio.sleep(self.health_interval)
+            for member in self._members:
+                if member.restarting or self._closed:
+                    continue
+                if member.browser is None:
+                    if member.failed:
+                        self._spawn(self._restart(member, "previous start failed"))
+                    continue
+                try:
+                    await self._check(member)
+                except Exception as e:
+                    log(f"[ POOL ] health check of browser #{member.index} failed: {e!r}", "[<- E ->]")
+
+    async def _check(self, member: PoolMember) -> None:
+        if not member.alive():
+            self._spawn(self._restart(member, "process exited"))
+            return
+        try:
+            await asyncio.wait_for(member.browser.getVersion(), self.health_timeout)
+        except (OSError, asyncio.TimeoutError, ValueError):
+            self._spawn(self._restart(member, "not responding"))
+            return
+        if self.max_rss is None or member.retiring:
+            return
+        # ? Обход /proc занимает заметное время на машине с сотнями процессов
+        rss = await asyncio.get_running_loop().run_in_executor(
+            None, process_tree_rss, member.browser.browser_pid)
+        if rss is not None and rss > self.max_rss and not member.retiring:
+            member.retiring = True
+            self._settle(member)
@@ -0,0 +1,93 @@
+from typing import Dict, Tuple, Optional, List, Any, Hashable
+
+# ? Домены, в которых команды set* задают состояние, которое нужно восстановить
+STATEFUL_SET_DOMAINS = frozenset(("Emulation", "Network", "Page", "Target", "Input", "Log"))
+
+# ? Команды set*, которые не задают состояние сеанса отладки, или которое браузер
+# ?     хранит сам, независимо от соединения
+NOT_STATEFUL = frozenset((
+    "Network.setCookie", "Network.setCookies", "Page.setDocumentContent",
+    "Target.setRemoteLocations",
+))
+
+ADD_SCRIPT = "Page.addScriptToEvaluateOnNewDocument"
+REMOVE_SCRIPT = "Page.removeScriptToEvaluateOnNewDocument"
+
+
+class ReplayJournal:
+    """ Журнал команд, задающих состояние сеанса отладки: включённые домены,
+    привязки, скрипты на загрузку, шаблоны перехвата, переопределения эмуляции
+    и сети. Каждая следующая команда с тем же ключом заменяет предыдущую, а
+    отменяющая команда(disable, remove*, clear*Override) удаляет запись, поэтому
+    журнал хранит только итоговое состояние, а не историю.
+
+    После переподключения журнал воспроизводится одним пакетом команд.
+    Скрипты на загрузку получают при этом новые идентификаторы — журнал
+    запоминает соответствие, и старые идентификаторы остаются рабочими.
+    """
+    __slots__ = ("_entries", "_aliases")
+
+    def __init__(self) -> None:
+        self._entries: Dict[Hashable, Tuple[str, Optional[dict]]] = {}
+        # ? Идентификатор скрипта, известный вызывающему -> текущий идентификатор
+        self._aliases: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def record(self, domain_and_method: str, params: Optional[dict], result: Optional[dict]) -> None:
+        """ Учитывает успешно выполненную команду.
+        :param domain_and_method:   Название домена и метода.
+        :param params:              Параметры команды.
+        :param result:              Результат команды.
+        """
+        domain, _, method = domain_and_method.partition(".")
+
+        if method == "enable":
+            self._put(domain_and_method, domain_and_method, params)
+        elif method == "disable":
+            self._entries.pop(domain + ".enable", None)
+        elif domain_and_method == "Runtime.addBinding":
+            self._put(("Runtime.addBinding", params["name"]), domain_and_method, params)
+        elif domain_and_method == "Runtime.removeBinding":
+            self._entries.pop(("Runtime.addBinding", params["name"]), None)
+        elif domain_and_method == ADD_SCRIPT:
+            identifier = result["identifier"]
+            self._aliases[identifier] = identifier
+            self._put((ADD_SCRIPT, identifier), domain_and_method, params)
+        elif domain_and_method == REMOVE_SCRIPT:
+            identifier = params["identifier"]
+            for known, current in tuple(self._aliases.items()):
+                if identifier in (known, current):
+                    del self._aliases[known]
+                    self._entries.pop((ADD_SCRIPT, known), None)
+        elif method.startswith("clear") and method.endswith("Override"):
+            self._entries.pop(f"{domain}.set{method[5:]}", None)
+        elif (method.startswith("set") or domain_and_method == "Network.emulateNetworkConditions") \
+                and domain in STATEFUL_SET_DOMAINS and domain_and_method not in NOT_STATEFUL:
+            self._put(domain_and_method, domain_and_method, params)
+
+    def translate(self, domain_and_method: str, params: Optional[dict]) -> Optional[dict]:
+        """ Подменяет устаревший идентификатор скрипта на актуальный. """
+        if domain_and_method == REMOVE_SCRIPT and params \
+                and (current := self._aliases.get(params.get("identifier"))) is not None \
+                and current != params["identifier"]:
+            return {**params, "identifier": current}
+        return params
+
+    def commands(self) -> List[Tuple[str, Optional[dict]]]:
+        """ Команды для воспроизведения, в порядке их первоначального выполнения. """
+        return list(self._entries.values())
+
+    def replayed(self, results: List[Any]) -> None:
+        """ Обновляет идентификаторы скриптов по результатам воспроизведения.
+        :param results:     Результаты `callMany(*journal.commands())`.
+        """
+        for key, result in zip(tuple(self._entries), results):
+            if type(key) is tuple and key[0] == ADD_SCRIPT and isinstance(result, dict):
+                self._aliases[key[1]] = result["identifier"]
+
+    def _put(self, key: Hashable, domain_and_method: str, params: Optional[dict]) -> None:
+        # ? Повторная команда переносится в конец, сохраняя порядок применения
+        self._entries.pop(key, None)
+        self._entries[key] = domain_and_method, params
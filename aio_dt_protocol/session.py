@@ -0,0 +1,87 @@
+from typing import Union
+from urllib.parse import urlparse
+
+from .connection import Connection
+from .data import CommonCallback
+from .exceptions import ConnectionDetached
+from .utils import log
+
+
+class Session(Connection):
+    """ Лёгкое соединение с target, присоединённым в режиме `flatten`.
+    Не открывает собственный WebSocket и не запускает цикл приёма: команды
+    уходят через соединение-владелец с указанием `sessionId`, а входящие
+    сообщения владелец передаёт сессии сам. API тот же, что у `Connection`.
+    Диспетчер событий тоже общий с владельцем: очереди сессий различаются по `sessionId`.
+
+    Создаётся методами `Connection.attachSession()`, `Connection.setAutoAttachSessions()`,
+    или `Browser.getSessionByID()`.
+    """
+    __slots__ = ("_root",)
+
+    def __init__(
+            self,
+            root: Connection,
+            session_id: str,
+            target_id: str,
+            callback: CommonCallback
+    ) -> None:
+        """
+        :param root:            Соединение-владелец WebSocket.
+        :param session_id:      Идентификатор сессии, выданный браузером.
+        :param target_id:       Идентификатор target.
+        :param callback:        Колбэк, который будет получать все сообщения сессии.
+        """
+        host = urlparse(root.ws_url).netloc
+        super().__init__(
+            root.ws_url,
+            target_id,
+            f"/devtools/inspector.html?ws={host}/devtools/page/{target_id}",
+            callback,
+            root.is_headless_mode,
+            root.verbose,
+            root.browser_name,
+            root.dispatcher,
+            root.default_timeout,
+            root.ws_options
+        )
+        self._root = root
+        self._session_id = session_id
+
+    @property
+    def root(self) -> Connection:
+        """ Соединение, через WebSocket которого работает сессия. """
+        return self._root
+
+    def __str__(self) -> str:
+        return f"<Session targetId={self.conn_id!r} sessionId={self.session_id!r}>"
+
+    def _next_id(self) -> int:
+        # ? Идентификаторы команд уникальны в пределах всего WebSocket
+        return self._root._next_id()
+
+    def _sendsBytes(self) -> bool:
+        return self._root._sendsBytes()
+
+    async def _send(self, data: Union[str, bytes]) -> None:
+        if not self.connected:
+            raise ConnectionDetached(f"{self} is not connected")
+        if self.metrics is not None:
+            self.metrics.sent(len(data))
+        await self._root._send(data)
+
+    async def activate(self, enable_runtime: bool = True) -> None:
+        self._connected = True
+        if enable_runtime:
+            await self.Runtime.enable()
+
+    async def disconnect(self) -> None:
+        """ Отсоединяется от target. WebSocket владельца остаётся открытым. """
+        if not self.connected:
+            return
+        if self.verbose:
+            log(f"[ DISCONNECT ] {self}")
+        if self._root.connected:
+            await self._root.Target.detachFromTarget(sessionId=self._session_id)
+        if self._root.sessions.pop(self._session_id, None) is not None:
+            await self._detach()
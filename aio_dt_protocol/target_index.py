@@ -0,0 +1,233 @@
+import asyncio
+from bisect import bisect_left, insort
+from itertools import count
+from typing import Callable, Dict, Iterator, List, Literal, Optional, Set, Tuple, Union, TYPE_CHECKING
+
+from .exceptions import ConnectionDetached
+
+if TYPE_CHECKING:
+    from .connection import Connection
+    from .event_stream import EventStream
+
+MatchMode = Literal["exact", "contains", "startswith"]
+TargetPredicate = Callable[[dict], bool]
+
+# ? События, которыми браузер сообщает об изменениях в списке target-ов
+TARGET_EVENTS = ("Target.targetCreated", "Target.targetInfoChanged", "Target.targetDestroyed")
+# ? Поля TargetInfo, по которым ведутся упорядоченные индексы
+INDEXED_FIELDS = ("type", "url", "title")
+
+
+class TargetIndex:
+    """ Живой индекс target-ов браузера. Заполняется один раз через Target.getTargets,
+    а затем обновляется событиями Target.setDiscoverTargets — без запросов /json/list
+    и без опроса:
+        * get(target_id)                — описание по идентификатору, O(1);
+        * find(field, value, mode)      — по type, url, или title: точное совпадение и
+                                            начало строки ищутся по упорядоченному
+                                            индексу, вхождение — перебором в памяти;
+        * expect() / waitFor()          — дождаться появления target-а.
+    Описания — словари Target.TargetInfo в том виде, в котором их присылает браузер.
+    Сравнение строк, как и в `Browser.getConnectionBy()`, без учёта регистра.
+
+    Создаётся методом `Browser.getTargetIndex()`, или вручную на соединении с браузером:
+        targets = TargetIndex(await browser.getBrowserConnection())
+        await targets.start()
+        info = await targets.waitFor(lambda t: t["url"].startswith("https://example.com"))
+    """
+    __slots__ = (
+        "_connection", "_targets", "_order", "_sorted", "_waiters", "_stream", "_consumer",
+        "_destroyed", "_counter"
+    )
+
+    def __init__(self, connection: "Connection") -> None:
+        """
+        :param connection:      Соединение, получающее события Target. Обычно — с самим
+                                    браузером, чтобы видеть все его target-ы.
+        """
+        self._connection = connection
+        # ? targetId -> TargetInfo и порядковый номер появления
+        self._targets: Dict[str, dict] = {}
+        self._order: Dict[str, int] = {}
+        # ? Поле -> отсортированный список (значение в нижнем регистре, targetId)
+        self._sorted: Dict[str, List[Tuple[str, str]]] = {field: [] for field in INDEXED_FIELDS}
+        self._waiters: List[Tuple[asyncio.Future, TargetPredicate]] = []
+        self._stream: Optional["EventStream"] = None
+        self._consumer: Optional[asyncio.Task] = None
+        # ? Target-ы, уничтоженные, пока индекс заполняется, см. start()
+        self._destroyed: Optional[Set[str]] = None
+        self._counter = count()
+
+    @property
+    def active(self) -> bool:
+        """ Получает ли индекс события. После отсоединения соединения — False. """
+        return self._stream is not None and not self._stream.closed
+
+    async def start(self) -> None:
+        """ Подписывается на события Target и заполняет индекс существующими target-ами. """
+        if self._stream is not None:
+            return
+        conn = self._connection
+        # ? Пропуск события оставил бы индекс неверным, поэтому поток не теряет событий
+        self._stream = conn.events(*TARGET_EVENTS, overflow="block")
+        self._consumer = asyncio.create_task(self._consume(self._stream))
+        self._destroyed = set()
+        try:
+            await conn.call("Target.setDiscoverTargets", {"discover": True})
+            infos: List[dict] = (await conn.call("Target.getTargets"))["targetInfos"]
+        except BaseException:
+            self.stop()
+            raise
+        # ? События, пришедшие после ответа, могли быть обработаны раньше него:
+        # ?     такие target-ы уже в индексе, или уже уничтожены
+        for info in infos:
+            if info["targetId"] not in self._targets and info["targetId"] not in self._destroyed:
+                self._put(info)
+        self._destroyed = None
+
+    def stop(self) -> None:
+        """ Отписывается от событий. Ожидания target-ов завершаются ConnectionDetached. """
+        if self._stream is not None:
+            self._stream.close()
+        self._failWaiters()
+
+    async def _consume(self, stream: "EventStream") -> None:
+        try:
+            async for method, params in stream:
+                if method == "Target.targetDestroyed":
+                    self._remove(params["targetId"])
+                else:
+                    self._put(params["targetInfo"])
+        finally:
+            self._failWaiters()
+
+    def _put(self, info: dict) -> None:
+        target_id: str = info["targetId"]
+        if (old := self._targets.get(target_id)) is None:
+            self._order[target_id] = next(self._counter)
+        for field, entries in self._sorted.items():
+            value = info.get(field, "").lower()
+            if old is not None:
+                if (previous := old.get(field, "").lower()) == value:
+                    continue
+                _discard(entries, (previous, target_id))
+            insort(entries, (value, target_id))
+        self._targets[target_id] = info
+
+        if self._waiters:
+            for future, predicate in tuple(self._waiters):
+                if future.done():
+                    continue
+                try:
+                    if predicate(info):
+                        future.set_result(info)
+                except Exception as e:
+                    future.set_exception(e)
+
+    def _remove(self, target_id: str) -> None:
+        if self._destroyed is not None:
+            self._destroyed.add(target_id)
+        if (info := self._targets.pop(target_id, None)) is None:
+            return
+        del self._order[target_id]
+        for field, entries in self._sorted.items():
+            _discard(entries, (info.get(field, "").lower(), target_id))
+
+    def get(self, target_id: str) -> Optional[dict]:
+        """ Описание target-а по идентификатору, или None. """
+        return self._targets.get(target_id)
+
+    def find(
+            self, field: str,
+            value: str,
+            match_mode: MatchMode = "exact") -> List[dict]:
+        """ Target-ы, поле которых соответствует значению, в порядке их появления.
+        :param field:       Поле TargetInfo: "type", "url", "title", "targetId", ...
+        :param value:       Значение, с которым сравнивается поле.
+        :param match_mode:  Режим сравнения:
+                                * exact      - полное соответствие поля и value
+                                * contains   - поле содержит value
+                                * startswith - поле начинается с value
+        """
+        if match_mode not in ("exact", "contains", "startswith"):
+            raise ValueError(f"Unknown match_mode: {match_mode!r}")
+        v = value.lower()
+
+        if (entries := self._sorted.get(field)) is not None and match_mode != "contains":
+            found = []
+            for i in range(bisect_left(entries, (v,)), len(entries)):
+                key, target_id = entries[i]
+                if not (key == v if match_mode == "exact" else key.startswith(v)):
+                    break
+                found.append(self._targets[target_id])
+            found.sort(key=lambda info: self._order[info["targetId"]])
+            return found
+
+        if match_mode == "exact":
+            return [info for info in self._targets.values() if str(info.get(field, "")).lower() == v]
+        if match_mode == "contains":
+            return [info for info in self._targets.values() if v in str(info.get(field, "")).lower()]
+        return [info for info in self._targets.values() if str(info.get(field, "")).lower().startswith(v)]
+
+    def expect(self, target: Union[str, TargetPredicate]) -> asyncio.Future:
+        """ Future, которая разрешится описанием target-а: уже существующего, или
+        первого появившегося, или изменившегося так, что условие стало верным.
+        Отмена future снимает ожидание.
+        :param target:      Идентификатор target-а, или функция(TargetInfo) -> bool.
+        """
+        future = asyncio.get_running_loop().create_future()
+        if isinstance(target, str):
+            if (info := self._targets.get(target)) is not None:
+                future.set_result(info)
+                return future
+            target_id = target
+            predicate: TargetPredicate = lambda info: info["targetId"] == target_id
+        else:
+            predicate = target
+            try:
+                if (info := next((i for i in self._targets.values() if predicate(i)), None)) is not None:
+                    future.set_result(info)
+                    return future
+            except Exception as e:
+                future.set_exception(e)
+                return future
+
+        if not self.active:
+            future.set_exception(ConnectionDetached("Target index is not receiving events"))
+            return future
+        waiter = future, predicate
+        self._waiters.append(waiter)
+        future.add_done_callback(lambda _: self._waiters.remove(waiter))
+        return future
+
+    async def waitFor(self, target: Union[str, TargetPredicate], timeout: Optional[float] = None) -> dict:
+        """ Дожидается target-а, см. expect().
+        :param target:      Идентификатор target-а, или функция(TargetInfo) -> bool.
+        :param timeout:     (optional) Тайм-аут в секундах. По истечении — asyncio.TimeoutError.
+        :return:        TargetInfo
+        """
+        return await asyncio.wait_for(self.expect(target), timeout)
+
+    def _failWaiters(self) -> None:
+        for future, _ in tuple(self._waiters):
+            if not future.done():
+                future.set_exception(ConnectionDetached("Target index stopped while waiting for a target"))
+
+    def __contains__(self, target_id: str) -> bool:
+        return target_id in self._targets
+
+    def __len__(self) -> int:
+        return len(self._targets)
+
+    def __iter__(self) -> Iterator[dict]:
+        return iter(tuple(self._targets.values()))
+
+    def __repr__(self) -> str:
+        return f"<TargetIndex targets={len(self._targets)} active={self.active}>"
+
+
+def _discard(entries: List[Tuple[str, str]], entry: Tuple[str, str]) -> None:
+    """ Удаляет запись из отсортированного списка. """
+    i = bisect_left(entries, entry)
+    if i < len(entries) and entries[i] == entry:
+        del entries[i]
@@ -1,16 +1,20 @@
 import asyncio
+import os
 import subprocess
 import re
 import sys
-import urllib.request
+from importlib import import_module
 from pathlib import Path
-from typing import Optional, Dict, Callable, Union
+from typing import Optional, Dict, Callable, Union, Tuple, Any
 from urllib.parse import quote
 from urllib.error import HTTPError
-from .data import BrowserInstanceInfo
+from .data import BrowserInstanceInfo, DEVTOOLS_ACTIVE_PORT
 
 
 def make_request(url: str, method="GET") -> str:
+    # ? urllib.request тянет за собой http.client и email, поэтому импортируется
+    # ?     только при первом запросе
+    import urllib.request
     req = urllib.request.Request(url, method=method)
     try:
         with urllib.request.urlopen(req) as response:
@@ -50,6 +54,83 @@ def log(data: any = "", lvl: str = "[<- V ->]", eol: str = "\n") -> None:
     print(f"\x1b[32m{lvl} \x1b[38m\x1b[3m{data}\x1b[0m", end=eol)
 
 
+_FRAME_HEAD = re.compile(r'\{\s*"(?:id"\s*:\s*(\d+)|method"\s*:\s*"([^"]+)")')
+_FRAME_TAIL = re.compile(r'"sessionId"\s*:\s*"([^"]+)"\s*}\s*$')
+_FRAME_HEAD_B = re.compile(_FRAME_HEAD.pattern.encode())
+_FRAME_TAIL_B = re.compile(_FRAME_TAIL.pattern.encode())
+
+
+def prescan_frame(raw: Union[str, bytes]) -> Optional[Tuple[Optional[int], Optional[str], Optional[str]]]:
+    """ Быстро извлекает из сырого сообщения протокола `id`, `method` и `sessionId`
+    без разбора всего JSON. Браузер всегда ставит `id`, или `method` первым ключом,
+    а `sessionId` — последним, поэтому достаточно заглянуть в начало и конец строки.
+    :param raw:     Сообщение в том виде, в котором оно пришло из сокета.
+    :return:        (id, method, sessionId), или None, если сообщение не удалось
+                        распознать и его нужно разбирать целиком.
+    """
+    if type(raw) is str:
+        head_re, tail_re = _FRAME_HEAD, _FRAME_TAIL
+    else:
+        head_re, tail_re = _FRAME_HEAD_B, _FRAME_TAIL_B
+    if not (head := head_re.match(raw)):
+        return None
+    tail = tail_re.search(raw, len(raw) - 128 if len(raw) > 128 else 0)
+    msg_id, method = head.groups()
+    if type(raw) is not str:
+        method = method and method.decode()
+        tail_value = tail and tail.group(1).decode()
+    else:
+        tail_value = tail and tail.group(1)
+    return (
+        int(msg_id) if msg_id is not None else None,
+        method,
+        tail_value or None
+    )
+
+
+def lazy_attributes(
+        factories: Dict[str, Callable[[Any], Any]],
+        created: Optional[str] = None) -> Callable[[Any, str], Any]:
+    """ Возвращает `__getattr__` для класса со `__slots__`, который создаёт значения
+    перечисленных слотов при первом обращении к ним:
+        class Connection:
+            __slots__ = ("Page",)
+            __getattr__ = lazy_attributes({"Page": Page})    # Page(conn) — при первом обращении
+    `__getattr__` вызывается только пока слот пуст, поэтому последующие обращения
+    стоят столько же, сколько чтение обычного слота.
+    :param factories:   Имя слота -> функция, получающая владельца и возвращающая значение.
+    :param created:     (optional) Имя атрибута владельца — множества, в которое
+                            добавляются имена уже созданных значений.
+    """
+    def __getattr__(self, name: str) -> Any:
+        if (factory := factories.get(name)) is None:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+        value = factory(self)
+        setattr(self, name, value)
+        if created is not None:
+            getattr(self, created).add(name)
+        return value
+
+    return __getattr__
+
+
+def lazy_import(module: str, name: str) -> Callable[[Any], Any]:
+    """ Фабрика для `lazy_attributes`, которая импортирует модуль при первом вызове:
+        lazy_attributes({"Page": lazy_import(".domains.page", "Page")})
+    :param module:      Модуль, относительно пакета `aio_dt_protocol`.
+    :param name:        Имя класса в модуле. Класс вызывается с владельцем слота.
+    """
+    cls = None
+
+    def factory(owner: Any) -> Any:
+        nonlocal cls
+        if cls is None:
+            cls = getattr(import_module(module, __package__), name)
+        return cls(owner)
+
+    return factory
+
+
 def save_img_as(path: Union[str, Path], data: bytes) -> None:
     """ Сохраняет набор байт возвращаемый из conn.extend.makeScreenshot(), как изображение.
     :param path:    Путь, или имя файла сохраняемого изображения.
@@ -70,7 +151,45 @@ async def async_util_call(function: Callable, *args) -> any:
     )
 
 
-def find_instances(for_port: Optional[int] = None, browser: str = "chrome") -> Dict[int, BrowserInstanceInfo]:
+def process_tree_rss(pid: int) -> Optional[int]:
+    """ Суммарный объём резидентной памяти процесса и всех его потомков в байтах.
+    Браузер — это десятки процессов, поэтому память одного главного процесса
+    мало что говорит о потреблении. Только Linux(/proc), на других платформах — None.
+    :param pid:         Идентификатор процесса.
+    """
+    if not sys.platform.startswith("linux"):
+        return None
+
+    children: Dict[int, list] = {}
+    for entry in Path("/proc").iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / "stat").read_text()
+        except OSError:
+            continue
+        # ? Имя процесса в скобках может содержать пробелы, поля идут после последней ")"
+        ppid = int(stat[stat.rindex(")") + 2:].split(" ", 2)[1])
+        children.setdefault(ppid, []).append(int(entry.name))
+
+    total, stack = 0, [pid]
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    while stack:
+        current = stack.pop()
+        try:
+            total += int(Path(f"/proc/{current}/statm").read_text().split()[1]) * page_size
+        except (OSError, IndexError, ValueError):
+            if current == pid:
+                return None
+            continue
+        stack.extend(children.get(current, ()))
+    return total
+
+
+def find_instances(
+        for_port: Optional[int] = None,
+        browser: str = "chrome",
+        profile_path: Optional[str] = None) -> Dict[int, BrowserInstanceInfo]:
     """ !!! ВНИМАНИЕ !!! На Windows 11 может быть отключен компонент WMI("Windows Management
     Instrumentation"), его нужно либо включить в разделе “Программы и компоненты” панели
     управления, либо установить из официальных источников.
@@ -89,10 +208,19 @@ def find_instances(for_port: Optional[int] = None, browser: str = "chrome") -> D
                 browser_instance = Browser(instance_info=instance_info)
             else:
                 browser_instance = Browser()
+            # Или для браузера, работающего с известным профилем, в том числе
+            # запущенного с debug_port=0. Процессы при этом не перебираются:
+            if browser_instances := find_instances(profile_path="testProfile"):
+                browser_instance = Browser(instance_info=next(iter(browser_instances.values())))
     :param for_port:    - порт, для которого осуществляется поиск.
     :param browser:     - браузер, для которого запрашивается поиск.
+    :param profile_path: - каталог профиля(user_data_dir). Если передан, порт читается
+                            из файла DevToolsActivePort, который браузер пишет в профиль.
     :return:
     """
+    if profile_path is not None:
+        return _find_instance_by_profile(profile_path, for_port, browser)
+
     win_exp = re.compile(r"^\"[^\"]+(?<=\\)(\w+\.\w+)\".*?--remote-debugging-port=(\d+).*?(\d+)\s*$")
     linux_exp = re.compile(r"^[/\w]+/(\w+).*?--remote-debugging-port=(\d+)")
 
@@ -141,6 +269,41 @@ def find_instances(for_port: Optional[int] = None, browser: str = "chrome") -> D
     return {} if for_port else result
 
 
+def _find_instance_by_profile(
+        profile_path: str,
+        for_port: Optional[int],
+        browser: str) -> Dict[int, BrowserInstanceInfo]:
+    """ Браузер, работающий с профилем `profile_path`, по его файлу DevToolsActivePort.
+    Файл остаётся в профиле и после аварийного завершения браузера, поэтому порт
+    проверяется подключением к нему.
+    """
+    import socket
+
+    profile_path = os.path.abspath(profile_path)
+    try:
+        with open(os.path.join(profile_path, DEVTOOLS_ACTIVE_PORT)) as f:
+            port = int(f.readline())
+    except (OSError, ValueError):
+        return {}
+    if for_port and for_port != port:
+        return {}
+    try:
+        socket.create_connection(("127.0.0.1", port), timeout=.5).close()
+    except OSError:
+        return {}
+
+    # ? На Linux профиль занят символической ссылкой SingletonLock -> "<host>-<pid>".
+    # ?     Если pid не узнать, он остаётся нулевым, как у браузера из fake_cdp.
+    pid, headless = 0, False
+    try:
+        pid = int(os.readlink(os.path.join(profile_path, "SingletonLock")).rsplit("-", 1)[1])
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            headless = b"--headless" in f.read()
+    except (OSError, ValueError, IndexError):
+        pass
+    return {port: BrowserInstanceInfo(name=browser, pid=pid, port=port, headless=headless)}
+
+
 def prepare_url(url: Union[str, bytes, None], browser_name: str, app: bool = False) -> Optional[str]:
     """ Подготавливает строку для передачи в navigate(), или в конструкторе Browser."""
 
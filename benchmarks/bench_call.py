@@ -0,0 +1,82 @@
+""" Пропускная способность `Connection.call()`.
+
+Поднимает локальный WebSocket-сервер, который мгновенно отвечает на каждую
+команду, и замеряет количество команд в секунду при последовательных и
+конкурентных вызовах. Отдельно сравнивает стоимость самого механизма
+сопоставления ответа с вызовом: очередь на каждый вызов (как было) против
+future на каждый вызов (как стало).
+
+    python benchmarks/bench_call.py [кол-во команд]
+"""
+
+import asyncio
+import json
+import sys
+import time
+
+import websockets
+
+from aio_dt_protocol import Connection
+from aio_dt_protocol.data import Channel
+
+
+async def responder(ws, *_) -> None:
+    async for raw in ws:
+        await ws.send('{"id":%d,"result":{}}' % json.loads(raw)["id"])
+
+
+async def bench_sequential(conn: Connection, n: int) -> float:
+    start = time.perf_counter()
+    for _ in range(n):
+        await conn.call("DOM.getDocument")
+    return n / (time.perf_counter() - start)
+
+
+async def bench_concurrent(conn: Connection, n: int, width: int = 64) -> float:
+    async def worker(count: int) -> None:
+        for _ in range(count):
+            await conn.call("DOM.getDocument")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(n // width) for _ in range(width)))
+    return (n // width * width) / (time.perf_counter() - start)
+
+
+async def bench_channel(n: int) -> float:
+    """ Очередь + Sender/Receiver на каждый вызов. """
+    channel = Channel[dict]()
+    start = time.perf_counter()
+    for i in range(n):
+        sender, receiver = channel()
+        await sender.send({"id": i})
+        await receiver.recv()
+    return n / (time.perf_counter() - start)
+
+
+async def bench_future(n: int) -> float:
+    """ Future на каждый вызов. """
+    loop = asyncio.get_running_loop()
+    start = time.perf_counter()
+    for i in range(n):
+        future = loop.create_future()
+        future.set_result({"id": i})
+        await future
+    return n / (time.perf_counter() - start)
+
+
+async def main(n: int) -> None:
+    print(f"correlation  channel: {await bench_channel(n * 10):>12,.0f} ops/s")
+    print(f"correlation  future:  {await bench_future(n * 10):>12,.0f} ops/s")
+
+    async with websockets.serve(responder, "127.0.0.1", 0) as server:
+        port = server.sockets[0].getsockname()[1]
+        conn = Connection(f"ws://127.0.0.1:{port}/devtools/page/bench", "bench", "",
+                          None, True, False, "chrome")
+        await conn.activate()
+        print(f"call()       sequential: {await bench_sequential(conn, n):>9,.0f} cmd/s")
+        print(f"call()       concurrent: {await bench_concurrent(conn, n):>9,.0f} cmd/s")
+        await conn.disconnect()
+
+
+if __name__ == '__main__':
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000))
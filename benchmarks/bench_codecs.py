@@ -0,0 +1,137 @@
+""" Сравнение кодеков JSON на сообщениях протокола.
+
+Для каждого установленного кодека(json, orjson, msgspec) замеряет декодирование
+из str и из bytes, а также кодирование в str и в bytes. Наборы данных:
+    * dom         — ответ DOM.getDocument(depth=-1) для большой страницы;
+    * screenshot  — ответ Page.captureScreenshot с ~2 МБ base64;
+    * network     — поток событий Network.requestWillBeSent/responseReceived.
+
+Вместо синтетических наборов можно передать каталог с записанными сообщениями:
+каждый файл *.json — одно сообщение, каждая строка файла *.jsonl — одно сообщение.
+Записать их можно, например, колбэком соединения:
+    async def record(msg: dict) -> None:
+        frames.write(json.dumps(msg) + "\\n")
+    browser, conn = await Browser.run(callback=record)
+
+    python benchmarks/bench_codecs.py [каталог с сообщениями]
+"""
+
+import base64
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from aio_dt_protocol.codec import available_codecs
+
+
+def make_dom(nodes: int = 20_000) -> str:
+    counter = iter(range(1, nodes + 1))
+
+    def node(depth: int) -> dict:
+        node_id = next(counter, None)
+        n = {
+            "nodeId": node_id or 0, "backendNodeId": node_id or 0, "nodeType": 1,
+            "nodeName": "DIV", "localName": "div", "nodeValue": "",
+            "attributes": ["class", f"item item-{node_id}", "data-id", str(node_id)],
+            "childNodeCount": 0, "children": [],
+        }
+        if depth < 6 and node_id:
+            n["children"] = [c for c in (node(depth + 1) for _ in range(5)) if c["nodeId"]]
+            n["childNodeCount"] = len(n["children"])
+        return n
+
+    return json.dumps({"id": 1, "result": {"root": node(0)}})
+
+
+def make_screenshot(size: int = 1_500_000) -> str:
+    data = base64.b64encode(random.randbytes(size)).decode()
+    return json.dumps({"id": 2, "result": {"data": data}})
+
+
+def make_network(count: int = 2_000) -> List[str]:
+    frames = []
+    for i in range(count):
+        headers = {f"x-header-{h}": "v" * 40 for h in range(12)}
+        frames.append(json.dumps({
+            "method": "Network.requestWillBeSent",
+            "params": {
+                "requestId": f"1000.{i}", "loaderId": "L1", "documentURL": "https://example.com/",
+                "request": {"url": f"https://example.com/static/{i}.js", "method": "GET",
+                            "headers": headers, "initialPriority": "High", "referrerPolicy": "origin"},
+                "timestamp": 1000.0 + i / 1000, "wallTime": 1.7e9 + i, "type": "Script",
+                "initiator": {"type": "parser", "url": "https://example.com/", "lineNumber": i},
+            },
+            "sessionId": "A1B2C3D4E5F60718293A4B5C6D7E8F90",
+        }))
+        frames.append(json.dumps({
+            "method": "Network.responseReceived",
+            "params": {
+                "requestId": f"1000.{i}", "loaderId": "L1", "timestamp": 1000.5 + i / 1000,
+                "type": "Script",
+                "response": {"url": f"https://example.com/static/{i}.js", "status": 200,
+                             "statusText": "OK", "headers": headers, "mimeType": "text/javascript",
+                             "connectionReused": True, "connectionId": 12, "encodedDataLength": 4096,
+                             "timing": {k: float(n) for n, k in enumerate(
+                                 ("requestTime", "proxyStart", "proxyEnd", "dnsStart", "dnsEnd",
+                                  "connectStart", "connectEnd", "sslStart", "sslEnd", "sendStart",
+                                  "sendEnd", "receiveHeadersEnd"))}},
+            },
+            "sessionId": "A1B2C3D4E5F60718293A4B5C6D7E8F90",
+        }))
+    return frames
+
+
+def load_frames(directory: str) -> Dict[str, List[str]]:
+    datasets: Dict[str, List[str]] = {}
+    for path in sorted(Path(directory).iterdir()):
+        if path.suffix == ".json":
+            datasets.setdefault("captured", []).append(path.read_text(encoding="utf-8"))
+        elif path.suffix == ".jsonl":
+            lines = path.read_text(encoding="utf-8").splitlines()
+            datasets[path.stem] = [line for line in lines if line.strip()]
+    return datasets
+
+
+def measure(function, items: list, size: int, min_time: float = 0.5) -> float:
+    """ Возвращает пропускную способность в МБ/с.
+    :param size:    Размер одного прохода по `items` в JSON, в байтах.
+    """
+    rounds, elapsed = 0, 0.0
+    start = time.perf_counter()
+    while elapsed < min_time:
+        for item in items:
+            function(item)
+        rounds += 1
+        elapsed = time.perf_counter() - start
+    return size * rounds / elapsed / 1e6
+
+
+def main() -> None:
+    if len(sys.argv) > 1:
+        datasets = load_frames(sys.argv[1])
+    else:
+        datasets = {"dom": [make_dom()], "screenshot": [make_screenshot()], "network": make_network()}
+
+    codecs = available_codecs()
+    reference = codecs["json"]
+    print(f"codecs: {', '.join(codecs)}   (MB/s, больше — лучше)")
+
+    for name, frames in datasets.items():
+        as_bytes = [f.encode() for f in frames]
+        objects = [reference.decode(f) for f in frames]
+        size = sum(len(f) for f in as_bytes)
+        print(f"\n{name}: {len(frames)} frame(s), {size / 1e6:.2f} MB")
+        print(f"  {'codec':<9}{'decode str':>12}{'decode bytes':>14}{'encode str':>12}{'encode bytes':>14}")
+        for codec_name, codec in codecs.items():
+            decode_str = measure(codec.decode, frames, size)
+            decode_bytes = measure(codec.decode, as_bytes, size)
+            encode_str = measure(codec.encode, objects, size)
+            encode_bytes = measure(codec.encode_bytes, objects, size)
+            print(f"  {codec_name:<9}{decode_str:>12.1f}{decode_bytes:>14.1f}{encode_str:>12.1f}{encode_bytes:>14.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+""" Сжатие WebSocket(permessage-deflate) на локальном сокете: задержка, трафик, память.
+
+Для каждого набора данных и режима сжатия(без сжатия, "deflate") поднимает
+поддельный сервер протокола и замеряет:
+    * latency   — медиана времени call() для команды с большим ответом, мс;
+    * wire      — байт получено из сокета на один ответ, КБ;
+    * peak      — пик выделенной памяти за один вызов(tracemalloc), МБ;
+    * events/s  — для потока событий: событий в секунду.
+Наборы данных:
+    * dom         — ответ DOM.getDocument(depth=-1), ~20 000 узлов;
+    * screenshot  — ответ Page.captureScreenshot с ~2 МБ base64(почти не сжимается);
+    * network     — поток событий Network.requestWillBeSent.
+
+    python benchmarks/bench_compression.py [кол-во повторов]
+"""
+
+import asyncio
+import base64
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Optional
+
+from aio_dt_protocol import Connection, Serializer, WebSocketOptions
+from aio_dt_protocol.fake_cdp import FakeCDPServer
+
+from bench_codecs import make_dom, make_network
+
+
+async def open_connection(server: FakeCDPServer, compression: Optional[str]) -> Connection:
+    target = server.page
+    conn = Connection(
+        f"ws://{server.host}:{server.ws_port}/devtools/page/{target.id}", target.id, "",
+        None, True, False, "chrome", ws_options=WebSocketOptions(compression=compression))
+    await conn.activate(enable_runtime=False)
+    return conn
+
+
+def count_wire(conn: Connection) -> list:
+    """ Подсчитывает байты, полученные транспортом соединения. """
+    counter = [0]
+    protocol = conn._ws_session
+    data_received = protocol.data_received
+
+    def counting(data: bytes) -> None:
+        counter[0] += len(data)
+        data_received(data)
+
+    protocol.data_received = counting
+    return counter
+
+
+async def bench_response(method: str, result: dict, compression: Optional[str], repeats: int) -> str:
+    async with FakeCDPServer(compression=compression) as server:
+        server.respond(method, result)
+        conn = await open_connection(server, compression)
+        wire = count_wire(conn)
+        await conn.call(method)
+
+        timings = []
+        wire[0] = 0
+        for _ in range(repeats):
+            start = time.perf_counter()
+            await conn.call(method)
+            timings.append(time.perf_counter() - start)
+        per_call = wire[0] / repeats
+
+        tracemalloc.start()
+        await conn.call(method)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        await conn.disconnect()
+    return (f"{statistics.median(timings) * 1000:>10.2f}{per_call / 1024:>12,.0f}"
+            f"{peak / 2 ** 20:>10.1f}{'':>12}")
+
+
+async def bench_events(events: list, compression: Optional[str], repeats: int) -> str:
+    async with FakeCDPServer(compression=compression) as server:
+        conn = await open_connection(server, compression)
+        wire = count_wire(conn)
+        received, done = 0, asyncio.Event()
+
+        async def listener(params: dict, *_) -> None:
+            nonlocal received
+            received += 1
+            if received == len(events) * repeats:
+                done.set()
+
+        await conn.addListenerForEvent("Network.requestWillBeSent", listener)
+        params = [e["params"] for e in events]
+        start = time.perf_counter()
+        for _ in range(repeats):
+            await server.storm("Network.requestWillBeSent", params.__getitem__, len(params),
+                               target_id=server.page.id)
+        await done.wait()
+        rate = received / (time.perf_counter() - start)
+        per_event = wire[0] / received
+        await conn.disconnect()
+    return f"{'':>10}{per_event / 1024:>12,.2f}{'':>10}{rate:>12,.0f}"
+
+
+async def main(repeats: int) -> None:
+    dom = Serializer.decode(make_dom())["result"]
+    screenshot = {"data": base64.b64encode(random.randbytes(1_500_000)).decode()}
+    network = [Serializer.decode(f) for f in make_network(1_000)[::2]]
+
+    print(f"{'dataset':<12}{'compression':<13}{'latency ms':>10}{'wire KB':>12}{'peak MB':>10}{'events/s':>12}")
+    for compression in (None, "deflate"):
+        name = compression or "none"
+        print(f"{'dom':<12}{name:<13}" + await bench_response("DOM.getDocument", dom, compression, repeats))
+        print(f"{'screenshot':<12}{name:<13}" +
+              await bench_response("Page.captureScreenshot", screenshot, compression, repeats))
+        print(f"{'network':<12}{name:<13}" + await bench_events(network, compression, repeats))
+
+
+if __name__ == '__main__':
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 10))
@@ -0,0 +1,69 @@
+""" Стоимость создания `Connection`: время и память на одно соединение.
+
+Домены и расширение создаются при первом обращении, поэтому замеряются три случая:
+    * bare      — соединение, к доменам которого не обращались;
+    * runtime   — обращение только к `conn.Runtime`, как у соединения, которое
+                  лишь выполняет Runtime.evaluate;
+    * all       — обращение ко всем доменам, `extend` и `extend.action`: худший случай,
+                  по памяти равный прежнему созданию всех доменов сразу.
+
+    python benchmarks/bench_construction.py [кол-во соединений]
+"""
+
+import asyncio
+import sys
+import time
+import tracemalloc
+from typing import Callable, List
+
+from aio_dt_protocol import Connection
+
+DOMAINS = (
+    "BackgroundService", "Browser", "CSS", "DeviceOrientation", "DOM", "Emulation", "Fetch", "Input",
+    "Log", "Network", "Overlay", "Page", "Runtime", "SystemInfo", "Target",
+)
+
+
+def make() -> Connection:
+    return Connection("ws://127.0.0.1:9222/devtools/page/X", "X", "", None, True, False, "chrome")
+
+
+def touch_runtime(conn: Connection) -> None:
+    conn.Runtime.context_manager
+
+
+def touch_all(conn: Connection) -> None:
+    for name in DOMAINS:
+        getattr(conn, name)
+    conn.Runtime.context_manager
+    conn.extend.action
+
+
+def measure(touch: Callable[[Connection], None], n: int) -> str:
+    start = time.perf_counter()
+    for _ in range(n):
+        touch(make())
+    per_connection_us = (time.perf_counter() - start) / n * 1e6
+
+    keep: List[Connection] = []
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for _ in range(n):
+        conn = make()
+        touch(conn)
+        keep.append(conn)
+    per_connection_kb = (tracemalloc.get_traced_memory()[0] - before) / n / 1024
+    tracemalloc.stop()
+    return f"{per_connection_us:>12.1f}{per_connection_kb:>14.2f}"
+
+
+async def main(n: int) -> None:
+    print(f"{'case':<10}{'µs / conn':>12}{'KB / conn':>14}")
+    print(f"{'bare':<10}" + measure(lambda conn: None, n))
+    print(f"{'runtime':<10}" + measure(touch_runtime, n))
+    print(f"{'all':<10}" + measure(touch_all, n))
+
+
+if __name__ == '__main__':
+    # ? Connection создаёт asyncio.Event и asyncio.Lock, поэтому нужен цикл событий
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 5_000))
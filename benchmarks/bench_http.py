@@ -0,0 +1,61 @@
+""" Запросы к HTTP-эндпоинтам браузера: make_request() в пуле потоков против HttpClient.
+
+Поддельный сервер протокола с `targets` страницами отвечает на /json/list, а клиент
+запрашивает список target-ов:
+    * executor    — urllib через async_util_call(): поток из пула и новое TCP-подключение
+                    на каждый запрос(как Browser до появления HttpClient);
+    * keep-alive  — HttpClient: подключения открыты и используются повторно.
+Для каждого случая печатается число запросов в секунду при последовательных запросах
+и при `concurrency` одновременных, и медиана задержки последовательного запроса.
+
+    python benchmarks/bench_http.py [кол-во запросов] [кол-во страниц]
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+from typing import Awaitable, Callable
+
+from aio_dt_protocol.fake_cdp import FakeCDPServer
+from aio_dt_protocol.http_client import HttpClient
+from aio_dt_protocol.utils import async_util_call, make_request
+
+Request = Callable[[], Awaitable[str]]
+
+
+async def measure(request: Request, requests: int, concurrency: int = 32) -> str:
+    for _ in range(20):
+        await request()
+
+    samples = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        await request()
+        samples.append(time.perf_counter() - start)
+    sequential = requests / sum(samples)
+
+    start = time.perf_counter()
+    for _ in range(requests // concurrency):
+        await asyncio.gather(*(request() for _ in range(concurrency)))
+    concurrent = requests // concurrency * concurrency / (time.perf_counter() - start)
+    return f"{sequential:>14,.0f}{concurrent:>14,.0f}{statistics.median(samples) * 1e6:>12.0f}"
+
+
+async def main(requests: int, targets: int) -> None:
+    async with FakeCDPServer() as server:
+        for i in range(targets - 1):
+            server.addTarget(f"https://example.com/{i}")
+        url = f"http://127.0.0.1:{server.port}/json/list"
+        client = HttpClient("127.0.0.1", server.port)
+
+        print(f"{'client':<12}{'seq req/s':>14}{'conc req/s':>14}{'p50 µs':>12}")
+        print(f"{'executor':<12}" + await measure(lambda: async_util_call(make_request, url), requests))
+        print(f"{'keep-alive':<12}" + await measure(lambda: client.request("/json/list"), requests))
+        client.close()
+
+
+if __name__ == '__main__':
+    asyncio.run(main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 2_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 20))
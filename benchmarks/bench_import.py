@@ -0,0 +1,84 @@
+""" Время импорта пакета по `python -X importtime`.
+
+Каждый импорт выполняется в новом процессе несколько раз, в результат идёт медиана:
+    * aio_dt_protocol             — только пакет: имена загружаются при первом обращении;
+    * Connection                  — соединение, без модулей доменов;
+    * Connection + Page           — соединение и первое обращение к домену;
+    * Browser                     — браузер, соединение и сеанс.
+Для каждого случая печатается общее время, число загруженных модулей пакета и самые
+дорогие модули(собственное время, без вложенных импортов). С --limit процесс завершается
+с кодом 1, если `import aio_dt_protocol` дольше заданного числа миллисекунд.
+
+    python benchmarks/bench_import.py [--repeats 7] [--top 5] [--limit 10]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+CASES = {
+    "aio_dt_protocol": "import aio_dt_protocol",
+    "Connection": "from aio_dt_protocol import Connection",
+    "Connection + Page": "from aio_dt_protocol import Connection\n"
+                         "Connection('ws://127.0.0.1/devtools/page/X', 'X', '', None, True, False, 'chrome').Page",
+    "Browser": "from aio_dt_protocol import Browser",
+}
+
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_times(code: str) -> Tuple[float, Dict[str, int]]:
+    """ Общее время импортов в мс и собственное время каждого модуля в мкс. """
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, (PACKAGE_ROOT, os.environ.get("PYTHONPATH"))))}
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        env=env, capture_output=True, text=True, check=True).stderr
+
+    total, own = 0, {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[12:].split("|")
+        own[name.strip()] = int(self_us)
+        # ? Модули верхнего уровня не имеют отступа перед именем
+        if not name[1:].startswith(" "):
+            total += int(cumulative_us)
+    return total / 1000, own
+
+
+def measure(code: str, repeats: int) -> Tuple[float, int, List[Tuple[str, float]]]:
+    totals, owns = [], []
+    for _ in range(repeats):
+        total, own = import_times(code)
+        totals.append(total)
+        owns.append(own)
+    package = sum(1 for name in owns[0] if name.split(".")[0] == "aio_dt_protocol")
+    median_own = {name: statistics.median(own.get(name, 0) for own in owns) / 1000 for name in owns[0]}
+    return statistics.median(totals), package, sorted(median_own.items(), key=lambda i: -i[1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeats", type=int, default=7, help="процессов на случай")
+    parser.add_argument("--top", type=int, default=5, help="сколько самых дорогих модулей показать")
+    parser.add_argument("--limit", type=float, help="допустимое время `import aio_dt_protocol`, мс")
+    args = parser.parse_args()
+
+    results = {}
+    print(f"{'case':<20}{'total ms':>10}{'modules':>9}   top modules(own ms)")
+    for case, code in CASES.items():
+        total, package, top = measure(code, args.repeats)
+        results[case] = total
+        print(f"{case:<20}{total:>10.1f}{package:>9}   "
+              + ", ".join(f"{name} {ms:.1f}" for name, ms in top[:args.top]))
+
+    if args.limit is not None and results["aio_dt_protocol"] > args.limit:
+        print(f"\n`import aio_dt_protocol` takes {results['aio_dt_protocol']:.1f} ms, limit {args.limit:.1f} ms")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+""" Доставка вызовов py_call() со страницы: по одному событию на вызов против пакетов.
+
+Поддельный сервер протокола отправляет события `Runtime.bindingCalled` так, как их
+отправила бы страница в каждом режиме, а клиент выполняет привязанную функцию:
+    * single    — событие на каждый вызов(режим по умолчанию);
+    * batch N   — событие на N вызовов(pyCallAddOnload(batch=...), batch_size=N).
+Печатается число выполненных вызовов в секунду и байт, полученных из сокета, на вызов.
+
+    python benchmarks/bench_py_call.py [кол-во вызовов]
+"""
+
+import asyncio
+import json
+import sys
+import time
+
+from aio_dt_protocol import Connection
+from aio_dt_protocol.data import PY_CALL_BATCH_BINDING
+from aio_dt_protocol.fake_cdp import FakeCDPServer
+
+from bench_compression import count_wire
+
+
+async def bench(calls: int, batch_size: int) -> str:
+    async with FakeCDPServer() as server:
+        target = server.page
+        conn = Connection(
+            f"ws://{server.host}:{server.ws_port}/devtools/page/{target.id}", target.id, "",
+            None, True, False, "chrome")
+        await conn.activate(enable_runtime=False)
+        wire = count_wire(conn)
+        received, done = 0, asyncio.Event()
+
+        async def on_scroll(y: int, x: int) -> None:
+            nonlocal received
+            received += 1
+            if received == calls:
+                done.set()
+
+        await conn.bindFunction(on_scroll)
+        if batch_size > 1:
+            await conn.extend.pyCallAddOnload(batch="microtask", batch_size=batch_size)
+            batch = [["on_scroll", [i, 0]] for i in range(batch_size)]
+            params = {"name": PY_CALL_BATCH_BINDING, "payload": json.dumps(batch), "executionContextId": 1}
+            total = calls // batch_size
+        else:
+            params = {"name": "on_scroll", "payload": json.dumps([1, 0]), "executionContextId": 1}
+            total = calls
+
+        wire[0] = 0
+        start = time.perf_counter()
+        await server.storm("Runtime.bindingCalled", params, total, target_id=target.id)
+        await done.wait()
+        elapsed = time.perf_counter() - start
+        await conn.disconnect()
+    return f"{calls / elapsed:>14,.0f}{wire[0] / calls:>14,.1f}"
+
+
+async def main(calls: int) -> None:
+    print(f"{'mode':<12}{'calls/s':>14}{'bytes/call':>14}")
+    print(f"{'single':<12}" + await bench(calls, 1))
+    for batch_size in (16, 64, 256):
+        print(f"{'batch ' + str(batch_size):<12}" + await bench(calls, batch_size))
+
+
+if __name__ == '__main__':
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 51_200))
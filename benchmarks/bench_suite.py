@@ -0,0 +1,233 @@
+""" Набор замеров горячих путей клиента на поддельном сервере протокола.
+
+Каждый замер повторяется несколько раз, в результат идёт медиана:
+    * call.sequential      — команд в секунду, по одной за раз;
+    * call.concurrent      — команд в секунду, 64 конкурентных вызывающих;
+    * events.fanout        — событий в секунду через слушателей `addListenerForEvent`;
+    * events.stream        — событий в секунду через поток `conn.events()`;
+    * dom.getRoot          — секунд на DOM.getRoot(depth=-1) для ~20 000 узлов, с разбором ответа;
+    * dom.node_tree        — секунд на построение дерева `Node` из уже разобранного ответа;
+    * runtime.getProperties — секунд на Runtime.getProperties с 2 000 свойств;
+    * runtime.materialize  — секунд на создание 2 000 `PropertyDescriptor` и `RemoteObject`;
+    * page.screenshot      — секунд на Page.captureScreenshot(~2 МБ) с декодированием base64.
+
+Результаты печатаются таблицей и, при указании --json, сохраняются в файл. С --compare
+сравниваются с ранее сохранёнными: замеры, ухудшившиеся больше чем на --threshold,
+перечисляются, и процесс завершается с кодом 1.
+
+    python benchmarks/bench_suite.py --json results.json
+    python benchmarks/bench_suite.py --compare results.json --threshold 0.15
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from aio_dt_protocol import __version__, Connection, Serializer
+from aio_dt_protocol.domains.dom.dom_element import Node
+from aio_dt_protocol.domains.runtime.types import PropertyDescriptor, RemoteObject
+from aio_dt_protocol.fake_cdp import FakeCDPServer
+
+from bench_codecs import make_dom
+
+
+def make_properties(count: int = 2_000) -> dict:
+    return {"result": [
+        {
+            "name": f"prop{i}", "configurable": True, "enumerable": True, "writable": True, "isOwn": True,
+            "value": {"type": "string", "value": "v" * 32, "description": "v" * 32}
+            if i % 2 else {"type": "object", "className": "Object", "description": "Object",
+                           "objectId": f"{i}.1.{i}"},
+        }
+        for i in range(count)
+    ]}
+
+
+class Suite:
+    """ Собирает результаты замеров. """
+    __slots__ = ("repeats", "results")
+
+    def __init__(self, repeats: int) -> None:
+        self.repeats = repeats
+        self.results: Dict[str, dict] = {}
+
+    async def measure(
+            self, name: str, unit: str,
+            run: Callable[[], Awaitable[float]],
+            higher_is_better: bool) -> None:
+        """ `run` возвращает значение одного прогона в единицах `unit`. """
+        values = [await run() for _ in range(self.repeats)]
+        self.results[name] = {
+            "value": statistics.median(values),
+            "min": min(values),
+            "max": max(values),
+            "unit": unit,
+            "higher_is_better": higher_is_better,
+        }
+        print(f"  {name:<24}{statistics.median(values):>16,.6g} {unit}")
+
+
+def timed(function: Callable[[], object]) -> Callable[[], Awaitable[float]]:
+    """ Синхронная функция -> прогон, возвращающий затраченные секунды. """
+    async def run() -> float:
+        start = time.perf_counter()
+        function()
+        return time.perf_counter() - start
+    return run
+
+
+async def run_suite(calls: int, events: int, repeats: int) -> Dict[str, dict]:
+    suite = Suite(repeats)
+    dom = Serializer.decode(make_dom())["result"]
+    properties = make_properties()
+    screenshot = {"data": base64.b64encode(random.randbytes(1_500_000)).decode()}
+
+    async with FakeCDPServer() as server:
+        server.respond("DOM.getDocument", dom)
+        server.respond("Runtime.getProperties", properties)
+        server.respond("Page.captureScreenshot", screenshot)
+        target = server.page
+        conn = Connection(
+            f"ws://{server.host}:{server.ws_port}/devtools/page/{target.id}", target.id, "",
+            None, True, False, "chrome")
+        await conn.activate()
+
+        async def sequential() -> float:
+            start = time.perf_counter()
+            for _ in range(calls):
+                await conn.call("Network.clearBrowserCache")
+            return calls / (time.perf_counter() - start)
+
+        async def concurrent(width: int = 64) -> float:
+            async def worker() -> None:
+                for _ in range(calls // width):
+                    await conn.call("Network.clearBrowserCache")
+            start = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(width)))
+            return calls // width * width / (time.perf_counter() - start)
+
+        async def fanout(listeners: int = 4) -> float:
+            done = asyncio.Event()
+            expected, received = events * listeners, 0
+
+            def make_listener() -> Callable[..., Awaitable[None]]:
+                async def listener(params: dict, *_) -> None:
+                    nonlocal received
+                    received += 1
+                    if received == expected:
+                        done.set()
+                return listener
+
+            for _ in range(listeners):
+                await conn.addListenerForEvent("Network.dataReceived", make_listener())
+            start = time.perf_counter()
+            await server.storm("Network.dataReceived", {"requestId": "1", "dataLength": 1}, events,
+                               target_id=target.id)
+            await done.wait()
+            elapsed = time.perf_counter() - start
+            conn.removeListenersForEvent("Network.dataReceived")
+            return events / elapsed
+
+        async def stream() -> float:
+            async with conn.events("Network.*") as events_stream:
+                start = time.perf_counter()
+                storm = asyncio.create_task(server.storm(
+                    "Network.dataReceived", {"requestId": "1", "dataLength": 1}, events, target_id=target.id))
+                received = 0
+                async for _ in events_stream:
+                    received += 1
+                    if received == events:
+                        break
+                elapsed = time.perf_counter() - start
+                await storm
+            return events / elapsed
+
+        async def get_root() -> float:
+            start = time.perf_counter()
+            await conn.DOM.getRoot(-1)
+            return time.perf_counter() - start
+
+        async def get_properties() -> float:
+            start = time.perf_counter()
+            await conn.Runtime.getProperties("1.1.1", skip_complex_types=False)
+            return time.perf_counter() - start
+
+        async def capture_screenshot() -> float:
+            start = time.perf_counter()
+            base64.b64decode(await conn.Page.captureScreenshot())
+            return time.perf_counter() - start
+
+        print(f"aio_dt_protocol {__version__}, codec {Serializer.codec.name}, "
+              f"python {platform.python_version()}")
+        await suite.measure("call.sequential", "cmd/s", sequential, True)
+        await suite.measure("call.concurrent", "cmd/s", concurrent, True)
+        await suite.measure("events.fanout", "events/s", fanout, True)
+        await suite.measure("events.stream", "events/s", stream, True)
+        await suite.measure("dom.getRoot", "s", get_root, False)
+        await suite.measure("dom.node_tree", "s", timed(lambda: Node(conn, **dom["root"])), False)
+        await suite.measure("runtime.getProperties", "s", get_properties, False)
+        await suite.measure("runtime.materialize", "s", timed(lambda: [
+            (PropertyDescriptor(**p), RemoteObject(**p["value"])) for p in properties["result"]
+        ]), False)
+        await suite.measure("page.screenshot", "s", capture_screenshot, False)
+        await conn.disconnect()
+
+    return suite.results
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], threshold: float) -> List[str]:
+    """ Замеры, ухудшившиеся относительно `baseline` больше чем на `threshold`. """
+    regressions = []
+    for name, result in results.items():
+        if (base := baseline.get(name)) is None or not base["value"]:
+            continue
+        change = result["value"] / base["value"] - 1
+        if result["higher_is_better"]:
+            change = -change
+        if change > threshold:
+            regressions.append(f"{name}: {base['value']:,.6g} -> {result['value']:,.6g} {result['unit']} "
+                               f"({change:+.1%} worse)")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--json", help="сохранить результаты в файл")
+    parser.add_argument("--compare", help="сравнить с ранее сохранёнными результатами")
+    parser.add_argument("--threshold", type=float, default=0.1, help="допустимое ухудшение, доля (0.1 = 10%%)")
+    parser.add_argument("--calls", type=int, default=10_000, help="команд на прогон")
+    parser.add_argument("--events", type=int, default=20_000, help="событий на прогон")
+    parser.add_argument("--repeats", type=int, default=5, help="прогонов на замер")
+    args = parser.parse_args()
+
+    results = asyncio.run(run_suite(args.calls, args.events, args.repeats))
+    report = {
+        "version": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "codec": Serializer.codec.name,
+        "timestamp": time.time(),
+        "results": results,
+    }
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline: Optional[dict] = json.load(f)
+        if regressions := compare(results, baseline["results"], args.threshold):
+            print("\nRegressions:\n  " + "\n  ".join(regressions))
+            sys.exit(1)
+        print(f"\nNo regressions against {args.compare} (threshold {args.threshold:.0%})")
+
+
+if __name__ == '__main__':
+    main()
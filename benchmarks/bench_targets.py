@@ -0,0 +1,55 @@
+""" Поиск target-а: перебор ответа /json/list против живого индекса(TargetIndex).
+
+Поддельный браузер держит `targets` страниц. Для каждого способа замеряется
+медиана поиска, мкс:
+    * id         — по идентификатору;
+    * url prefix — первая страница, адрес которой начинается с заданного;
+    * title      — вхождение в заголовок.
+Соединение с найденной страницей не открывается: сравнивается только поиск.
+
+    python benchmarks/bench_targets.py [кол-во target-ов]
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+from typing import Awaitable, Callable
+
+from aio_dt_protocol.fake_cdp import FakeCDPServer
+
+
+async def median_us(lookup: Callable[[int], Awaitable[object]], rounds: int = 200) -> float:
+    samples = []
+    for i in range(rounds):
+        start = time.perf_counter()
+        await lookup(i)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1e6
+
+
+async def main(count: int) -> None:
+    async with FakeCDPServer() as server:
+        pages = [server.addTarget(f"https://site{i}.example/path", title=f"Page number {i}") for i in range(count)]
+        browser = server.browser()
+        targets = await browser.getTargetIndex()
+
+        async def scan(predicate: Callable[[dict], bool]) -> dict:
+            return next(p for p in await browser.getConnectionList() if predicate(p))
+
+        async def list_id(i: int): return await scan(lambda p: p["id"] == pages[i % count].id)
+        async def list_url(i: int): return await scan(lambda p: p["url"].startswith(f"https://site{i % count}."))
+        async def list_title(i: int): return await scan(lambda p: f"number {i % count}" in p["title"].lower())
+        async def index_id(i: int): return targets.get(pages[i % count].id)
+        async def index_url(i: int): return targets.find("url", f"https://site{i % count}.", "startswith")[0]
+        async def index_title(i: int): return targets.find("title", f"number {i % count}", "contains")[0]
+
+        print(f"{'lookup':<12}{'id':>12}{'url prefix':>12}{'title':>12}")
+        for name, lookups in (("/json/list", (list_id, list_url, list_title)),
+                              ("TargetIndex", (index_id, index_url, index_title))):
+            print(f"{name:<12}" + "".join([f"{await median_us(lookup):>12.1f}" for lookup in lookups]))
+        await browser.close()
+
+
+if __name__ == '__main__':
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 500))
@@ -0,0 +1,96 @@
+""" Транспорт соединения с браузером: WebSocket против пары каналов(--remote-debugging-pipe).
+
+Поддельный сервер протокола обслуживает соединение с самим браузером через
+WebSocket на локальном сокете и через os.pipe(), как браузер, запущенный с флагом
+--remote-debugging-pipe. Для каждого транспорта замеряются:
+    * rtt        — медиана времени последовательного call(), мкс;
+    * calls/s    — пропускная способность при `concurrency` одновременных вызовах;
+    * events/s   — события в секунду, доставленные слушателю;
+    * screenshot — медиана call() с ответом ~2 МБ, мс.
+
+    python benchmarks/bench_transport.py [кол-во вызовов]
+"""
+
+import asyncio
+import base64
+import os
+import random
+import statistics
+import sys
+import time
+from typing import Optional, Tuple
+
+from aio_dt_protocol import Connection
+from aio_dt_protocol.fake_cdp import FakeCDPServer
+from aio_dt_protocol.pipe import PipeTransport
+
+SCREENSHOT = {"data": base64.b64encode(random.randbytes(1_500_000)).decode()}
+
+
+async def open_connection(server: FakeCDPServer, transport: str) -> Tuple[Connection, Optional[asyncio.Task]]:
+    conn = Connection(server.ws_url, server.browser_id, "", None, True, False, "chrome")
+    if transport == "websocket":
+        await conn.activate(enable_runtime=False)
+        return conn, None
+
+    commands_r, commands_w = os.pipe()
+    messages_r, messages_w = os.pipe()
+    serving = asyncio.create_task(server.servePipe(commands_r, messages_w))
+    await conn.activate(enable_runtime=False, transport=await PipeTransport.open(messages_r, commands_w))
+    return conn, serving
+
+
+async def bench(transport: str, calls: int, concurrency: int = 64) -> str:
+    async with FakeCDPServer() as server:
+        server.respond("Page.captureScreenshot", SCREENSHOT)
+        conn, serving = await open_connection(server, transport)
+        for _ in range(100):
+            await conn.call("Browser.getVersion")
+
+        samples = []
+        for _ in range(calls):
+            start = time.perf_counter()
+            await conn.call("Browser.getVersion")
+            samples.append(time.perf_counter() - start)
+        rtt_us = statistics.median(samples) * 1e6
+
+        start = time.perf_counter()
+        for _ in range(calls // concurrency):
+            await asyncio.gather(*(conn.call("Browser.getVersion") for _ in range(concurrency)))
+        calls_per_s = calls // concurrency * concurrency / (time.perf_counter() - start)
+
+        received, done, total = 0, asyncio.Event(), calls * 4
+
+        async def on_event(params: dict) -> None:
+            nonlocal received
+            received += 1
+            if received == total:
+                done.set()
+
+        await conn.addListenerForEvent("Target.targetInfoChanged", on_event)
+        start = time.perf_counter()
+        await server.storm("Target.targetInfoChanged", {"targetInfo": server.page.targetInfo()}, total)
+        await done.wait()
+        events_per_s = total / (time.perf_counter() - start)
+
+        samples = []
+        for _ in range(20):
+            start = time.perf_counter()
+            await conn.call("Page.captureScreenshot")
+            samples.append(time.perf_counter() - start)
+        screenshot_ms = statistics.median(samples) * 1000
+
+        await conn.disconnect()
+        if serving is not None:
+            await serving
+    return f"{rtt_us:>10.1f}{calls_per_s:>12,.0f}{events_per_s:>12,.0f}{screenshot_ms:>15.2f}"
+
+
+async def main(calls: int) -> None:
+    print(f"{'transport':<12}{'rtt µs':>10}{'calls/s':>12}{'events/s':>12}{'screenshot ms':>15}")
+    for transport in ("websocket", "pipe"):
+        print(f"{transport:<12}" + await bench(transport, calls))
+
+
+if __name__ == '__main__':
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 5_000))
@@ -33,6 +33,10 @@ setup(
     license="BSD 3-Clause",
     packages=PACKAGES,
     install_requires=["websockets>=10.0.0"],
+    extras_require={
+        "orjson": ["orjson"],
+        "msgspec": ["msgspec"],
+    },
 
     classifiers=[
         "License :: OSI Approved :: BSD License",
@@ -0,0 +1,40 @@
+import asyncio
+import os
+import sys
+
+from aio_dt_protocol import Browser
+
+FAKE_BROWSER = """\
+#!{python}
+import sys
+sys.stderr.write("diag line\\n")
+sys.stderr.write("DevTools listening on ws://127.0.0.1:9555/devtools/browser/abc\\n")
+sys.stderr.flush()
+# ? Вывод после строки с адресом: закрытый канал завершил бы процесс с EPIPE
+for i in range(20000):
+    sys.stderr.write(f"late line {{i}}\\n")
+sys.stderr.write("last line\\n")
+"""
+
+
+def test_stderr_is_drained_after_the_endpoint(tmp_path, capsys):
+    script = tmp_path / "fake-browser"
+    script.write_text(FAKE_BROWSER.format(python=sys.executable))
+    os.chmod(script, 0o755)
+
+    async def scenario():
+        browser = Browser(browser_path=str(script), debug_port=0, profile_path="")
+        endpoint = await browser.waitForEndpoint(timeout=5)
+        code = await asyncio.get_running_loop().run_in_executor(None, browser.process.wait, 5)
+        for _ in range(100):
+            if browser.process.stderr.closed:
+                break
+            await asyncio.sleep(0.02)
+        return endpoint, browser.debug_port, code
+
+    endpoint, port, code = asyncio.run(scenario())
+    assert endpoint == "ws://127.0.0.1:9555/devtools/browser/abc"
+    assert port == "9555"
+    assert code == 0
+    err = capsys.readouterr().err
+    assert "diag line" in err and "last line" in err
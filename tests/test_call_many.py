@@ -0,0 +1,101 @@
+import asyncio
+
+from aio_dt_protocol.data import KeyEvents, KeyModifiers
+from aio_dt_protocol.exceptions import CallTimeoutError
+from aio_dt_protocol.fake_cdp import FakeCDPError, FakeCDPServer
+
+
+def test_results_keep_command_order():
+    async def scenario():
+        async with FakeCDPServer() as server:
+            received = []
+
+            def responder(name):
+                def respond(params, target):
+                    received.append((name, params.get("n")))
+                    return {"name": name, "n": params.get("n")}
+                return respond
+
+            # ? Ответ на первую команду приходит последним
+            server.respond("Slow.method", responder("slow"), latency=0.05)
+            server.respond("Fast.method", responder("fast"))
+            conn = await server.browser().getConnection()
+            results = await conn.callMany(
+                ("Slow.method", {"n": 1}), ("Fast.method", {"n": 2}), "Fast.method")
+            await conn.disconnect()
+            return results, received
+
+    results, received = asyncio.run(scenario())
+    assert results == [{"name": "slow", "n": 1}, {"name": "fast", "n": 2}, {"name": "fast", "n": None}]
+    assert received == [("fast", 2), ("fast", None), ("slow", 1)]
+
+
+def test_errors_take_their_place_in_results():
+    async def scenario():
+        async with FakeCDPServer() as server:
+            def fail(params, target):
+                raise FakeCDPError("Command failed")
+
+            server.respond("Bad.method", fail)
+            server.respond("Hang.method", {}, latency=10)
+            conn = await server.browser().getConnection()
+            results = await conn.callMany("A.method", "Bad.method", "Hang.method", "B.method", timeout=0.05)
+            pending = len(conn.responses)
+            await conn.disconnect()
+            return results, pending
+
+    results, pending = asyncio.run(scenario())
+    assert results[0] == {} and results[3] == {}
+    assert isinstance(results[1], Exception) and "Command failed" in str(results[1])
+    assert isinstance(results[2], CallTimeoutError)
+    assert pending == 0
+
+
+def test_pipeline_sends_in_argument_order():
+    async def scenario():
+        async with FakeCDPServer() as server:
+            seen = []
+            server.respond("Input.dispatchMouseEvent", lambda p, t: seen.append(p["type"]) or {})
+
+            def fail(params, target):
+                raise FakeCDPError("No node")
+
+            server.respond("DOM.focus", fail)
+            conn = await server.browser().getConnection()
+            results = await conn.pipeline(
+                conn.Input.dispatchMouseEvent("mousePressed", 1, 1),
+                conn.Input.dispatchMouseEvent("mouseReleased", 1, 1),
+                conn.call("DOM.focus", {"nodeId": 1}),
+                return_exceptions=True
+            )
+            await conn.disconnect()
+            return seen, results
+
+    seen, results = asyncio.run(scenario())
+    assert seen == ["mousePressed", "mouseReleased"]
+    assert isinstance(results[2], Exception)
+
+
+def test_input_sequences_are_strictly_ordered():
+    async def scenario():
+        async with FakeCDPServer() as server:
+            seen = []
+            # ? Случайная задержка не должна переставлять события ввода
+            server.respond("Input.dispatchMouseEvent", lambda p, t: seen.append(p["type"]) or {}, latency=0.01)
+            server.respond("Input.dispatchKeyEvent",
+                           lambda p, t: seen.append((p["type"], p.get("key"), p["modifiers"])) or {})
+            conn = await server.browser().getConnection()
+            action = conn.extend.action
+            await action.mouseMoveToCoordinatesAndClick(1, 2)
+            await action.sendKeyEvent(KeyEvents.enter, KeyModifiers.ctrl)
+            await action.backspaceText(2)
+            await conn.disconnect()
+            return seen
+
+    seen = asyncio.run(scenario())
+    assert seen == [
+        "mouseMoved", "mousePressed", "mouseReleased",
+        ("keyDown", "Enter", KeyModifiers.ctrl.value), ("keyUp", "Enter", KeyModifiers.ctrl.value),
+        ("keyDown", "Backspace", 0), ("keyUp", "Backspace", 0),
+        ("keyDown", "Backspace", 0), ("keyUp", "Backspace", 0),
+    ]
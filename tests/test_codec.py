@@ -0,0 +1,46 @@
+import asyncio
+
+import pytest
+
+from aio_dt_protocol.codec import available_codecs
+from aio_dt_protocol.data import Serializer
+from aio_dt_protocol.fake_cdp import FakeCDPServer
+
+MESSAGE = {"id": 1, "method": "Runtime.evaluate", "params": {"expression": "'тест'"}}
+
+
+@pytest.mark.parametrize("codec", list(available_codecs().values()), ids=lambda c: c.name)
+def test_codecs_agree(codec):
+    assert codec.decode(codec.encode(MESSAGE)) == MESSAGE
+    assert codec.decode(codec.encode_bytes(MESSAGE)) == MESSAGE
+    assert codec.encode_bytes(MESSAGE) == codec.encode(MESSAGE).encode()
+
+
+def test_pack_follows_transport():
+    assert type(Serializer.pack(MESSAGE)) is str
+    assert type(Serializer.pack(MESSAGE, as_bytes=True)) is bytes
+
+
+def test_replaced_encode_is_used(monkeypatch):
+    monkeypatch.setattr(Serializer, "encode", lambda obj: "custom")
+    assert Serializer.pack(MESSAGE, as_bytes=True) == "custom"
+
+
+def test_websocket_sends_text_frames():
+    async def scenario():
+        async with FakeCDPServer() as server:
+            conn = await server.browser().getConnection()
+            frames = []
+            send = conn._ws_session.send
+
+            async def spy(data, *args, **kwargs):
+                frames.append(data)
+                await send(data, *args, **kwargs)
+
+            conn._ws_session.send = spy
+            await conn.call("Runtime.evaluate", {"expression": "'тест'"})
+            await conn.disconnect()
+            return frames
+
+    frames = asyncio.run(scenario())
+    assert frames and all(type(frame) is str for frame in frames)
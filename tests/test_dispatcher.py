@@ -0,0 +1,196 @@
+import asyncio
+
+import pytest
+
+from aio_dt_protocol.connection import Connection
+from aio_dt_protocol.dispatcher import EventDispatcher
+from aio_dt_protocol.fake_cdp import FakeCDPServer
+
+KEY = (None, "Network.dataReceived")
+
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError):
+        EventDispatcher(overflow="nope")
+    with pytest.raises(ValueError):
+        EventDispatcher().setPolicy("Page.frameNavigated", "nope")
+
+
+def test_block_waits_for_space_and_keeps_order():
+    async def scenario():
+        dispatcher = EventDispatcher(workers=1, high_water=2, overflow="block")
+        gate, got = asyncio.Event(), []
+
+        async def handler(i):
+            await gate.wait()
+            got.append(i)
+
+        for i in range(3):
+            await dispatcher.put(KEY, handler, (i,))
+        await asyncio.sleep(0)
+        # ? Воркер занят первым событием, в очереди — порог из двух
+        blocked = asyncio.ensure_future(dispatcher.put(KEY, handler, (3,)))
+        await asyncio.sleep(0.01)
+        assert not blocked.done()
+
+        gate.set()
+        await asyncio.wait_for(blocked, 1)
+        await asyncio.sleep(0.01)
+        dispatcher.close()
+        return got
+
+    assert asyncio.run(scenario()) == [0, 1, 2, 3]
+
+
+def test_drop_oldest_keeps_newest():
+    async def scenario():
+        dispatcher = EventDispatcher(workers=1, high_water=2, overflow="drop_oldest")
+        got = []
+
+        async def handler(i):
+            got.append(i)
+
+        for i in range(5):
+            await dispatcher.put(KEY, handler, (i,))
+        await asyncio.sleep(0.01)
+        dispatcher.close()
+        return got, dispatcher.dropped
+
+    assert asyncio.run(scenario()) == ([3, 4], 3)
+
+
+def test_coalesce_keeps_latest_state():
+    async def scenario():
+        dispatcher = EventDispatcher(workers=1, high_water=2, overflow="coalesce")
+        got = []
+
+        async def handler(i):
+            got.append(i)
+
+        for i in range(5):
+            await dispatcher.put(KEY, handler, (i,))
+        await asyncio.sleep(0.01)
+        dispatcher.close()
+        return got, dispatcher.coalesced
+
+    assert asyncio.run(scenario()) == ([4], 4)
+
+
+def test_policy_per_event_overrides_default():
+    async def scenario():
+        dispatcher = EventDispatcher(workers=1, high_water=100)
+        dispatcher.setPolicy("Page.frameNavigated", "drop_oldest", 1)
+        got = []
+
+        async def handler(event, i):
+            got.append((event, i))
+
+        for i in range(3):
+            await dispatcher.put((None, "Page.frameNavigated"), handler, ("nav", i))
+            await dispatcher.put(KEY, handler, ("data", i))
+        await asyncio.sleep(0.01)
+        dispatcher.close()
+        return got
+
+    got = asyncio.run(scenario())
+    assert [i for event, i in got if event == "nav"] == [2]
+    assert [i for event, i in got if event == "data"] == [0, 1, 2]
+
+
+def test_worker_survives_listener_cancelled_error():
+    async def scenario():
+        dispatcher = EventDispatcher(workers=1, high_water=2)
+        got = []
+
+        async def cancelled(_):
+            raise asyncio.CancelledError()
+
+        async def failing(_):
+            raise ValueError("listener error")
+
+        async def handler(i):
+            got.append(i)
+
+        await dispatcher.put(KEY, cancelled, (None,))
+        await dispatcher.put(KEY, failing, (None,))
+        for i in range(5):
+            await asyncio.wait_for(dispatcher.put(KEY, handler, (i,)), 1)
+        await asyncio.sleep(0.01)
+        workers = dispatcher.stats()["workers"]
+        dispatcher.close()
+        return got, workers
+
+    assert asyncio.run(scenario()) == ([0, 1, 2, 3, 4], 1)
+
+
+def test_close_cancels_workers():
+    async def scenario():
+        dispatcher = EventDispatcher(workers=2)
+
+        async def slow(_):
+            await asyncio.sleep(10)
+
+        await dispatcher.put(KEY, slow, (None,))
+        await asyncio.sleep(0)
+        tasks = list(dispatcher._tasks)
+        dispatcher.close()
+        await asyncio.sleep(0.01)
+        return tasks, dispatcher.depth()
+
+    tasks, depth = asyncio.run(scenario())
+    assert all(task.cancelled() for task in tasks)
+    assert depth == 0
+
+
+def test_listeners_receive_storm_in_order():
+    async def scenario():
+        async with FakeCDPServer() as server:
+            conn = await server.browser().getConnection()
+            got = []
+
+            async def listener(params):
+                got.append(params["i"])
+
+            await conn.addListenerForEvent("Network.dataReceived", listener)
+            for i in range(200):
+                await server.emit("Network.dataReceived", {"i": i}, target_id=conn.conn_id)
+            await asyncio.sleep(0.1)
+            await conn.disconnect()
+            return got
+
+    assert asyncio.run(scenario()) == list(range(200))
+
+
+def test_shared_dispatcher_outlives_a_detached_connection():
+    async def scenario():
+        async with FakeCDPServer() as server:
+            other = server.addTarget("https://example.com/")
+            dispatcher = EventDispatcher()
+            # ? Оба соединения доставляют события через один диспетчер
+            first, second = (
+                Connection(f"ws://{server.host}:{server.ws_port}/devtools/page/{target_id}", target_id,
+                           "", None, True, False, "chrome", dispatcher)
+                for target_id in (server.page.id, other.id)
+            )
+            await first.activate()
+            await second.activate()
+            gate, got = asyncio.Event(), []
+
+            async def listener(params):
+                await gate.wait()
+                got.append(params["n"])
+
+            await second.addListenerForEvent("Log.entryAdded", listener)
+            for n in (1, 2):
+                await server.emit("Log.entryAdded", {"n": n}, target_id=other.id)
+            await asyncio.sleep(0.05)
+            # ? Первое событие ещё обрабатывается, второе ждёт в очереди
+            await first.disconnect()
+            await asyncio.wait_for(first.waitForClose(), 1)
+            gate.set()
+            await asyncio.sleep(0.05)
+            await second.disconnect()
+            dispatcher.close()
+            return got
+
+    assert asyncio.run(scenario()) == [1, 2]
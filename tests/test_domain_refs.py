@@ -0,0 +1,85 @@
+import asyncio
+
+from aio_dt_protocol.fake_cdp import FakeCDPServer
+
+
+async def listener(params):
+    pass
+
+
+async def other_listener(params):
+    pass
+
+
+def test_listeners_enable_and_release_domain():
+    async def scenario():
+        async with FakeCDPServer() as server:
+            conn = await server.browser().getConnection()
+            await conn.addListenerForEvent("Network.requestWillBeSent", listener)
+            await conn.addListenerForEvent("Network.responseReceived", other_listener)
+            assert conn.Network.enabled and server.received["Network.enable"] == 1
+
+            conn.removeListenerForEvent("Network.requestWillBeSent", listener)
+            await asyncio.sleep(0.01)
+            assert conn.Network.enabled and "Network.disable" not in server.received
+
+            conn.removeListenerForEvent("Network.responseReceived", other_listener)
+            await asyncio.sleep(0.01)
+            assert not conn.Network.enabled and server.received["Network.disable"] == 1
+            assert "Network" not in conn._domain_refs
+
+            await conn.addListenerForEvent("CSS.styleSheetAdded", listener)
+            await conn.addListenerForEvent("CSS.styleSheetAdded", other_listener)
+            conn.removeListenersForEvent("CSS.styleSheetAdded")
+            await asyncio.sleep(0.01)
+            assert not conn.CSS.enabled and server.received["CSS.disable"] == 1
+            await conn.disconnect()
+
+    asyncio.run(scenario())
+
+
+def test_manually_enabled_domain_stays_enabled():
+    async def scenario():
+        async with FakeCDPServer() as server:
+            conn = await server.browser().getConnection()
+            await conn.Page.enable()
+            await conn.addListenerForEvent("Page.loadEventFired", listener)
+            conn.removeListenerForEvent("Page.loadEventFired", listener)
+            await asyncio.sleep(0.01)
+            assert conn.Page.enabled and "Page.disable" not in server.received
+
+            # ? DOM не выключается никогда: его выключение сбрасывает идентификаторы узлов
+            await conn.addListenerForEvent("DOM.setChildNodes", listener)
+            conn.removeListenerForEvent("DOM.setChildNodes", listener)
+            await asyncio.sleep(0.01)
+            assert conn.DOM.enabled and "DOM.disable" not in server.received
+            await conn.disconnect()
+
+    asyncio.run(scenario())
+
+
+def test_retain_and_release_domain():
+    async def scenario():
+        async with FakeCDPServer() as server:
+            conn = await server.browser().getConnection()
+            await asyncio.gather(conn.retainDomain("Log"), conn.retainDomain("Log"))
+            assert server.received["Log.enable"] == 1
+            await conn.releaseDomain("Log")
+            assert conn.Log.enabled
+            await conn.releaseDomain("Log")
+            assert not conn.Log.enabled and server.received["Log.disable"] == 1
+            # ? Лишнее освобождение ничего не меняет
+            await conn.releaseDomain("Log")
+            assert server.received["Log.disable"] == 1
+
+            # ? Быстрые подписка и отписка не оставляют домен включённым
+            await conn.addListenerForEvent("Overlay.inspectNodeRequested", listener)
+            conn.removeListenerForEvent("Overlay.inspectNodeRequested", listener)
+            await conn.addListenerForEvent("Overlay.inspectNodeRequested", listener)
+            conn.removeListenerForEvent("Overlay.inspectNodeRequested", listener)
+            await asyncio.sleep(0.01)
+            assert not conn.Overlay.enabled
+            await conn.disconnect()
+
+    asyncio.run(scenario())
+
@@ -0,0 +1,94 @@
+import asyncio
+
+from aio_dt_protocol.fake_cdp import FakeCDPServer
+
+
+async def take(stream, n):
+    return [await stream.__anext__() for _ in range(n)]
+
+
+def test_stream_receives_matching_events_and_retains_domain():
+    async def scenario():
+        async with FakeCDPServer() as server:
+            conn = await server.browser().getConnection()
+            async with conn.events("Network.*", "Page.loadEventFired", maxsize=100) as stream:
+                assert server.received.get("Network.enable") == 1
+                await server.emit("Log.entryAdded", {}, target_id=conn.conn_id)
+                await server.storm("Network.dataReceived", {"requestId": "1"}, 500, target_id=conn.conn_id)
+                await server.emit("Page.loadEventFired", {}, target_id=conn.conn_id)
+                events = await take(stream, 501)
+            await asyncio.sleep(0.05)
+            assert server.received.get("Network.disable") == 1
+            assert conn._streams == []
+            await conn.disconnect()
+            return events
+
+    events = asyncio.run(scenario())
+    assert [e.method for e in events] == ["Network.dataReceived"] * 500 + ["Page.loadEventFired"]
+
+
+def test_stream_drop_oldest():
+    async def scenario():
+        async with FakeCDPServer() as server:
+            conn = await server.browser().getConnection()
+            stream = conn.events("Network.dataReceived", maxsize=10, overflow="drop_oldest")
+            await stream.ready()
+            for i in range(25):
+                await server.emit("Network.dataReceived", {"i": i}, target_id=conn.conn_id)
+            await asyncio.sleep(0.05)
+            result = [e.params["i"] for e in await take(stream, stream.qsize())], stream.dropped
+            stream.close()
+            await conn.disconnect()
+            return result
+
+    assert asyncio.run(scenario()) == (list(range(15, 25)), 15)
+
+
+def test_stream_coalesce_replaces_same_event():
+    async def scenario():
+        async with FakeCDPServer() as server:
+            conn = await server.browser().getConnection()
+            stream = conn.events("Network.dataReceived", "Network.loadingFinished", maxsize=3, overflow="coalesce")
+            await stream.ready()
+            # ? Четвёртое событие вытесняет из заполненного буфера три предыдущих
+            for i in range(5):
+                await server.emit("Network.dataReceived", {"i": i}, target_id=conn.conn_id)
+            await server.emit("Network.loadingFinished", {}, target_id=conn.conn_id)
+            await asyncio.sleep(0.05)
+            events = await take(stream, stream.qsize())
+            stream.close()
+            await conn.disconnect()
+            return [(e.method, e.params.get("i")) for e in events]
+
+    assert asyncio.run(scenario()) == [
+        ("Network.dataReceived", 3), ("Network.dataReceived", 4), ("Network.loadingFinished", None)
+    ]
+
+
+def test_stream_drains_buffer_after_detach():
+    async def scenario():
+        async with FakeCDPServer() as server:
+            conn = await server.browser().getConnection()
+            stream = conn.events("*")
+            await server.emit("Log.entryAdded", {"x": 1}, target_id=conn.conn_id)
+            await asyncio.sleep(0.05)
+            await conn.disconnect()
+            return [e.method async for e in stream], stream.closed
+
+    assert asyncio.run(scenario()) == (["Log.entryAdded"], True)
+
+
+def test_closed_stream_stops_iteration():
+    async def scenario():
+        async with FakeCDPServer() as server:
+            conn = await server.browser().getConnection()
+            stream = conn.events("Network.*")
+            await stream.ready()
+            await server.emit("Network.dataReceived", {}, target_id=conn.conn_id)
+            await asyncio.sleep(0.05)
+            stream.close()
+            events = [e async for e in stream]
+            await conn.disconnect()
+            return events
+
+    assert asyncio.run(scenario()) == []
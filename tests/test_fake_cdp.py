@@ -0,0 +1,147 @@
+import asyncio
+import json
+
+import pytest
+
+from aio_dt_protocol.fake_cdp import FakeCDPError, FakeCDPServer
+
+
+def test_http_endpoints():
+    async def scenario():
+        async with FakeCDPServer() as server:
+            browser = server.browser()
+            version = await browser.getVersion()
+            assert version["webSocketDebuggerUrl"] == server.ws_url
+
+            listed = await browser.getConnectionList()
+            assert [t["id"] for t in listed] == [server.page.id]
+            assert listed[0]["webSocketDebuggerUrl"].endswith(f"/devtools/page/{server.page.id}")
+
+            tab = await browser.newTab("https://example.com/")
+            assert tab.conn_id in server.targets
+            assert server.targets[tab.conn_id].url == "https://example.com/"
+            assert await browser.activateTarget(tab.conn_id) == "Target activated"
+            assert await browser.closeTarget(tab.conn_id) == "Target is closing"
+            await asyncio.wait_for(tab.waitForClose(), 1)
+            assert (await browser.closeTarget("missing")).startswith("404")
+            await browser.close()
+
+    asyncio.run(scenario())
+
+
+def test_responders_are_used_in_order():
+    async def scenario():
+        async with FakeCDPServer() as server:
+            conn = await server.browser().getConnection()
+            server.respond("DOM.getDocument", {"root": {"nodeId": 1}}, {"root": {"nodeId": 2}})
+            server.respond("Runtime.callFunctionOn", lambda params, target: {"target": target.id, **params})
+
+            documents = [(await conn.call("DOM.getDocument"))["root"]["nodeId"] for _ in range(3)]
+            called = await conn.call("Runtime.callFunctionOn", {"objectId": "1"})
+
+            def fail(params, target):
+                raise FakeCDPError("Evaluation failed")
+
+            server.respond("Runtime.evaluate", fail)
+            with pytest.raises(Exception, match="Evaluation failed"):
+                await conn.call("Runtime.evaluate", {"expression": "1"})
+            received = dict(server.received)
+            await conn.disconnect()
+            return documents, called, received
+
+    documents, called, received = asyncio.run(scenario())
+    # ? Последний ответ повторяется
+    assert documents == [1, 2, 2]
+    assert called["objectId"] == "1" and called["target"]
+    assert received["DOM.getDocument"] == 3
+
+
+def test_strict_mode_rejects_unknown_commands():
+    async def scenario():
+        async with FakeCDPServer(strict=True) as server:
+            server.respond("Runtime.enable", {})
+            conn = await server.browser().getConnection()
+            with pytest.raises(Exception, match="wasn't found"):
+                await conn.call("Unknown.method")
+            await conn.disconnect()
+
+    asyncio.run(scenario())
+
+
+def test_latency_per_method():
+    async def scenario():
+        async with FakeCDPServer() as server:
+            conn = await server.browser().getConnection()
+            server.respond("Slow.method", {}, latency=0.1)
+            slow = asyncio.ensure_future(conn.call("Slow.method"))
+            await conn.call("Fast.method")
+            # ? Ответ на быструю команду не ждёт медленную
+            assert not slow.done()
+            await asyncio.wait_for(slow, 1)
+            await conn.disconnect()
+
+    asyncio.run(scenario())
+
+
+def test_navigate_emits_load_events():
+    async def scenario():
+        async with FakeCDPServer(navigation_time=0.01) as server:
+            conn = await server.browser().getConnection()
+            stream = conn.events("Page.*")
+            await stream.ready()
+            await conn.call("Page.navigate", {"url": "https://example.com/"})
+            methods = []
+            async for event in stream:
+                methods.append(event.method)
+                if event.method == "Page.frameStoppedLoading":
+                    break
+            stream.close()
+            await conn.disconnect()
+            return methods, server.page.url
+
+    methods, url = asyncio.run(scenario())
+    assert methods[0] == "Page.frameStartedLoading" and "Page.loadEventFired" in methods
+    assert url == "https://example.com/"
+
+
+def test_recording_and_storm(tmp_path):
+    recording = tmp_path / "session.jsonl"
+    recording.write_text("\n".join(json.dumps(m) for m in (
+        {"id": 1, "method": "Page.getFrameTree", "result": {"frameTree": {"frame": {"id": "F"}}}},
+        {"method": "Log.entryAdded", "params": {"entry": {"text": "hi"}}},
+    )), encoding="utf-8")
+
+    async def scenario():
+        async with FakeCDPServer() as server:
+            events = server.loadRecording(recording)
+            conn = await server.browser().getConnection()
+            tree = await conn.call("Page.getFrameTree")
+            got = []
+
+            async def listener(params):
+                got.append(params)
+
+            await conn.addListenerForEvent("Log.entryAdded", listener)
+            await server.storm(events[0]["method"], lambda i: {"i": i}, 50, target_id=conn.conn_id)
+            await asyncio.sleep(0.05)
+            await conn.disconnect()
+            return tree, got
+
+    tree, got = asyncio.run(scenario())
+    assert tree["frameTree"]["frame"]["id"] == "F"
+    assert got == [{"i": i} for i in range(50)]
+
+
+def test_unknown_session_is_an_error():
+    async def scenario():
+        async with FakeCDPServer() as server:
+            browser = server.browser()
+            root = await browser.getBrowserConnection()
+            session = await browser.getSessionByID(server.page.id)
+            await root.call("Target.detachFromTarget", {"sessionId": session.session_id})
+            await asyncio.sleep(0.01)
+            with pytest.raises(Exception):
+                await session.call("Runtime.evaluate", {"expression": "1"})
+            await browser.close()
+
+    asyncio.run(scenario())
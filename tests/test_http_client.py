@@ -0,0 +1,119 @@
+import asyncio
+
+from aio_dt_protocol.http_client import HttpClient
+
+
+class FakeHttpServer:
+    """ HTTP-сервер, отвечающий по пути запроса; считает подключения. """
+
+    def __init__(self) -> None:
+        self.connections = 0
+        self.active = 0
+        self.peak = 0
+        self.requests = []
+        self._server = None
+
+    async def __aenter__(self) -> "FakeHttpServer":
+        self._server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    return
+                method, path, _ = head.split(b"\r\n", 1)[0].decode().split(" ")
+                self.requests.append((method, path))
+                self.active += 1
+                self.peak = max(self.peak, self.active)
+                try:
+                    if path == "/slow":
+                        await asyncio.sleep(0.05)
+                    if path == "/chunked":
+                        writer.write(b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n"
+                                     b"2\r\nhe\r\n3;ext=1\r\nllo\r\n0\r\nX-Trailer: 1\r\n\r\n")
+                    elif path == "/close":
+                        writer.write(b"HTTP/1.1 200 OK\r\nConnection: close\r\n\r\nbye")
+                        await writer.drain()
+                        return
+                    elif path == "/missing":
+                        writer.write(b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\n\r\n")
+                    else:
+                        body = path.encode()
+                        writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body))
+                    await writer.drain()
+                finally:
+                    self.active -= 1
+                # ? Сервер закрывает простаивающее подключение, не предупредив клиента
+                if path == "/drop":
+                    return
+        finally:
+            writer.close()
+
+
+def test_connection_is_kept_alive():
+    async def scenario():
+        async with FakeHttpServer() as server:
+            client = HttpClient(port=server.port)
+            bodies = [await client.request(f"/json/{i}") for i in range(3)]
+            bodies.append(await client.request("/chunked"))
+            bodies.append(await client.request("/json/new?about:blank", "PUT"))
+            idle = len(client._idle)
+            client.close()
+            return bodies, server.connections, idle, server.requests[-1]
+
+    bodies, connections, idle, last = asyncio.run(scenario())
+    assert bodies == ["/json/0", "/json/1", "/json/2", "hello", "/json/new?about:blank"]
+    assert connections == 1
+    assert idle == 1
+    assert last == ("PUT", "/json/new?about:blank")
+
+
+def test_request_is_retried_when_idle_connection_was_closed():
+    async def scenario():
+        async with FakeHttpServer() as server:
+            client = HttpClient(port=server.port)
+            first = await client.request("/drop")
+            await asyncio.sleep(0.05)
+            second = await client.request("/json/version")
+            client.close()
+            return first, second, server.connections
+
+    first, second, connections = asyncio.run(scenario())
+    assert (first, second) == ("/drop", "/json/version")
+    assert connections == 2
+
+
+def test_close_delimited_body_and_error_status():
+    async def scenario():
+        async with FakeHttpServer() as server:
+            client = HttpClient(port=server.port)
+            body = await client.request("/close")
+            idle = len(client._idle)
+            missing = await client.request("/missing")
+            client.close()
+            return body, idle, missing
+
+    assert asyncio.run(scenario()) == ("bye", 0, "404: Not Found")
+
+
+def test_connections_are_limited():
+    async def scenario():
+        async with FakeHttpServer() as server:
+            client = HttpClient(port=server.port, max_connections=2)
+            bodies = await asyncio.gather(*(client.request("/slow") for _ in range(6)))
+            client.close()
+            return bodies, server.connections, server.peak
+
+    bodies, connections, peak = asyncio.run(scenario())
+    assert bodies == ["/slow"] * 6
+    assert connections == 2
+    assert peak == 2
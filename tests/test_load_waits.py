@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+
+from aio_dt_protocol.domains.dom.dom_element import Node
+from aio_dt_protocol.exceptions import EventTimeoutError
+from aio_dt_protocol.fake_cdp import FakeCDPServer
+
+
+def test_get_child_nodes_fills_children():
+    async def scenario():
+        async with FakeCDPServer() as server:
+            conn = await server.browser().getConnection()
+            node = Node(conn, 5)
+            event = await node.getChildNodes()
+            await server.emit("DOM.setChildNodes", {"parentId": 5, "nodes": [
+                {"nodeId": 6, "nodeName": "DIV"}, {"nodeId": 7, "nodeName": "#text"}
+            ]}, target_id=conn.conn_id)
+            await asyncio.wait_for(event.wait(), 1)
+            await conn.disconnect()
+            return node.children
+
+    children = asyncio.run(scenario())
+    assert [(c.nodeId, c.nodeName) for c in children] == [(6, "DIV"), (7, "#text")]
+
+
+def test_get_child_nodes_timeout_drops_the_waiter():
+    async def scenario():
+        async with FakeCDPServer() as server:
+            conn = await server.browser().getConnection()
+            node = Node(conn, 5)
+            event = await node.getChildNodes(timeout=0.05)
+            await asyncio.sleep(0.15)
+            waiters = conn._event_waiters.get("DOM.setChildNodes")
+            await conn.disconnect()
+            return event.is_set(), node.children, waiters
+
+    is_set, children, waiters = asyncio.run(scenario())
+    assert not is_set
+    assert children is None
+    assert not waiters
+
+
+def test_navigate_waits_for_load():
+    async def scenario():
+        async with FakeCDPServer(navigation_time=0.05) as server:
+            conn = await server.browser().getConnection()
+            await asyncio.wait_for(conn.Page.navigate("https://example.com/", timeout=1), 2)
+            await conn.disconnect()
+            return conn.Page.loading_state.is_set()
+
+    assert asyncio.run(scenario())
+
+
+def test_navigate_load_timeout():
+    async def scenario():
+        async with FakeCDPServer(navigation_time=5) as server:
+            conn = await server.browser().getConnection()
+            with pytest.raises(EventTimeoutError):
+                await conn.Page.navigate("https://example.com/", timeout=0.05)
+            waiters = conn._event_waiters.get("Page.frameStoppedLoading")
+            await conn.disconnect()
+            return waiters
+
+    assert not asyncio.run(scenario())
@@ -0,0 +1,75 @@
+import asyncio
+
+from aio_dt_protocol.fake_cdp import FakeCDPError, FakeCDPServer
+from aio_dt_protocol.metrics import LatencyHistogram
+
+
+def test_histogram_percentiles():
+    histogram = LatencyHistogram()
+    for ms in range(1, 101):
+        histogram.record(ms / 1000)
+    assert histogram.count == 100 and histogram.max == 0.1
+    # ? Погрешность корзин — не больше 10%
+    assert 0.05 <= histogram.percentile(50) <= 0.055
+    assert 0.099 <= histogram.percentile(99) <= 0.1
+    assert LatencyHistogram().percentile(50) == 0.0
+
+
+def test_calls_traffic_and_events_are_counted():
+    async def scenario():
+        async with FakeCDPServer() as server:
+            def fail(params, target):
+                raise FakeCDPError("Command failed")
+
+            server.respond("Bad.method", fail)
+            server.respond("Slow.method", {}, latency=0.02)
+            conn = await server.browser().getConnection()
+            metrics = conn.enableMetrics()
+
+            await asyncio.gather(*(conn.call("Slow.method") for _ in range(5)))
+            try:
+                await conn.call("Bad.method")
+            except Exception:
+                pass
+            await conn.callMany("A.method", "A.method")
+            await server.storm("Network.dataReceived", {"requestId": "1"}, 10, target_id=conn.conn_id)
+            await asyncio.sleep(0.05)
+            snapshot = metrics.snapshot()
+            await conn.disconnect()
+            return snapshot
+
+    snapshot = asyncio.run(scenario())
+    calls = snapshot["calls"]
+    assert calls["Slow.method"]["count"] == 5 and calls["Slow.method"]["errors"] == 0
+    assert calls["Slow.method"]["p50"] >= 0.015
+    assert calls["Bad.method"] == {**calls["Bad.method"], "count": 1, "errors": 1}
+    assert calls["A.method"]["count"] == 2
+    assert snapshot["in_flight"] == 0 and snapshot["in_flight_peak"] == 5
+    assert snapshot["frames_sent"] == 8 and snapshot["bytes_sent"] > 0
+    assert snapshot["frames_received"] >= 18
+    assert snapshot["events"]["Network.dataReceived"]["count"] == 10
+
+
+def test_export_and_disable():
+    async def scenario():
+        async with FakeCDPServer() as server:
+            conn = await server.browser().getConnection()
+            snapshots = []
+
+            async def exporter(snapshot):
+                snapshots.append(snapshot)
+
+            conn.enableMetrics(exporter, interval=0.01)
+            await conn.call("A.method")
+            await asyncio.sleep(0.05)
+            conn.disableMetrics()
+            exported = len(snapshots)
+            await asyncio.sleep(0.03)
+            await conn.call("A.method")
+            assert conn.metrics is None
+            await conn.disconnect()
+            return snapshots, exported
+
+    snapshots, exported = asyncio.run(scenario())
+    assert exported >= 2 and len(snapshots) == exported
+    assert snapshots[-1]["calls"]["A.method"]["count"] == 1
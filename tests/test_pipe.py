@@ -0,0 +1,162 @@
+import asyncio
+import os
+import sys
+
+import pytest
+from websockets.exceptions import ConnectionClosed
+
+from aio_dt_protocol.connection import Connection
+from aio_dt_protocol.fake_cdp import FakeCDPServer
+from aio_dt_protocol.pipe import PipeTransport
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="Pipe transport is POSIX only")
+
+
+async def read_exactly(fd: int, size: int) -> bytes:
+    """ Читает из канала, не блокируя цикл событий. """
+    os.set_blocking(fd, False)
+    data = b""
+    while len(data) < size:
+        try:
+            data += os.read(fd, 65536)
+        except BlockingIOError:
+            await asyncio.sleep(0)
+    return data
+
+
+def test_messages_are_split_on_nul():
+    async def scenario():
+        in_r, in_w = os.pipe()
+        out_r, out_w = os.pipe()
+        transport = await PipeTransport.open(in_r, out_w)
+        # ? Сообщение, разорванное между двумя записями, собирается целиком
+        os.write(in_w, b'{"id":1}\0{"id"')
+        os.write(in_w, b':2}\0')
+        received = [await transport.recv(), await transport.recv()]
+
+        await transport.send('{"id":3}')
+        await transport.send(b'{"id":4}')
+        sent = await read_exactly(out_r, 18)
+
+        os.close(in_w)
+        with pytest.raises(ConnectionClosed):
+            await transport.recv()
+        assert transport.closed
+        with pytest.raises(ConnectionClosed):
+            await transport.send("{}")
+        os.close(out_r)
+        return received, sent
+
+    assert asyncio.run(scenario()) == ([b'{"id":1}', b'{"id":2}'], b'{"id":3}\0{"id":4}\0')
+
+
+def test_send_waits_for_reader():
+    async def scenario():
+        in_r, in_w = os.pipe()
+        out_r, out_w = os.pipe()
+        transport = await PipeTransport.open(in_r, out_w)
+        big = b"x" * 1_000_000
+        send = asyncio.ensure_future(transport.send(big))
+        await asyncio.sleep(0.05)
+        assert not send.done()
+
+        sent = await read_exactly(out_r, len(big) + 1)
+        await asyncio.wait_for(send, 1)
+        await transport.close()
+        os.close(in_w)
+        os.close(out_r)
+        return len(sent)
+
+    assert asyncio.run(scenario()) == 1_000_001
+
+
+def test_concurrent_sends_under_backpressure():
+    async def scenario():
+        in_r, in_w = os.pipe()
+        out_r, out_w = os.pipe()
+        transport = await PipeTransport.open(in_r, out_w)
+        chunks = [bytes([ord("a") + i]) * 500_000 for i in range(3)]
+        sends = [asyncio.ensure_future(transport.send(chunk)) for chunk in chunks]
+        await asyncio.sleep(0.05)
+        # ? Канал заполнен: ждут все отправки, а не только последняя
+        assert not any(send.done() for send in sends)
+
+        sent = await read_exactly(out_r, sum(len(c) + 1 for c in chunks))
+        await asyncio.wait_for(asyncio.gather(*sends), 1)
+        await transport.close()
+        os.close(in_w)
+        os.close(out_r)
+        return sent
+
+    sent = asyncio.run(scenario())
+    assert sent.split(b"\0")[:3] == [bytes([ord("a") + i]) * 500_000 for i in range(3)]
+
+
+def test_reading_pauses_when_queue_is_full():
+    async def scenario():
+        in_r, in_w = os.pipe()
+        out_r, out_w = os.pipe()
+        transport = await PipeTransport.open(in_r, out_w, max_queue=4)
+        reader = transport._reader
+        os.set_blocking(in_w, False)
+        for i in range(4):
+            os.write(in_w, b'{"id":%d}\0' % i)
+            await asyncio.sleep(0.01)
+        assert reader._paused and not transport._read_transport.is_reading()
+        # ? Пока чтение приостановлено, новые сообщения остаются в канале
+        os.write(in_w, b'{"id":4}\0{"id":5}\0')
+        await asyncio.sleep(0.01)
+        assert len(reader._messages) == 4
+
+        received = [await transport.recv() for _ in range(6)]
+        resumed = transport._read_transport.is_reading()
+        await transport.close()
+        os.close(in_w)
+        os.close(out_r)
+        return received, resumed
+
+    received, resumed = asyncio.run(scenario())
+    assert received == [b'{"id":%d}' % i for i in range(6)]
+    assert resumed
+
+
+def test_oversized_message_closes_transport():
+    async def scenario():
+        in_r, in_w = os.pipe()
+        out_r, out_w = os.pipe()
+        transport = await PipeTransport.open(in_r, out_w, max_size=10)
+        os.write(in_w, b"short\0" + b"x" * 11)
+        assert await transport.recv() == b"short"
+        with pytest.raises(ConnectionClosed):
+            await transport.recv()
+        assert transport.closed
+        os.close(in_w)
+        os.close(out_r)
+
+    asyncio.run(scenario())
+
+
+def test_connection_over_served_pipe():
+    async def scenario():
+        async with FakeCDPServer() as server:
+            commands_r, commands_w = os.pipe()
+            replies_r, replies_w = os.pipe()
+            serving = asyncio.ensure_future(server.servePipe(commands_r, replies_w))
+
+            conn = Connection("pipe://0", "pipe-0", "", None, True, False, "chrome")
+            await conn.activate(enable_runtime=False, transport=await PipeTransport.open(replies_r, commands_w))
+            version = await conn.call("Browser.getVersion")
+            results = await conn.callMany(*["Browser.getVersion"] * 100)
+            session = await conn.attachSession(server.page.id)
+            evaluated = await session.call("Runtime.evaluate", {"expression": "1"})
+            with pytest.raises(ValueError):
+                conn.enableReconnect()
+
+            await conn.disconnect()
+            await asyncio.wait_for(serving, 1)
+            return version, results, evaluated
+
+    version, results, evaluated = asyncio.run(scenario())
+    assert version["product"] == "FakeChrome/1.0"
+    assert results == [version] * 100
+    assert evaluated == {"result": {"type": "undefined"}}
@@ -0,0 +1,212 @@
+import asyncio
+import threading
+
+import pytest
+
+from aio_dt_protocol import pool as pool_module
+from aio_dt_protocol.fake_cdp import FakeCDPServer
+from aio_dt_protocol.pool import BrowserPool
+
+
+class FakeLauncher:
+    """ Запускает вместо браузера поддельный сервер; каждый запуск — новый. """
+
+    def __init__(self, fail_profile: str = "") -> None:
+        self.fail_profile = fail_profile
+        # ? Сколько следующих запусков завершатся ошибкой; -1 — все
+        self.fail_next = 0
+        self.launches = 0
+        self.servers = []
+
+    async def __call__(self, port: int, profile: str):
+        self.launches += 1
+        if self.fail_next:
+            self.fail_next -= 1
+            raise RuntimeError("launch failed")
+        if self.fail_profile and profile.endswith(self.fail_profile):
+            await asyncio.sleep(0.05)
+            raise RuntimeError("launch failed")
+        server = FakeCDPServer()
+        await server.start()
+        self.servers.append(server)
+        return server.browser()
+
+    async def stop(self) -> None:
+        for server in self.servers:
+            await server.stop()
+
+
+def test_pages_are_spread_over_browsers(tmp_path):
+    async def scenario():
+        launcher = FakeLauncher()
+        try:
+            async with BrowserPool(size=2, profile_root=str(tmp_path), launcher=launcher) as pool:
+                conns = await asyncio.gather(*(pool.acquire() for _ in range(4)))
+                assert all(conn.connected for conn in conns)
+                assert [m.load for m in pool.members] == [2, 2]
+                assert [s["port"] for s in pool.stats()] == [s.port for s in launcher.servers]
+
+                await pool.release(conns[0])
+                assert sorted(m.load for m in pool.members) == [1, 2]
+                async with pool.page("https://example.com/") as conn:
+                    assert conn.connected
+                    assert sorted(m.load for m in pool.members) == [2, 2]
+                assert sorted(m.load for m in pool.members) == [1, 2]
+            assert all(m.browser is None for m in pool.members)
+            with pytest.raises(RuntimeError):
+                await pool.acquire()
+        finally:
+            await launcher.stop()
+
+    asyncio.run(scenario())
+
+
+def test_browser_is_recycled_after_max_pages(tmp_path):
+    async def scenario():
+        launcher = FakeLauncher()
+        try:
+            async with BrowserPool(size=1, profile_root=str(tmp_path), max_pages=2, launcher=launcher) as pool:
+                member = pool.members[0]
+                first = await pool.acquire()
+                second = await pool.acquire()
+                assert member.retiring
+                # ? Следующая страница ждёт, пока браузер не будет перезапущен
+                third = asyncio.ensure_future(pool.acquire())
+                await asyncio.sleep(0.05)
+                assert not third.done()
+
+                await pool.release(first)
+                await pool.release(second)
+                conn = await asyncio.wait_for(third, 5)
+                assert conn.connected
+                assert member.restarts == 1 and len(launcher.servers) == 2
+                await pool.release(conn)
+        finally:
+            await launcher.stop()
+
+    asyncio.run(scenario())
+
+
+def test_closed_page_frees_its_slot(tmp_path):
+    async def scenario():
+        launcher = FakeLauncher()
+        try:
+            async with BrowserPool(size=1, profile_root=str(tmp_path), launcher=launcher) as pool:
+                conn = await pool.acquire()
+                await launcher.servers[0].closeTarget(conn.conn_id)
+                await asyncio.wait_for(conn.waitForClose(), 1)
+                await asyncio.sleep(0.01)
+                assert pool.members[0].load == 0
+        finally:
+            await launcher.stop()
+
+    asyncio.run(scenario())
+
+
+def test_start_failure_stops_started_browsers(tmp_path):
+    async def scenario():
+        launcher = FakeLauncher(fail_profile="browser-1")
+        pool = BrowserPool(size=3, profile_root=str(tmp_path), launcher=launcher)
+        try:
+            with pytest.raises(RuntimeError, match="launch failed"):
+                await pool.start()
+            assert all(m.browser is None for m in pool.members)
+            # ? Запущенным браузерам была отправлена команда закрытия
+            assert len(launcher.servers) == 2
+            assert all(s.received.get("Browser.close") == 1 for s in launcher.servers)
+        finally:
+            await launcher.stop()
+
+    asyncio.run(scenario())
+
+
+def test_failed_restart_is_retried(tmp_path):
+    async def scenario():
+        launcher = FakeLauncher()
+        try:
+            async with BrowserPool(size=1, profile_root=str(tmp_path), max_pages=1,
+                                   restart_delay=0.01, launcher=launcher) as pool:
+                member = pool.members[0]
+                await pool.release(await pool.acquire())
+                launcher.fail_next = 2
+                conn = await asyncio.wait_for(pool.acquire(), 5)
+                assert conn.connected
+                assert launcher.launches == 4
+                assert member.restarts == 1 and not member.failed
+                await pool.release(conn)
+        finally:
+            await launcher.stop()
+
+    asyncio.run(scenario())
+
+
+def test_failed_member_is_reported_and_recovered(tmp_path):
+    async def scenario():
+        launcher = FakeLauncher()
+        try:
+            async with BrowserPool(size=1, profile_root=str(tmp_path), max_pages=1, health_interval=0.05,
+                                   restart_attempts=2, restart_delay=0.01, launcher=launcher) as pool:
+                member = pool.members[0]
+                launcher.fail_next = -1
+                await pool.release(await pool.acquire())
+                with pytest.raises(RuntimeError, match="could be started"):
+                    await asyncio.wait_for(pool.acquire(), 5)
+                assert member.failed and member.browser is None
+
+                # ? Проверка состояния повторяет запуск неисправного браузера
+                launcher.fail_next = 0
+                for _ in range(100):
+                    if member.available:
+                        break
+                    await asyncio.sleep(0.02)
+                assert not member.failed
+                await pool.release(await pool.acquire())
+        finally:
+            await launcher.stop()
+
+    asyncio.run(scenario())
+
+
+def test_acquire_timeout(tmp_path):
+    async def scenario():
+        launcher = FakeLauncher()
+        try:
+            async with BrowserPool(size=1, profile_root=str(tmp_path), max_pages=1, launcher=launcher) as pool:
+                conn = await pool.acquire()
+                with pytest.raises(asyncio.TimeoutError):
+                    await pool.acquire(timeout=0.05)
+                await pool.release(conn)
+                async with pool.page(timeout=5) as conn:
+                    assert conn.connected
+        finally:
+            await launcher.stop()
+
+    asyncio.run(scenario())
+
+
+def test_memory_is_measured_off_the_event_loop(tmp_path, monkeypatch):
+    threads = []
+
+    def fake_rss(pid):
+        threads.append(threading.current_thread())
+        return 10 ** 12
+
+    monkeypatch.setattr(pool_module, "process_tree_rss", fake_rss)
+
+    async def scenario():
+        launcher = FakeLauncher()
+        try:
+            async with BrowserPool(size=1, profile_root=str(tmp_path), max_rss=1, health_interval=0.02,
+                                   launcher=launcher) as pool:
+                member = pool.members[0]
+                for _ in range(100):
+                    if member.restarts:
+                        break
+                    await asyncio.sleep(0.02)
+                return member.restarts, len(launcher.servers)
+        finally:
+            await launcher.stop()
+
+    restarts, launched = asyncio.run(scenario())
+    assert restarts >= 1 and launched >= 2
+    assert threads and threading.main_thread() not in threads
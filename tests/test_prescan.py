@@ -0,0 +1,54 @@
+import asyncio
+import json
+
+import pytest
+
+import aio_dt_protocol.connection as connection_module
+from aio_dt_protocol.fake_cdp import FakeCDPServer
+from aio_dt_protocol.utils import prescan_frame
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ('{"id":12,"result":{}}', (12, None, None)),
+    ('{"id": 7, "result": {"a": 1}, "sessionId": "S1"}', (7, None, "S1")),
+    ('{"method":"Page.loadEventFired","params":{"timestamp":1}}', (None, "Page.loadEventFired", None)),
+    ('{"method":"Network.dataReceived","params":{},"sessionId":"AB"}', (None, "Network.dataReceived", "AB")),
+    # ? sessionId внутри params — не сессия сообщения
+    ('{"method":"Target.detachedFromTarget","params":{"sessionId":"X"}}', (None, "Target.detachedFromTarget", None)),
+    ('{"result":{},"id":1}', None),
+    ('[]', None),
+])
+def test_prescan_str_and_bytes(raw, expected):
+    assert prescan_frame(raw) == expected
+    assert prescan_frame(raw.encode()) == expected
+
+
+def test_prescan_finds_session_after_large_params():
+    raw = json.dumps({"method": "Network.dataReceived", "params": {"blob": "x" * 100_000}, "sessionId": "S"})
+    assert prescan_frame(raw) == (None, "Network.dataReceived", "S")
+
+
+def test_prescan_sees_session_of_fake_server_frames(monkeypatch):
+    seen = []
+
+    def spy(raw):
+        result = prescan_frame(raw)
+        seen.append(result)
+        return result
+
+    monkeypatch.setattr(connection_module, "prescan_frame", spy)
+
+    async def scenario():
+        async with FakeCDPServer() as server:
+            browser = server.browser()
+            session = await browser.getSessionByID(server.page.id)
+            seen.clear()
+            await session.call("Runtime.evaluate", {"expression": "1"})
+            await server.emit("Log.entryAdded", {"entry": {}}, target_id=server.page.id)
+            await asyncio.sleep(0.05)
+            await browser.close()
+            return session.session_id
+
+    session_id = asyncio.run(scenario())
+    assert seen[0][0] is not None and seen[0][2] == session_id
+    assert (None, "Log.entryAdded", session_id) in seen
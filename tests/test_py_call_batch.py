@@ -0,0 +1,62 @@
+import asyncio
+import json
+
+from aio_dt_protocol.fake_cdp import FakeCDPServer
+
+
+async def _emitCall(server, conn, name, payload):
+    await server.emit("Runtime.bindingCalled", {
+        "name": name, "payload": payload, "executionContextId": 1
+    }, target_id=conn.conn_id)
+
+
+def test_batched_py_call_runs_in_order():
+    async def scenario():
+        async with FakeCDPServer() as server:
+            conn = await server.browser().getConnection()
+            got = []
+
+            async def scroll(y, tag): got.append(("scroll", y, tag))
+            async def click(x, tag): got.append(("click", x, tag))
+
+            await conn.extend.pyCallAddOnload(batch="microtask", batch_size=32)
+            await conn.bindFunction(scroll, "S")
+            await conn.bindFunction(click, "C")
+            calls = [["scroll", [i]] for i in range(3)] + [["click", [1]], ["missing", [2]]]
+            await _emitCall(server, conn, "py_call_batch", json.dumps(calls))
+            await _emitCall(server, conn, "scroll", json.dumps([99]))
+            await asyncio.sleep(0.1)
+            await conn.extend.pyCallRemoveOnLoad()
+            removed = server.received.get("Runtime.removeBinding")
+            await conn.disconnect()
+            return got, removed
+
+    got, removed = asyncio.run(scenario())
+    assert got == [
+        ("scroll", 0, "S"), ("scroll", 1, "S"), ("scroll", 2, "S"),
+        ("click", 1, "C"), ("scroll", 99, "S"),
+    ]
+    assert removed == 1
+
+
+def test_malformed_batch_is_dropped():
+    async def scenario():
+        async with FakeCDPServer() as server:
+            conn = await server.browser().getConnection()
+            got = []
+
+            async def scroll(y): got.append(y)
+
+            await conn.extend.pyCallAddOnload(batch="microtask")
+            await conn.bindFunction(scroll)
+            for payload in ("{not json", json.dumps([1, 2]), json.dumps([["scroll"]])):
+                await _emitCall(server, conn, "py_call_batch", payload)
+            await _emitCall(server, conn, "py_call_batch", json.dumps([["scroll", [7]]]))
+            await asyncio.sleep(0.1)
+            alive = not conn._receiver_loop.done()
+            await conn.disconnect()
+            return got, alive
+
+    got, alive = asyncio.run(scenario())
+    assert got == [7]
+    assert alive
@@ -0,0 +1,124 @@
+import asyncio
+
+import pytest
+
+from aio_dt_protocol.exceptions import ConnectionDetached
+from aio_dt_protocol.fake_cdp import FakeCDPServer
+
+
+async def drop_page_sockets(server: FakeCDPServer) -> None:
+    """ Обрывает WebSocket-ы страницы со стороны сервера. """
+    for ws, target_id in tuple(server._sockets.items()):
+        if target_id == server.page.id:
+            await ws.close()
+
+
+def test_journal_is_replayed_after_reconnect():
+    async def scenario():
+        async with FakeCDPServer() as server:
+            conn = await server.browser().getConnection()
+            journal = conn.enableReconnect()
+            await conn.Page.enable()
+            await conn.call("Emulation.setDeviceMetricsOverride", {"width": 1})
+            await conn.call("Emulation.setDeviceMetricsOverride", {"width": 2})
+            script = await conn.Page.addScriptOnLoad("1 + 1")
+            before = dict(server.received)
+
+            await drop_page_sockets(server)
+            await conn.call("Runtime.evaluate", {"expression": "1"})
+            assert conn.connected
+            assert server.received["Page.enable"] == before["Page.enable"] + 1
+            # ? Воспроизводится только итоговое переопределение
+            assert server.received["Emulation.setDeviceMetricsOverride"] == 3
+            assert server.received["Page.addScriptToEvaluateOnNewDocument"] == 2
+
+            # ? Старый идентификатор скрипта остаётся рабочим
+            await conn.Page.removeScriptOnLoad(script)
+            assert server.received["Page.removeScriptToEvaluateOnNewDocument"] == 1
+            assert not any(m == "Page.addScriptToEvaluateOnNewDocument" for m, _ in journal.commands())
+            await conn.disconnect()
+
+    asyncio.run(scenario())
+
+
+def test_pending_call_fails_on_drop():
+    async def scenario():
+        async with FakeCDPServer() as server:
+            server.respond("Slow.never", {}, latency=10)
+            conn = await server.browser().getConnection()
+            conn.enableReconnect()
+            pending = asyncio.ensure_future(conn.call("Slow.never"))
+            await asyncio.sleep(0.01)
+
+            await drop_page_sockets(server)
+            with pytest.raises(ConnectionDetached):
+                await pending
+            await conn.call("Runtime.evaluate", {"expression": "1"})
+            assert conn.connected
+            await conn.disconnect()
+
+    asyncio.run(scenario())
+
+
+def test_journal_is_seeded_with_created_domains_only():
+    async def scenario():
+        async with FakeCDPServer() as server:
+            conn = await server.browser().getConnection()
+            await conn.Page.enable()
+            journal = conn.enableReconnect()
+            seeded = [method for method, _ in journal.commands()]
+            created = set(conn._created_attributes)
+            await conn.disconnect()
+            return seeded, created
+
+    seeded, created = asyncio.run(scenario())
+    assert "Page.enable" in seeded
+    assert "DOM" not in created
+    assert "DOM.enable" not in seeded
+
+
+def test_gives_up_when_server_is_gone():
+    async def scenario():
+        server = FakeCDPServer()
+        await server.start()
+        conn = await server.browser().getConnection()
+        conn.enableReconnect(attempts=2, delay=0.01)
+        await server.stop()
+        await asyncio.wait_for(conn.waitForClose(), 5)
+        return conn.connected
+
+    assert asyncio.run(scenario()) is False
+
+
+def test_no_reconnect_after_disconnect():
+    async def scenario():
+        async with FakeCDPServer() as server:
+            conn = await server.browser().getConnection()
+            conn.enableReconnect()
+            await conn.disconnect()
+            with pytest.raises(ConnectionDetached):
+                await conn.call("Runtime.evaluate", {"expression": "1"})
+
+    asyncio.run(scenario())
+
+
+def test_new_receiver_does_not_inherit_replay_context():
+    import aio_dt_protocol.connection as connection_module
+
+    async def scenario():
+        async with FakeCDPServer() as server:
+            conn = await server.browser().getConnection()
+            conn.enableReconnect()
+            await drop_page_sockets(server)
+            await conn.call("Runtime.evaluate", {"expression": "1"})
+
+            # ? Условие ожидания выполняется в задаче цикла приёма
+            seen = []
+            waiter = await conn.expectEvent(
+                "Log.entryAdded", lambda params: seen.append(connection_module._reconnecting.get()) or True)
+            await server.emit("Log.entryAdded", {}, target_id=conn.conn_id)
+            await asyncio.wait_for(waiter, 1)
+            await conn.disconnect()
+            return seen
+
+    assert asyncio.run(scenario()) == [None]
@@ -0,0 +1,130 @@
+import asyncio
+import json
+
+from aio_dt_protocol.fake_cdp import FakeCDPServer
+
+
+async def _emitRPC(server, conn, payload):
+    await server.emit("Runtime.bindingCalled", {
+        "name": "py_rpc_binding", "payload": payload, "executionContextId": 7
+    }, target_id=conn.conn_id)
+
+
+def _recordSettled(server) -> list:
+    settled = []
+
+    def responder(params, target):
+        settled.append([a["value"] for a in params["arguments"]])
+        return {"result": {"type": "undefined"}}
+
+    server.respond("Runtime.callFunctionOn", responder)
+    return settled
+
+
+def test_rpc_settles_results_and_errors():
+    async def scenario():
+        async with FakeCDPServer() as server:
+            conn = await server.browser().getConnection()
+            settled = _recordSettled(server)
+
+            async def add(a, b, k): return a + b + k
+            async def bad(): raise ValueError("nope")
+            async def obj(): return object()
+
+            await conn.bindRPC(add, 100)
+            await conn.bindRPC(bad)
+            await conn.bindRPC(obj)
+            for i, (name, args) in enumerate([("add", [1, 2]), ("bad", []), ("obj", []), ("missing", [])]):
+                await _emitRPC(server, conn, json.dumps([i, name, args]))
+            await asyncio.sleep(0.1)
+            await conn.unbindRPC(add, bad, obj)
+            enabled = conn.extend.py_rpc_enabled
+            await conn.disconnect()
+            return sorted(settled), enabled
+
+    settled, enabled = asyncio.run(scenario())
+    assert settled[0] == [0, True, 103]
+    assert settled[1] == [1, False, "ValueError: nope"]
+    assert settled[2][:2] == [2, False] and "not JSON serializable" in settled[2][2]
+    assert settled[3][:2] == [3, False] and "'missing'" in settled[3][2]
+    assert not enabled
+
+
+def test_rpc_timeout_rejects_without_blocking_others():
+    async def scenario():
+        async with FakeCDPServer() as server:
+            conn = await server.browser().getConnection()
+            settled = _recordSettled(server)
+
+            async def slow(): await asyncio.sleep(1)
+            async def fast(): return "ok"
+
+            await conn.bindRPC(slow, timeout=0.05)
+            await conn.bindRPC(fast)
+            await _emitRPC(server, conn, json.dumps([1, "slow", []]))
+            await _emitRPC(server, conn, json.dumps([2, "fast", []]))
+            await asyncio.sleep(0.02)
+            early = list(settled)
+            await asyncio.sleep(0.1)
+            await conn.disconnect()
+            return early, settled
+
+    early, settled = asyncio.run(scenario())
+    assert early == [[2, True, "ok"]]
+    assert settled[1] == [1, False, "'slow' did not finish within 0.05 seconds"]
+
+
+def test_page_timeout_follows_the_longest_rpc_timeout():
+    async def scenario():
+        async with FakeCDPServer() as server:
+            conn = await server.browser().getConnection()
+            scripts = []
+
+            def add_script(params, target):
+                scripts.append(params["source"])
+                return {"identifier": str(len(scripts))}
+
+            server.respond("Page.addScriptToEvaluateOnNewDocument", add_script)
+
+            async def short(): pass
+            async def long(): pass
+            async def endless(): pass
+
+            await conn.bindRPC(short, timeout=0.5)
+            await conn.bindRPC(long, timeout=2)
+            await conn.bindRPC(endless, timeout=None)
+            await conn.unbindRPC(endless)
+            await conn.disconnect()
+            return scripts, server.received.get("Page.removeScriptToEvaluateOnNewDocument")
+
+    scripts, removed = asyncio.run(scenario())
+    assert ["timeout:500," in s for s in scripts] == [True, False, False, False]
+    assert "timeout:2000," in scripts[1] and "timeout:2000," in scripts[3]
+    assert "timeout:null," in scripts[2]
+    assert removed == 3
+
+
+def test_malformed_rpc_payload_is_dropped():
+    async def scenario():
+        async with FakeCDPServer() as server:
+            conn = await server.browser().getConnection()
+            settled = _recordSettled(server)
+            got = []
+
+            async def echo(x): return x
+            async def listener(params): got.append(params["payload"])
+
+            await conn.bindRPC(echo)
+            await conn.addListenerForEvent("Runtime.bindingCalled", listener)
+            for payload in ("{not json", json.dumps([1, "echo"]), json.dumps(5)):
+                await _emitRPC(server, conn, payload)
+            await _emitRPC(server, conn, json.dumps([9, "echo", ["x"]]))
+            await asyncio.sleep(0.1)
+            alive = not conn._receiver_loop.done()
+            await conn.disconnect()
+            return settled, alive, len(got)
+
+    settled, alive, heard = asyncio.run(scenario())
+    assert settled == [[9, True, "x"]]
+    assert alive
+    assert heard == 4
@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+
+from aio_dt_protocol.exceptions import ConnectionDetached
+from aio_dt_protocol.fake_cdp import FakeCDPServer
+
+
+def test_commands_are_routed_by_session():
+    async def scenario():
+        async with FakeCDPServer() as server:
+            other = server.addTarget("https://example.com/")
+            server.respond("Runtime.evaluate", lambda params, target: {"result": {"value": target.id}})
+            browser = server.browser()
+            first = await browser.getSessionByID(server.page.id)
+            second = await browser.getSessionByID(other.id)
+
+            assert first.root is second.root
+            assert set(first.root.sessions) == {first.session_id, second.session_id}
+            values = await asyncio.gather(*(
+                session.call("Runtime.evaluate", {"expression": "1"})
+                for session in (first, second, first, second)
+            ))
+            await browser.close()
+            return [v["result"]["value"] for v in values], server.page.id, other.id
+
+    values, page_id, other_id = asyncio.run(scenario())
+    assert values == [page_id, other_id, page_id, other_id]
+
+
+def test_events_are_routed_by_session():
+    async def scenario():
+        async with FakeCDPServer() as server:
+            other = server.addTarget("https://example.com/")
+            browser = server.browser()
+            first = await browser.getSessionByID(server.page.id)
+            second = await browser.getSessionByID(other.id)
+            got = {"first": [], "second": [], "root": []}
+
+            def collect(name):
+                async def listener(params):
+                    got[name].append(params["n"])
+                return listener
+
+            await first.addListenerForEvent("Log.entryAdded", collect("first"))
+            await second.addListenerForEvent("Log.entryAdded", collect("second"))
+            await first.root.addListenerForEvent("Log.entryAdded", collect("root"))
+            await server.emit("Log.entryAdded", {"n": 1}, target_id=server.page.id)
+            await server.emit("Log.entryAdded", {"n": 2}, target_id=other.id)
+            await server.emit("Log.entryAdded", {"n": 3})
+            await asyncio.sleep(0.05)
+            await browser.close()
+            return got
+
+    assert asyncio.run(scenario()) == {"first": [1], "second": [2], "root": [3]}
+
+
+def test_session_detaches_without_closing_root():
+    async def scenario():
+        async with FakeCDPServer() as server:
+            other = server.addTarget("https://example.com/")
+            browser = server.browser()
+            first = await browser.getSessionByID(server.page.id)
+            second = await browser.getSessionByID(other.id)
+            root = first.root
+
+            await first.disconnect()
+            assert not first.connected and root.connected
+            assert first.session_id not in root.sessions
+            with pytest.raises(ConnectionDetached):
+                await first.call("Runtime.evaluate", {"expression": "1"})
+
+            # ? Закрытие target-а браузером отсоединяет его сессию
+            await server.closeTarget(other.id)
+            await asyncio.wait_for(second.waitForClose(), 1)
+            assert root.connected and root.sessions == {}
+
+            third = await browser.getSessionByID(server.page.id)
+            await root.disconnect()
+            await asyncio.wait_for(third.waitForClose(), 1)
+            return third.connected
+
+    assert asyncio.run(scenario()) is False
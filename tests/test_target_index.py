@@ -0,0 +1,116 @@
+import asyncio
+
+import pytest
+
+from aio_dt_protocol.exceptions import ConnectionDetached
+from aio_dt_protocol.fake_cdp import FakeCDPServer
+from aio_dt_protocol.target_index import TargetIndex
+
+
+def test_index_is_filled_and_searched():
+    async def scenario():
+        async with FakeCDPServer() as server:
+            alpha = server.addTarget("https://example.com/a", title="Alpha")
+            beta = server.addTarget("https://example.com/b", title="Beta")
+            frame = server.addTarget("https://ads.test/x", target_type="iframe", parent_id=server.page.id)
+            browser = server.browser()
+            targets = await browser.getTargetIndex()
+
+            assert len(targets) == 4 and alpha.id in targets
+            assert targets.get(frame.id)["type"] == "iframe"
+            assert targets.get("missing") is None
+            assert [i["targetId"] for i in targets.find("url", "HTTPS://EXAMPLE.COM/B")] == [beta.id]
+            assert [i["targetId"] for i in targets.find("url", "https://example.com/", "startswith")] == \
+                [alpha.id, beta.id]
+            assert [i["targetId"] for i in targets.find("title", "lph", "contains")] == [alpha.id]
+            assert [i["targetId"] for i in targets.find("targetId", frame.id)] == [frame.id]
+            with pytest.raises(ValueError):
+                targets.find("url", "x", "regex")
+            await browser.close()
+
+    asyncio.run(scenario())
+
+
+def test_index_follows_target_events():
+    async def scenario():
+        async with FakeCDPServer() as server:
+            browser = server.browser()
+            targets = await browser.getTargetIndex()
+
+            later = targets.expect(lambda i: i["url"].endswith("/later"))
+            created = server.addTarget("https://x/later")
+            assert (await asyncio.wait_for(later, 1))["targetId"] == created.id
+            # ? Уже существующий target разрешает ожидание сразу
+            assert (await targets.waitFor(created.id, 1))["url"] == "https://x/later"
+
+            await server.closeTarget(created.id)
+            await asyncio.sleep(0.05)
+            assert created.id not in targets
+            assert targets.find("url", "https://x/later") == []
+
+            with pytest.raises(asyncio.TimeoutError):
+                await targets.waitFor("missing", 0.05)
+            assert targets._waiters == []
+            await browser.close()
+
+    asyncio.run(scenario())
+
+
+def test_waiters_fail_when_index_stops():
+    async def scenario():
+        async with FakeCDPServer() as server:
+            browser = server.browser()
+            targets = TargetIndex(await browser.getBrowserConnection())
+            await targets.start()
+            waiter = targets.expect("missing")
+            targets.stop()
+            with pytest.raises(ConnectionDetached):
+                await waiter
+            assert not targets.active
+            with pytest.raises(ConnectionDetached):
+                await targets.expect("missing")
+            await browser.close()
+
+    asyncio.run(scenario())
+
+
+def test_browser_uses_list_until_index_is_created():
+    async def scenario():
+        async with FakeCDPServer() as server:
+            server.addTarget("https://example.com/a", title="Alpha")
+            browser = server.browser()
+
+            conn = await browser.getConnectionByURL("https://example.com/a")
+            assert conn is not None
+            assert browser._target_index is None and browser._browser_connection is None
+            assert server.received.get("Target.setDiscoverTargets") is None
+            tab = await browser.createTab("https://new/")
+            assert tab is not None and browser._target_index is None
+
+            targets = await browser.getTargetIndex()
+            requests = server.received.get("Target.getTargets")
+            found = await browser.getConnectionByTitle("alp", match_mode="startswith")
+            assert found is not None and found.conn_id in targets
+            assert server.received.get("Target.getTargets") == requests
+            tab = await browser.createTab("https://indexed/")
+            assert tab.conn_id in targets
+            await browser.close()
+
+    asyncio.run(scenario())
+
+
+def test_create_tab_falls_back_when_event_is_missed(monkeypatch):
+    import aio_dt_protocol.browser as browser_module
+    monkeypatch.setattr(browser_module, "TARGET_CREATE_TIMEOUT", 0.05)
+
+    async def scenario():
+        async with FakeCDPServer() as server:
+            browser = server.browser()
+            await browser.getTargetIndex()
+            # ? Сервер перестаёт сообщать о новых target-ах
+            server._discovering.clear()
+            tab = await browser.createTab("https://missed/")
+            assert tab is not None and tab.conn_id in server.targets
+            await browser.close()
+
+    asyncio.run(scenario())
@@ -0,0 +1,87 @@
+import asyncio
+
+import pytest
+
+from aio_dt_protocol.exceptions import CallTimeoutError, ConnectionDetached
+from aio_dt_protocol.fake_cdp import FakeCDPServer
+
+
+async def listener(params):
+    pass
+
+
+def test_call_timeout_frees_pending_slot():
+    async def scenario():
+        async with FakeCDPServer() as server:
+            server.respond("Hang.method", {}, latency=10)
+            conn = await server.browser().getConnection()
+            conn.default_timeout = 0.05
+            with pytest.raises(CallTimeoutError) as error:
+                await conn.call("Hang.method")
+            assert isinstance(error.value, TimeoutError)
+            # ? Тайм-аут вызова важнее тайм-аута по умолчанию
+            with pytest.raises(CallTimeoutError):
+                await conn.call("Hang.method", timeout=0.01)
+            assert conn.responses == {}
+            # ? Соединение продолжает работать
+            assert await conn.call("A.method") == {}
+            await conn.disconnect()
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_call_frees_pending_slot():
+    async def scenario():
+        async with FakeCDPServer() as server:
+            server.respond("Hang.method", {}, latency=10)
+            conn = await server.browser().getConnection()
+            call = asyncio.ensure_future(conn.call("Hang.method"))
+            await asyncio.sleep(0.01)
+            assert len(conn.responses) == 1
+            call.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await call
+            assert conn.responses == {}
+            await conn.disconnect()
+
+    asyncio.run(scenario())
+
+
+def test_pending_calls_fail_on_detach():
+    async def scenario():
+        async with FakeCDPServer() as server:
+            server.respond("Hang.method", {}, latency=10)
+            conn = await server.browser().getConnection()
+            calls = [asyncio.ensure_future(conn.call("Hang.method")) for _ in range(3)]
+            batch = asyncio.ensure_future(conn.callMany("A.method", "Hang.method"))
+            await asyncio.sleep(0.01)
+
+            await server.closeTarget(conn.conn_id)
+            await asyncio.wait_for(conn.waitForClose(), 1)
+            for call in calls:
+                with pytest.raises(ConnectionDetached):
+                    await call
+            results = await batch
+            assert results[0] == {} and isinstance(results[1], ConnectionDetached)
+            assert conn.responses == {}
+            with pytest.raises(ConnectionDetached):
+                await conn.call("A.method")
+
+    asyncio.run(scenario())
+
+
+def test_release_racing_disconnect_is_quiet():
+    errors = []
+
+    async def scenario():
+        asyncio.get_running_loop().set_exception_handler(lambda loop, context: errors.append(context))
+        async with FakeCDPServer() as server:
+            conn = await server.browser().getConnection()
+            # ? Команда выключения домена отправляется, когда сокет уже закрывается
+            await conn.addListenerForEvent("Network.dataReceived", listener)
+            conn.removeListenerForEvent("Network.dataReceived", listener)
+            await conn.disconnect()
+            await asyncio.sleep(0.05)
+
+    asyncio.run(scenario())
+    assert errors == []
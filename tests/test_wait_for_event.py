@@ -0,0 +1,48 @@
+import asyncio
+
+import pytest
+
+from aio_dt_protocol.exceptions import ConnectionDetached, EventTimeoutError
+from aio_dt_protocol.fake_cdp import FakeCDPServer
+
+
+def test_wait_for_event_with_predicate():
+    async def scenario():
+        async with FakeCDPServer() as server:
+            conn = await server.browser().getConnection()
+            waiter = await conn.expectEvent("Network.dataReceived", lambda p: p["i"] == 2)
+            for i in range(4):
+                await server.emit("Network.dataReceived", {"i": i}, target_id=conn.conn_id)
+            params = await asyncio.wait_for(waiter, 1)
+            await asyncio.sleep(0.05)
+            released = server.received.get("Network.disable")
+            await conn.disconnect()
+            return params, released, conn._event_waiters.get("Network.dataReceived")
+
+    params, released, waiters = asyncio.run(scenario())
+    assert params == {"i": 2}
+    assert released == 1
+    assert not waiters
+
+
+def test_wait_for_event_timeout():
+    async def scenario():
+        async with FakeCDPServer() as server:
+            conn = await server.browser().getConnection()
+            with pytest.raises(EventTimeoutError):
+                await conn.waitForEvent("Page.loadEventFired", timeout=0.05)
+            await conn.disconnect()
+
+    asyncio.run(scenario())
+
+
+def test_wait_for_event_fails_on_detach():
+    async def scenario():
+        async with FakeCDPServer() as server:
+            conn = await server.browser().getConnection()
+            waiter = await conn.expectEvent("Page.loadEventFired")
+            await conn.disconnect()
+            with pytest.raises(ConnectionDetached):
+                await waiter
+
+    asyncio.run(scenario())
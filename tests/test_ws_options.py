@@ -0,0 +1,47 @@
+import asyncio
+import base64
+
+from aio_dt_protocol.data import WebSocketOptions
+from aio_dt_protocol.fake_cdp import FakeCDPServer
+
+
+def test_default_buffering_is_bounded():
+    options = WebSocketOptions()
+    assert options.max_size * options.max_queue <= 4 * 2 ** 30
+    assert options.asKwargs()["max_queue"] == options.max_queue
+
+
+def test_options_are_applied_to_websocket():
+    async def scenario():
+        async with FakeCDPServer() as server:
+            browser = server.browser()
+            browser.ws_options = WebSocketOptions(max_size=2 ** 20, max_queue=4)
+            conn = await browser.getConnection()
+            ws = conn._ws_session
+            applied = ws.max_size, ws.max_queue
+            await conn.disconnect()
+            return applied
+
+    assert asyncio.run(scenario()) == (2 ** 20, 4)
+
+
+def test_response_body_is_streamed_in_chunks():
+    body = bytes(range(256)) * 10_000
+    chunks = [body[i:i + 1_000_000] for i in range(0, len(body), 1_000_000)]
+
+    async def scenario():
+        async with FakeCDPServer() as server:
+            server.respond("Fetch.takeResponseBodyAsStream", {"stream": "H1"})
+            server.respond("IO.read", *[
+                {"base64Encoded": True, "data": base64.b64encode(chunk).decode(), "eof": i == len(chunks) - 1}
+                for i, chunk in enumerate(chunks)
+            ])
+            conn = await server.browser().getConnection()
+            received = [chunk async for chunk in conn.Fetch.streamResponseBody("R1")]
+            closed = server.received.get("IO.close")
+            await conn.disconnect()
+            return received, closed
+
+    received, closed = asyncio.run(scenario())
+    assert b"".join(received) == body and len(received) == len(chunks)
+    assert closed == 1